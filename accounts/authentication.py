@@ -0,0 +1,142 @@
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.db import DEFAULT_DB_ALIAS
+from rest_framework.authentication import TokenAuthentication
+from rest_framework.authtoken.models import Token
+from utils.routers import use_primary
+
+
+class TokenCache:
+    """
+    Thread safe in-process LRU of token identities with a TTL.
+
+    When `TOKEN_CACHE_ALIAS` names one of `CACHES`, entries only live in that
+    backend, so every worker benefits from a single lookup and sees every
+    `delete`. A local copy would outlive the deletes of other workers.
+    """
+
+    key_prefix = "authtoken:"
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.entries = OrderedDict()
+
+    @property
+    def shared(self):
+        alias = settings.TOKEN_CACHE_ALIAS
+        return caches[alias] if alias else None
+
+    def get(self, key):
+        if self.shared is not None:
+            return self.shared.get(self.key_prefix + key)
+
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None:
+                expires, value = entry
+                if expires > time.monotonic():
+                    self.entries.move_to_end(key)
+                    return value
+                del self.entries[key]
+
+        return None
+
+    def set(self, key, value):
+        if self.shared is not None:
+            self.shared.set(
+                self.key_prefix + key, value, timeout=settings.TOKEN_CACHE_TTL
+            )
+            return
+
+        max_size = settings.TOKEN_CACHE_MAX_SIZE
+        if max_size <= 0:
+            return
+
+        with self.lock:
+            self.entries[key] = (time.monotonic() + settings.TOKEN_CACHE_TTL, value)
+            self.entries.move_to_end(key)
+            while len(self.entries) > max_size:
+                self.entries.popitem(last=False)
+
+    def delete(self, key):
+        with self.lock:
+            self.entries.pop(key, None)
+
+        if self.shared is not None:
+            self.shared.delete(self.key_prefix + key)
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+
+token_cache = TokenCache()
+
+
+def invalidate_token(key):
+    token_cache.delete(key)
+
+
+def invalidate_user(user):
+    for key in Token.objects.filter(user_id=user.pk).values_list("key", flat=True):
+        token_cache.delete(key)
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    """
+    Drop-in replacement for `TokenAuthentication` that skips the token and
+    user lookup for recently seen tokens.
+
+    Lookups always read the primary database. The cache keeps the values of
+    the user columns and the token creation time, not model instances. The
+    `uncached_user_fields`, like the password hash, are left out and loaded
+    on first access.
+
+    Without `TOKEN_CACHE_ALIAS`, other workers never see an invalidation, so
+    a revoked identity lives at most `TOKEN_CACHE_TTL` seconds in their local
+    cache.
+    """
+
+    uncached_user_fields = ("password",)
+
+    def authenticate_credentials(self, key):
+        identity = token_cache.get(key)
+
+        if identity is None:
+            # A token created moments ago may not have reached the replicas
+            with use_primary():
+                user, token = super().authenticate_credentials(key)
+            identity = (
+                {
+                    field.attname: getattr(user, field.attname)
+                    for field in user._meta.concrete_fields
+                    if field.attname not in self.uncached_user_fields
+                },
+                token.created,
+            )
+            token_cache.set(key, identity)
+
+        return self.from_identity(key, identity)
+
+    def from_identity(self, key, identity):
+        values, created = identity
+
+        # from_db takes the values in field order and defers the missing ones
+        model = get_user_model()
+        names = [
+            field.attname
+            for field in model._meta.concrete_fields
+            if field.attname in values
+        ]
+        user = model.from_db(DEFAULT_DB_ALIAS, names, [values[name] for name in names])
+        token = self.get_model().from_db(
+            DEFAULT_DB_ALIAS, ("key", "user_id", "created"), (key, user.pk, created)
+        )
+        token.user = user
+
+        return user, token
@@ -0,0 +1,93 @@
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.contrib.auth import hashers
+
+_local = threading.local()
+_lock = threading.Lock()
+_executor = None
+_executor_pid = None
+
+
+def _mark_pool_thread():
+    _local.in_pool = True
+
+
+def hash_executor():
+    """
+    Process wide pool of `PASSWORD_HASH_WORKERS` threads that runs every
+    password hash, created lazily so it never crosses a fork. Returns `None`
+    when offloading is disabled.
+    """
+    global _executor, _executor_pid
+
+    workers = settings.PASSWORD_HASH_WORKERS
+    if not workers:
+        return None
+
+    with _lock:
+        if _executor is None or _executor_pid != os.getpid():
+            _executor = ThreadPoolExecutor(
+                max_workers=workers,
+                thread_name_prefix="password-hash",
+                initializer=_mark_pool_thread,
+            )
+            _executor_pid = os.getpid()
+
+    return _executor
+
+
+def offload(func, *args, **kwargs):
+    executor = hash_executor()
+
+    if executor is None or getattr(_local, "in_pool", False):
+        return func(*args, **kwargs)
+
+    return executor.submit(func, *args, **kwargs).result()
+
+
+class OffloadedHasherMixin:
+    """
+    Runs `encode` and `verify` on the bounded hash pool. The key derivation
+    functions release the GIL, so the pool caps how many cores a login burst
+    can take instead of letting every request thread compete for them.
+    """
+
+    def encode(self, password, salt, *args, **kwargs):
+        return offload(super().encode, password, salt, *args, **kwargs)
+
+    def verify(self, password, encoded):
+        return offload(super().verify, password, encoded)
+
+
+class PBKDF2PasswordHasher(OffloadedHasherMixin, hashers.PBKDF2PasswordHasher):
+    @property
+    def iterations(self):
+        return settings.PBKDF2_ITERATIONS
+
+
+class ScryptPasswordHasher(OffloadedHasherMixin, hashers.ScryptPasswordHasher):
+    @property
+    def work_factor(self):
+        return settings.SCRYPT_WORK_FACTOR
+
+    @property
+    def maxmem(self):
+        # OpenSSL refuses anything above 32MB unless told otherwise
+        return 256 * self.work_factor * self.block_size
+
+
+class Argon2PasswordHasher(OffloadedHasherMixin, hashers.Argon2PasswordHasher):
+    @property
+    def time_cost(self):
+        return settings.ARGON2_TIME_COST
+
+    @property
+    def memory_cost(self):
+        return settings.ARGON2_MEMORY_COST
+
+    @property
+    def parallelism(self):
+        return settings.ARGON2_PARALLELISM
@@ -0,0 +1,69 @@
+from accounts.models import SellerStats
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from products.models import Product
+
+EMPTY = (0, 0, 0)
+
+
+class Command(BaseCommand):
+    help = (
+        "Recomputes the stats of every seller from their products and repairs "
+        "the ones that drifted, for instance after products were changed with "
+        "QuerySet.update() or raw SQL."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Only report the sellers whose stats drifted.",
+        )
+
+    def handle(self, *args, **options):
+        actual = {
+            row["user_id"]: (
+                row["active_products"],
+                row["total_quantity"],
+                row["inventory_value"],
+            )
+            for row in Product.objects.seller_totals()
+        }
+        stored = {
+            user_id: tuple(values)
+            for user_id, *values in SellerStats.objects.values_list(
+                "user_id", "active_products", "total_quantity", "inventory_value"
+            )
+        }
+
+        drifted = sorted(
+            user_id
+            for user_id in actual.keys() | stored.keys()
+            if actual.get(user_id, EMPTY) != stored.get(user_id, EMPTY)
+        )
+
+        for user_id in drifted:
+            self.stdout.write(
+                f"Seller {user_id}: stored {stored.get(user_id, EMPTY)}, "
+                f"actual {actual.get(user_id, EMPTY)}"
+            )
+            if not options["dry_run"]:
+                self.repair(user_id)
+
+        verb = "drifted" if options["dry_run"] else "repaired"
+        self.stdout.write(self.style.SUCCESS(f"{len(drifted)} sellers {verb}."))
+
+    def repair(self, user_id):
+        with transaction.atomic():
+            # Writes to the products of this seller wait on this lock, so
+            # their deltas land on top of the recomputed values
+            SellerStats.objects.select_for_update().filter(user_id=user_id).first()
+
+            totals = Product.objects.filter(user_id=user_id).seller_totals().first()
+            if totals is None:
+                totals = dict(
+                    zip(("active_products", "total_quantity", "inventory_value"), EMPTY)
+                )
+            totals.pop("user_id", None)
+
+            SellerStats.objects.update_or_create(user_id=user_id, defaults=totals)
@@ -0,0 +1,20 @@
+# Generated by Django 4.0.5 on 2026-10-18 18:10
+
+from django.db import migrations, models
+import utils.db.operations
+
+
+class Migration(migrations.Migration):
+
+    atomic = False
+
+    dependencies = [
+        ('accounts', '0002_alter_user_email'),
+    ]
+
+    operations = [
+        utils.db.operations.AddIndexConcurrently(
+            model_name='user',
+            index=models.Index(fields=['-date_joined', '-id'], name='user_date_joined_desc_idx'),
+        ),
+    ]
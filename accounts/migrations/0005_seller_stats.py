@@ -0,0 +1,46 @@
+# Generated by Django 4.0.5 on 2026-10-18 18:34
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def populate_seller_stats(apps, schema_editor):
+    Product = apps.get_model('products', 'Product')
+    SellerStats = apps.get_model('accounts', 'SellerStats')
+
+    totals = (
+        Product.objects.filter(is_active=True)
+        .values('user_id')
+        .annotate(
+            active_products=models.Count('id'),
+            total_quantity=models.Sum('quantity'),
+            inventory_value=models.Sum(
+                models.F('quantity') * models.F('price'),
+                output_field=models.DecimalField(max_digits=20, decimal_places=2),
+            ),
+        )
+    )
+    SellerStats.objects.bulk_create(SellerStats(**row) for row in totals)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0004_user_updated_at'),
+        ('products', '0005_product_updated_at'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SellerStats',
+            fields=[
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='seller_stats', serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('active_products', models.IntegerField(default=0)),
+                ('total_quantity', models.BigIntegerField(default=0)),
+                ('inventory_value', models.DecimalField(decimal_places=2, default=0, max_digits=20)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.RunPython(populate_seller_stats, migrations.RunPython.noop),
+    ]
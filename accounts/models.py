@@ -1,5 +1,6 @@
 from django.contrib.auth.models import AbstractUser
 from django.db import models
+from django.utils import timezone
 
 from .utils import CustomUserManager
 
@@ -12,9 +13,69 @@ class User(AbstractUser):
     first_name = models.CharField(max_length=50)
     last_name = models.CharField(max_length=50)
     is_seller = models.BooleanField()
+    updated_at = models.DateTimeField(auto_now=True)
 
     username = None
 
     USERNAME_FIELD = "email"
     REQUIRED_FIELDS = ["first_name", "last_name"]
     objects = CustomUserManager()
+
+    class Meta(AbstractUser.Meta):
+        indexes = [
+            models.Index(
+                fields=["-date_joined", "-id"], name="user_date_joined_desc_idx"
+            ),
+        ]
+
+
+class SellerStatsQuerySet(models.QuerySet):
+    def apply(self, deltas):
+        """
+        Adds `{user_id: (active_products, total_quantity, inventory_value)}`
+        to the stats of each seller with relative UPDATEs, creating the rows
+        that do not exist yet.
+        """
+        for user_id, (products, quantity, value) in sorted(deltas.items()):
+            if not (products or quantity or value):
+                continue
+
+            changes = {
+                "active_products": models.F("active_products") + products,
+                "total_quantity": models.F("total_quantity") + quantity,
+                "inventory_value": models.F("inventory_value") + value,
+                "updated_at": timezone.now(),
+            }
+
+            if self.filter(user_id=user_id).update(**changes):
+                continue
+
+            # get_or_create survives a concurrent insert of the same row
+            _, created = self.get_or_create(
+                user_id=user_id,
+                defaults={
+                    "active_products": products,
+                    "total_quantity": quantity,
+                    "inventory_value": value,
+                },
+            )
+            if not created:
+                self.filter(user_id=user_id).update(**changes)
+
+
+class SellerStats(models.Model):
+    """
+    Aggregates of the active products of a seller, kept up to date by every
+    product write (see `products.models.Product`) and repaired by
+    `manage.py reconcile_seller_stats`.
+    """
+
+    user = models.OneToOneField(
+        User, on_delete=models.CASCADE, primary_key=True, related_name="seller_stats"
+    )
+    active_products = models.IntegerField(default=0)
+    total_quantity = models.BigIntegerField(default=0)
+    inventory_value = models.DecimalField(max_digits=20, decimal_places=2, default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    objects = SellerStatsQuerySet.as_manager()
@@ -1,6 +1,7 @@
 from rest_framework import serializers
 
-from .models import User
+from .authentication import invalidate_user
+from .models import SellerStats, User
 
 
 class LoginSerializer(serializers.Serializer):
@@ -8,7 +9,16 @@ class LoginSerializer(serializers.Serializer):
     password = serializers.CharField(write_only=True)
 
 
+class SellerStatsSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = SellerStats
+        fields = ["active_products", "total_quantity", "inventory_value"]
+        read_only_fields = fields
+
+
 class UserSerializer(serializers.ModelSerializer):
+    seller_stats = SellerStatsSerializer(read_only=True)
+
     class Meta:
         model = User
         fields = [
@@ -18,6 +28,7 @@ class UserSerializer(serializers.ModelSerializer):
             "last_name",
             "is_seller",
             "date_joined",
+            "seller_stats",
         ]
         read_only_fields = ["date_joined"]
         extra_kwargs = {"password": {"write_only": True}}
@@ -34,9 +45,32 @@ class UserSerializer(serializers.ModelSerializer):
         for key, val in validated_data.items():
             setattr(instance, key, val)
         instance.save()
+        invalidate_user(instance)
         return instance
 
 
+class SellerSummarySerializer(serializers.ModelSerializer):
+    seller_stats = SellerStatsSerializer(read_only=True)
+
+    class Meta:
+        model = User
+        fields = ["id", "first_name", "last_name", "date_joined", "seller_stats"]
+        read_only_fields = fields
+
+
+class ImportUserSerializer(UserSerializer):
+    """
+    Row validation of `manage.py import_catalog users`, which checks email
+    uniqueness once per batch and hashes passwords itself.
+    """
+
+    class Meta(UserSerializer.Meta):
+        extra_kwargs = {
+            "password": {"write_only": True, "required": False},
+            "email": {"validators": []},
+        }
+
+
 class ChangeActiveSerializer(serializers.ModelSerializer):
     class Meta:
         model = User
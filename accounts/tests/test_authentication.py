@@ -0,0 +1,119 @@
+from accounts.authentication import token_cache
+from accounts.models import User
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APITestCase
+
+
+class CachedTokenAuthenticationTest(APITestCase):
+    def setUp(self):
+        token_cache.clear()
+
+        self.user = User.objects.create_user(
+            email="gui@mail.com",
+            password="123456",
+            first_name="Guilherme",
+            last_name="Silva",
+            is_seller=True,
+        )
+        self.token = Token.objects.create(user=self.user)
+
+        self.super_user = User.objects.create_superuser(
+            email="lucira@mail.com",
+            password="123456",
+            first_name="Lucira",
+            last_name="Silva",
+        )
+        self.token_super = Token.objects.create(user=self.super_user)
+
+    def token_queries(self, method, url, data, token):
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {token.key}")
+
+        with CaptureQueriesContext(connection) as context:
+            response = getattr(self.client, method)(url, data, format="json")
+
+        queries = [
+            query["sql"]
+            for query in context.captured_queries
+            if "authtoken_token" in query["sql"]
+        ]
+        return response, queries
+
+    def test_hot_token_skips_database(self):
+        url = "/api/products/"
+        data = {"description": "Bola", "price": 10, "quantity": 1}
+
+        _, first = self.token_queries("post", url, data, self.token)
+        response, second = self.token_queries("post", url, data, self.token)
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(len(first), 1)
+        self.assertEqual(second, [])
+
+    def test_deactivated_user_is_rejected(self):
+        url = "/api/products/"
+        data = {"description": "Bola", "price": 10, "quantity": 1}
+        self.token_queries("post", url, data, self.token)
+
+        self.token_queries(
+            "patch",
+            f"/api/accounts/{self.user.id}/management/",
+            {"is_active": False},
+            self.token_super,
+        )
+        response, _ = self.token_queries("post", url, data, self.token)
+
+        self.assertEqual(response.status_code, 401)
+
+    def test_account_update_refreshes_cached_user(self):
+        url = f"/api/accounts/{self.user.id}/"
+        self.token_queries("patch", url, {"is_seller": False}, self.token)
+
+        response, queries = self.token_queries(
+            "post",
+            "/api/products/",
+            {"description": "Bola", "price": 10, "quantity": 1},
+            self.token,
+        )
+
+        self.assertEqual(response.status_code, 403)
+        self.assertEqual(len(queries), 1)
+
+    def test_shared_cache_holds_no_password_hash(self):
+        with self.settings(TOKEN_CACHE_ALIAS="default"):
+            self.token_queries("get", "/api/products/", {}, self.token)
+            _, queries = self.token_queries("get", "/api/products/", {}, self.token)
+
+        cached = cache.get(token_cache.key_prefix + self.token.key)
+
+        self.assertEqual(queries, [])
+        self.assertEqual(cached[0]["email"], self.user.email)
+        self.assertNotIn("password", cached[0])
+        self.assertNotIn(self.user.password, repr(cached))
+        self.assertEqual(token_cache.entries, {})
+
+    def test_shared_cache_sees_invalidations(self):
+        url = "/api/products/"
+        data = {"description": "Bola", "price": 10, "quantity": 1}
+
+        with self.settings(TOKEN_CACHE_ALIAS="default"):
+            self.token_queries("post", url, data, self.token)
+            self.token_queries(
+                "patch",
+                f"/api/accounts/{self.user.id}/management/",
+                {"is_active": False},
+                self.token_super,
+            )
+            response, _ = self.token_queries("post", url, data, self.token)
+
+        self.assertEqual(response.status_code, 401)
+
+    def test_local_cache_is_bounded(self):
+        with self.settings(TOKEN_CACHE_MAX_SIZE=1):
+            token_cache.set("one", 1)
+            token_cache.set("two", 2)
+
+            self.assertIsNone(token_cache.get("one"))
+            self.assertEqual(token_cache.get("two"), 2)
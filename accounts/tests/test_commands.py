@@ -0,0 +1,41 @@
+from io import StringIO
+
+from accounts.models import SellerStats, User
+from django.core.management import call_command
+from django.test import TestCase
+from products.models import Product
+
+
+class ReconcileSellerStatsCommandTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
+            email="gui@mail",
+            password="123456",
+            first_name="Guilherme",
+            last_name="Silva",
+            is_seller=True,
+        )
+        Product.objects.create(description="Bola", price=10, quantity=4, user=cls.user)
+
+    def test_repairs_drift(self):
+        # QuerySet.update() bypasses the stats bookkeeping
+        Product.objects.update(quantity=1)
+        out = StringIO()
+
+        call_command("reconcile_seller_stats", "--dry-run", stdout=out)
+
+        self.assertIn(f"Seller {self.user.id}", out.getvalue())
+        self.assertEqual(SellerStats.objects.get(user=self.user).total_quantity, 4)
+
+        call_command("reconcile_seller_stats", stdout=StringIO())
+
+        stats = SellerStats.objects.get(user=self.user)
+        self.assertEqual((stats.total_quantity, stats.inventory_value), (1, 10))
+
+    def test_nothing_to_repair(self):
+        out = StringIO()
+
+        call_command("reconcile_seller_stats", stdout=out)
+
+        self.assertIn("0 sellers repaired", out.getvalue())
@@ -0,0 +1,58 @@
+import threading
+
+from accounts.hashers import offload
+from accounts.models import User
+from django.contrib.auth.hashers import check_password, make_password
+from django.test import override_settings
+from rest_framework.test import APITestCase
+
+PBKDF2_FIRST = [
+    "accounts.hashers.PBKDF2PasswordHasher",
+    "accounts.hashers.ScryptPasswordHasher",
+]
+SCRYPT_FIRST = list(reversed(PBKDF2_FIRST))
+
+
+@override_settings(
+    PASSWORD_HASHERS=PBKDF2_FIRST, PBKDF2_ITERATIONS=1000, SCRYPT_WORK_FACTOR=2**10
+)
+class PasswordHashingPolicyTest(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email="gui@mail.com",
+            password="123456",
+            first_name="Guilherme",
+            last_name="Silva",
+            is_seller=True,
+        )
+        self.login_data = {"email": "gui@mail.com", "password": "123456"}
+
+    def login(self):
+        response = self.client.post("/api/login/", self.login_data, format="json")
+        self.assertEqual(response.status_code, 200)
+        self.user.refresh_from_db()
+
+    def test_hash_uses_configured_cost(self):
+        self.assertTrue(self.user.password.startswith("pbkdf2_sha256$1000$"))
+
+    def test_login_rehashes_when_cost_changes(self):
+        with self.settings(PBKDF2_ITERATIONS=2000):
+            self.login()
+
+        self.assertTrue(self.user.password.startswith("pbkdf2_sha256$2000$"))
+
+    def test_login_upgrades_to_preferred_algorithm(self):
+        with self.settings(PASSWORD_HASHERS=SCRYPT_FIRST):
+            self.login()
+
+            self.assertTrue(self.user.password.startswith("scrypt$1024$"))
+            self.assertTrue(self.user.check_password("123456"))
+
+    @override_settings(PASSWORD_HASH_WORKERS=2)
+    def test_hashes_run_on_the_hash_pool(self):
+        encoded = make_password("123456")
+
+        self.assertTrue(check_password("123456", encoded))
+        self.assertTrue(
+            offload(lambda: threading.current_thread().name).startswith("password-hash")
+        )
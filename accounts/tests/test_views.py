@@ -1,7 +1,12 @@
 from accounts.models import User
 from accounts.serializers import ChangeActiveSerializer, UserSerializer
+from accounts.views import ListByDateView, UserView
+from asgiref.sync import sync_to_async
+from django.test import AsyncRequestFactory
+from products.models import Product
 from rest_framework.authtoken.models import Token
 from rest_framework.test import APITestCase
+from utils.testing import QueryBudgetMixin
 
 
 class UserCreateViewTest(APITestCase):
@@ -188,3 +193,185 @@ class UserUpdateListViewsTest(APITestCase):
         self.assertEqual(
             UserSerializer(self.users[0:5], many=True).data, response.data["results"]
         )
+
+
+class UserKeysetPaginationViewTest(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.users = [
+            User.objects.create_user(
+                email=f"user{index}@mail.com",
+                password="123456",
+                first_name="Guilherme",
+                last_name="Silva",
+                is_seller=False,
+            )
+            for index in range(7)
+        ]
+
+    def test_keyset_pages_follow_date_joined(self):
+        first = self.client.get("/api/accounts/?cursor=&page_size=4")
+        second = self.client.get(first.data["next"])
+
+        self.assertEqual(first.status_code, 200)
+        self.assertIsNone(second.data["next"])
+        self.assertEqual(
+            UserSerializer(self.users, many=True).data,
+            first.data["results"] + second.data["results"],
+        )
+
+
+class UserQueryCountTest(QueryBudgetMixin, APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        for index in range(10):
+            User.objects.create_user(
+                email=f"user{index}@mail.com",
+                password="123456",
+                first_name="Guilherme",
+                last_name="Silva",
+                is_seller=False,
+            )
+
+    def test_list_accounts_query_budget(self):
+        with self.assertMaxQueries(2):
+            response = self.client.get("/api/accounts/")
+
+        self.assertEqual(response.status_code, 200)
+
+    def test_newest_accounts_query_budget(self):
+        with self.assertMaxQueries(3):
+            response = self.client.get("/api/accounts/newest/5/")
+
+        self.assertEqual(len(response.data["results"]), 5)
+
+
+class UserConditionalGetTest(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.users = [
+            User.objects.create_user(
+                email=f"user{index}@mail.com",
+                password="123456",
+                first_name="Guilherme",
+                last_name="Silva",
+                is_seller=False,
+            )
+            for index in range(3)
+        ]
+
+    def test_unchanged_newest_accounts_are_not_modified(self):
+        response = self.client.get("/api/accounts/newest/2/")
+
+        with self.assertNumQueries(1):
+            not_modified = self.client.get(
+                "/api/accounts/newest/2/", HTTP_IF_NONE_MATCH=response["ETag"]
+            )
+
+        self.assertEqual(not_modified.status_code, 304)
+        self.assertEqual(not_modified["ETag"], response["ETag"])
+
+    def test_updated_account_changes_etag(self):
+        response = self.client.get("/api/accounts/newest/2/")
+
+        newest = self.users[-1]
+        newest.last_name = "Lopreti"
+        newest.save()
+
+        modified = self.client.get(
+            "/api/accounts/newest/2/", HTTP_IF_NONE_MATCH=response["ETag"]
+        )
+
+        self.assertEqual(modified.status_code, 200)
+        self.assertNotEqual(modified["ETag"], response["ETag"])
+
+    def test_etag_depends_on_requested_amount(self):
+        one = self.client.get("/api/accounts/newest/1/")
+        two = self.client.get("/api/accounts/newest/2/")
+
+        self.assertNotEqual(one["ETag"], two["ETag"])
+
+
+class UserAsyncViewTest(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.users = [
+            User.objects.create_user(
+                email=f"user{index}@mail.com",
+                password="123456",
+                first_name="Guilherme",
+                last_name="Silva",
+                is_seller=False,
+            )
+            for index in range(3)
+        ]
+
+    def setUp(self):
+        self.factory = AsyncRequestFactory()
+
+    async def test_newest_accounts_match_sync_view(self):
+        request = self.factory.get("/api/accounts/newest/2/")
+        response = await ListByDateView.as_async_view()(request, num=2)
+        response.render()
+
+        expected = await sync_to_async(self.client.get)("/api/accounts/newest/2/")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data, expected.data)
+        self.assertEqual(response["ETag"], expected["ETag"])
+
+    async def test_account_list_with_cursor(self):
+        request = self.factory.get("/api/accounts/", {"cursor": "", "page_size": 2})
+        response = await UserView.as_async_view()(request)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            [user["email"] for user in response.data["results"]],
+            [user.email for user in self.users[:2]],
+        )
+
+
+class UserSellerStatsViewTest(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.seller = User.objects.create_user(
+            email="gui@mail.com",
+            password="123456",
+            first_name="Guilherme",
+            last_name="Silva",
+            is_seller=True,
+        )
+        cls.buyer = User.objects.create_user(
+            email="lucira@mail.com",
+            password="123456",
+            first_name="Lucira",
+            last_name="Silva",
+            is_seller=False,
+        )
+        Product.objects.create(
+            description="Bola", price=10, quantity=3, user=cls.seller
+        )
+
+    def test_accounts_show_seller_stats(self):
+        response = self.client.get("/api/accounts/")
+
+        stats = {
+            user["email"]: user["seller_stats"] for user in response.data["results"]
+        }
+        self.assertEqual(
+            stats["gui@mail.com"],
+            {"active_products": 1, "total_quantity": 3, "inventory_value": "30.00"},
+        )
+        self.assertIsNone(stats["lucira@mail.com"])
+
+    def test_stats_change_newest_accounts_etag(self):
+        response = self.client.get("/api/accounts/newest/2/")
+
+        Product.objects.create(
+            description="Rede", price=5, quantity=1, user=self.seller
+        )
+
+        modified = self.client.get(
+            "/api/accounts/newest/2/", HTTP_IF_NONE_MATCH=response["ETag"]
+        )
+        self.assertEqual(modified.status_code, 200)
@@ -1,11 +1,12 @@
 from django.urls import path
+from utils.async_views import read_view
 
 from . import views
 
 urlpatterns = [
     path("login/", views.LoginView.as_view()),
-    path("accounts/", views.UserView.as_view()),
-    path("accounts/newest/<int:num>/", views.ListByDateView.as_view()),
+    path("accounts/", read_view(views.UserView)),
+    path("accounts/newest/<int:num>/", read_view(views.ListByDateView)),
     path("accounts/<pk>/", views.UpdateAccountView.as_view()),
     path("accounts/<pk>/management/", views.ChangeActiveView.as_view()),
 ]
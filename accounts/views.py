@@ -1,9 +1,14 @@
 from django.contrib.auth import authenticate
+from django.db.models.functions import Coalesce, Greatest
 from rest_framework import generics
 from rest_framework.authtoken.models import Token
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.views import APIView, Response, status
+from utils.async_views import AsyncReadMixin
+from utils.mixins import ConditionalGetMixin, SerializerByMethodMixin
+from utils.values import ValuesListMixin
 
+from .authentication import invalidate_token, invalidate_user
 from .models import User
 from .permissions import AccountOwnerPermission, AdminPermission
 from .serializers import ChangeActiveSerializer, LoginSerializer, UserSerializer
@@ -23,6 +28,7 @@ class LoginView(APIView):
 
         if user:
             token, _ = Token.objects.get_or_create(user=user)
+            invalidate_token(token.key)
 
             return Response({"token": token.key})
 
@@ -31,19 +37,34 @@ class LoginView(APIView):
         )
 
 
-class UserView(generics.ListCreateAPIView):
+class UserView(
+    SerializerByMethodMixin, ValuesListMixin, AsyncReadMixin, generics.ListCreateAPIView
+):
     queryset = User.objects.all()
     serializer_class = UserSerializer
+    select_related_map = {"GET": ("seller_stats",)}
+    keyset_ordering = ("date_joined", "id")
 
 
-class ListByDateView(generics.ListAPIView):
+class ListByDateView(
+    ConditionalGetMixin,
+    SerializerByMethodMixin,
+    ValuesListMixin,
+    AsyncReadMixin,
+    generics.ListAPIView,
+):
     queryset = User.objects.all()
     serializer_class = UserSerializer
+    select_related_map = {"GET": ("seller_stats",)}
+    # Stats changes must also change the ETag of the listed accounts
+    version_field = Greatest(
+        "updated_at", Coalesce("seller_stats__updated_at", "updated_at")
+    )
 
     def get_queryset(self):
         max_users = self.kwargs["num"]
 
-        return self.queryset.order_by("-date_joined")[0:max_users]
+        return super().get_queryset().order_by("-date_joined")[0:max_users]
 
 
 class UpdateAccountView(generics.UpdateAPIView):
@@ -58,3 +79,7 @@ class ChangeActiveView(generics.UpdateAPIView):
 
     queryset = User.objects.all()
     serializer_class = ChangeActiveSerializer
+
+    def perform_update(self, serializer):
+        user = serializer.save()
+        invalidate_user(user)
@@ -0,0 +1,217 @@
+"""
+Throughput and p50/p95/p99 latency of every API endpoint on the production
+server (gunicorn.conf.py), against data seeded by benchmarks.seed:
+
+    python -m benchmarks.endpoints --seconds 10 --output results.json
+    python -m benchmarks.endpoints --baseline results.json --tolerance 0.15
+
+Each client process logs in as its own benchmark seller, so writes do not
+all contend on the same rows. Failed requests are counted as errors and
+left out of the latencies. The exit status is 1 when a result is worse
+than the baseline by more than the tolerance or fails more often than in
+the baseline, and on any failed request without a baseline.
+"""
+import argparse
+import http.client
+import json
+import os
+import random
+import signal
+import time
+from multiprocessing import Pool
+
+import django
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "komercio.settings")
+django.setup()
+
+from benchmarks import results  # noqa: E402
+from benchmarks.load import free_port, start_server, wait_until_ready  # noqa: E402
+from benchmarks.seed import PASSWORD, bench_sellers, bench_users  # noqa: E402
+from django.db import connections  # noqa: E402
+from products.models import Product  # noqa: E402
+
+# name: (method, path, body, authenticated); paths are formatted with the
+# client's `seller` id and a random `product` of that seller
+SCENARIOS = {
+    "login": ("POST", "/api/login/", "login", False),
+    "product-list": ("GET", "/api/products/", None, False),
+    "product-detail": ("GET", "/api/products/{product}/", None, False),
+    "product-create": (
+        "POST",
+        "/api/products/",
+        {"description": "Bench product", "price": 10.5, "quantity": 3},
+        True,
+    ),
+    "product-patch": ("PATCH", "/api/products/{product}/", {"price": 11.5}, True),
+    "account-list": ("GET", "/api/accounts/", None, False),
+    "account-newest": ("GET", "/api/accounts/newest/10/", None, False),
+    "account-update": (
+        "PATCH",
+        "/api/accounts/{seller}/",
+        {"first_name": "Bench"},
+        True,
+    ),
+}
+
+
+def request(connection, method, path, body=None, token=None):
+    headers = {"Host": "localhost"}
+    payload = None
+    if body is not None:
+        payload = json.dumps(body)
+        headers["Content-Type"] = "application/json"
+    if token:
+        headers["Authorization"] = f"Token {token}"
+
+    connection.request(method, path, body=payload, headers=headers)
+    response = connection.getresponse()
+    return response.status, response.read()
+
+
+def log_in(port, email):
+    connection = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+    status, content = request(
+        connection,
+        "POST",
+        "/api/login/",
+        {"email": email, "password": PASSWORD},
+    )
+    connection.close()
+
+    if status != 200:
+        raise RuntimeError(f"login of {email} failed with {status}")
+    return json.loads(content)["token"]
+
+
+def client(args):
+    port, scenario, identity, seconds = args
+    method, path, body, authenticated = SCENARIOS[scenario]
+    if body == "login":
+        body = {"email": identity["email"], "password": PASSWORD}
+    token = identity["token"] if authenticated else None
+
+    latencies = []
+    errors = 0
+    connection = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+    deadline = time.perf_counter() + seconds
+
+    while time.perf_counter() < deadline:
+        target = path.format(
+            seller=identity["seller"], product=random.choice(identity["products"])
+        )
+        started = time.perf_counter()
+        try:
+            status, _ = request(connection, method, target, body, token)
+        except (OSError, http.client.HTTPException):
+            errors += 1
+            connection.close()
+            connection = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+            continue
+        # Failed requests stay out of the latencies
+        if status >= 400:
+            errors += 1
+            continue
+        latencies.append(time.perf_counter() - started)
+
+    return latencies, errors
+
+
+def identities(port, clients):
+    sellers = list(bench_sellers().order_by("pk").values_list("pk", "email")[:clients])
+    if len(sellers) < clients:
+        raise SystemExit(f"{clients} benchmark sellers needed, run benchmarks.seed.")
+
+    found = []
+    for seller, email in sellers:
+        products = list(
+            Product.objects.filter(user_id=seller).values_list("pk", flat=True)[:100]
+        )
+        if not products:
+            raise SystemExit(f"Seller {email} has no products, run benchmarks.seed.")
+
+        found.append(
+            {
+                "seller": seller,
+                "email": email,
+                "products": products,
+                "token": log_in(port, email),
+            }
+        )
+
+    return found
+
+
+def run(scenario, port, users, seconds):
+    with Pool(len(users)) as pool:
+        measured = pool.map(
+            client, [(port, scenario, identity, seconds) for identity in users]
+        )
+
+    latencies = sorted(latency for result, _ in measured for latency in result)
+    errors = sum(errors for _, errors in measured)
+
+    return {
+        "name": scenario,
+        "requests": len(latencies),
+        "requests_per_second": round(len(latencies) / seconds, 2),
+        "p50_ms": round(results.percentile(latencies, 0.50) * 1000, 2),
+        "p95_ms": round(results.percentile(latencies, 0.95) * 1000, 2),
+        "p99_ms": round(results.percentile(latencies, 0.99) * 1000, 2),
+        "errors": errors,
+    }
+
+
+def main():
+    cores = os.cpu_count() or 1
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "--scenarios", nargs="+", choices=list(SCENARIOS), default=list(SCENARIOS)
+    )
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--workers", type=int, default=cores)
+    parser.add_argument("--threads", type=int, default=4)
+    parser.add_argument("--clients", type=int, default=cores * 2)
+    parser.add_argument("--mode", choices=["wsgi", "asgi"], default="wsgi")
+    results.add_arguments(parser)
+    args = parser.parse_args()
+
+    meta = {
+        "mode": args.mode,
+        "workers": args.workers,
+        "threads": args.threads,
+        "clients": args.clients,
+        "seconds": args.seconds,
+        "users": bench_users().count(),
+        "products": Product.objects.count(),
+    }
+    print("# " + " ".join(f"{key}={value}" for key, value in meta.items()))
+
+    port = free_port()
+    server = start_server(port, args.workers, args.threads, args.mode)
+    measured = []
+
+    try:
+        wait_until_ready(port, "/api/products/")
+        users = identities(port, args.clients)
+        # The client processes are forked and never use the database
+        connections.close_all()
+
+        for scenario in args.scenarios:
+            result = run(scenario, port, users, args.seconds)
+            measured.append(result)
+            print(
+                f"{scenario:16} {result['requests_per_second']:>10.2f} req/s  "
+                f"p50 {result['p50_ms']:>8.2f}ms  p95 {result['p95_ms']:>8.2f}ms  "
+                f"p99 {result['p99_ms']:>8.2f}ms  errors {result['errors']}"
+            )
+    finally:
+        server.send_signal(signal.SIGTERM)
+        server.wait()
+
+    results.report(args, meta, measured)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,173 @@
+"""
+Requests per second of the production server (gunicorn.conf.py) for a growing
+number of workers, to check throughput scales with the cores:
+
+    python -m benchmarks.load --path /api/products/ --workers 1 2 4 --seconds 10
+
+Each run starts gunicorn on a free port against the configured database and
+drives it from `--clients` processes holding keep-alive connections.
+"""
+import argparse
+import http.client
+import json
+import os
+import signal
+import socket
+import subprocess
+import sys
+import time
+from multiprocessing import Pool
+from pathlib import Path
+
+from benchmarks.results import percentile
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def wait_until_ready(port, path, timeout=30):
+    deadline = time.monotonic() + timeout
+
+    while time.monotonic() < deadline:
+        try:
+            connection = http.client.HTTPConnection("127.0.0.1", port, timeout=1)
+            connection.request("GET", path, headers={"Host": "localhost"})
+            connection.getresponse().read()
+            return
+        except (OSError, http.client.HTTPException):
+            time.sleep(0.2)
+
+    raise RuntimeError(f"server did not answer on port {port}")
+
+
+def start_server(port, workers, threads, mode):
+    env = {
+        **os.environ,
+        "PORT": str(port),
+        "WEB_CONCURRENCY": str(workers),
+        "GUNICORN_THREADS": str(threads),
+        "SERVER_MODE": mode,
+        "DEBUG": "false",
+        "GUNICORN_ACCESSLOG": "",
+    }
+    # The ASGI application refuses persistent connections
+    if mode == "asgi" and env.get("DATABASE_POOL_MODE") != "pool":
+        env["CONN_MAX_AGE"] = "0"
+    return subprocess.Popen(
+        [
+            sys.executable,
+            "-m",
+            "gunicorn",
+            "-c",
+            "gunicorn.conf.py",
+            "--log-level",
+            "warning",
+        ],
+        cwd=BASE_DIR,
+        env=env,
+    )
+
+
+def client(args):
+    port, path, seconds = args
+    latencies = []
+    errors = 0
+    connection = http.client.HTTPConnection("127.0.0.1", port, timeout=10)
+    deadline = time.perf_counter() + seconds
+
+    while time.perf_counter() < deadline:
+        started = time.perf_counter()
+        try:
+            connection.request("GET", path, headers={"Host": "localhost"})
+            response = connection.getresponse()
+            response.read()
+        except (OSError, http.client.HTTPException):
+            errors += 1
+            connection.close()
+            connection = http.client.HTTPConnection("127.0.0.1", port, timeout=10)
+            continue
+        # Failed requests stay out of the latencies
+        if response.status >= 400:
+            errors += 1
+            continue
+        latencies.append(time.perf_counter() - started)
+
+    return latencies, errors
+
+
+def run(workers, args):
+    port = free_port()
+    server = start_server(port, workers, args.threads, args.mode)
+
+    try:
+        wait_until_ready(port, args.path)
+
+        with Pool(args.clients) as pool:
+            results = pool.map(client, [(port, args.path, args.seconds)] * args.clients)
+    finally:
+        server.send_signal(signal.SIGTERM)
+        server.wait()
+
+    latencies = sorted(latency for result, _ in results for latency in result)
+    errors = sum(errors for _, errors in results)
+
+    return {
+        "workers": workers,
+        "mode": args.mode,
+        "clients": args.clients,
+        "requests_per_second": round(len(latencies) / args.seconds, 2),
+        "p50_ms": round(percentile(latencies, 0.50) * 1000, 2),
+        "p99_ms": round(percentile(latencies, 0.99) * 1000, 2),
+        "errors": errors,
+    }
+
+
+def main():
+    cores = os.cpu_count() or 1
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--path", default="/api/products/")
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument(
+        "--workers",
+        type=int,
+        nargs="+",
+        default=sorted({1, max(1, cores // 2), cores, cores * 2}),
+    )
+    parser.add_argument("--threads", type=int, default=4)
+    parser.add_argument("--clients", type=int, default=cores * 4)
+    parser.add_argument("--mode", choices=["wsgi", "asgi"], default="wsgi")
+    parser.add_argument("--json", action="store_true", help="Print JSON lines.")
+    args = parser.parse_args()
+
+    print(f"# {args.mode} GET {args.path} cores={cores} clients={args.clients}")
+
+    per_worker = None
+    for workers in args.workers:
+        result = run(workers, args)
+
+        # Efficiency against linear scaling from the first run
+        if per_worker is None:
+            per_worker = result["requests_per_second"] / workers
+        linear = per_worker * workers
+        result["scaling"] = (
+            round(result["requests_per_second"] / linear, 2) if linear else 0
+        )
+
+        if args.json:
+            print(json.dumps(result))
+        else:
+            print(
+                f"{workers:>3} workers {result['requests_per_second']:>10.2f} req/s  "
+                f"p50 {result['p50_ms']:>8.2f}ms  p99 {result['p99_ms']:>8.2f}ms  "
+                f"scaling {result['scaling']}  errors {result['errors']}"
+            )
+
+
+if __name__ == "__main__":
+    main()
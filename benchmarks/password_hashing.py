@@ -0,0 +1,107 @@
+"""
+Password verifications (logins) per second for each hashing policy, on one
+thread and on a pool of threads, so cost settings can be compared before and
+after a change:
+
+    python -m benchmarks.password_hashing --seconds 3 --threads 4
+"""
+import argparse
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import django
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "komercio.settings")
+django.setup()
+
+from django.conf import settings  # noqa: E402
+from django.contrib.auth.hashers import check_password, make_password  # noqa: E402
+from django.test.utils import override_settings  # noqa: E402
+
+POLICIES = {
+    "pbkdf2-django-default": {
+        "PASSWORD_HASHERS": ["accounts.hashers.PBKDF2PasswordHasher"],
+        "PBKDF2_ITERATIONS": 320000,
+    },
+    "pbkdf2-configured": {
+        "PASSWORD_HASHERS": ["accounts.hashers.PBKDF2PasswordHasher"],
+    },
+    "scrypt-configured": {
+        "PASSWORD_HASHERS": ["accounts.hashers.ScryptPasswordHasher"],
+    },
+    "argon2-configured": {
+        "PASSWORD_HASHERS": ["accounts.hashers.Argon2PasswordHasher"],
+    },
+}
+
+
+def verify_for(encoded, seconds):
+    count = 0
+    deadline = time.perf_counter() + seconds
+
+    while time.perf_counter() < deadline:
+        check_password("correct horse battery staple", encoded)
+        count += 1
+
+    return count
+
+
+def run_policy(name, overrides, seconds, threads):
+    with override_settings(PASSWORD_HASH_WORKERS=0, **overrides):
+        try:
+            encoded = make_password("correct horse battery staple")
+        except ValueError as exc:
+            return {"policy": name, "skipped": str(exc)}
+
+        single = verify_for(encoded, seconds) / seconds
+
+        with ThreadPoolExecutor(max_workers=threads) as executor:
+            counts = executor.map(verify_for, [encoded] * threads, [seconds] * threads)
+            parallel = sum(counts) / seconds
+
+    cores = min(threads, os.cpu_count() or 1)
+
+    return {
+        "policy": name,
+        "algorithm": encoded.split("$", 1)[0],
+        "logins_per_second_one_thread": round(single, 2),
+        "logins_per_second_pool": round(parallel, 2),
+        "logins_per_second_per_core": round(parallel / cores, 2),
+        "threads": threads,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--seconds", type=float, default=3)
+    parser.add_argument("--threads", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--json", action="store_true", help="Print JSON lines.")
+    args = parser.parse_args()
+
+    print(
+        f"# PBKDF2_ITERATIONS={settings.PBKDF2_ITERATIONS} "
+        f"SCRYPT_WORK_FACTOR={settings.SCRYPT_WORK_FACTOR} "
+        f"ARGON2_TIME_COST={settings.ARGON2_TIME_COST} "
+        f"ARGON2_MEMORY_COST={settings.ARGON2_MEMORY_COST}"
+    )
+
+    for name, overrides in POLICIES.items():
+        result = run_policy(name, overrides, args.seconds, args.threads)
+
+        if args.json:
+            print(json.dumps(result))
+        elif "skipped" in result:
+            print(f"{name:24} skipped: {result['skipped']}")
+        else:
+            print(
+                f"{name:24} {result['logins_per_second_one_thread']:>10.2f}/s "
+                f"one thread  {result['logins_per_second_pool']:>10.2f}/s "
+                f"on {args.threads} threads  "
+                f"{result['logins_per_second_per_core']:>10.2f}/s per core"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+CPU time per response of the DRF JSON renderer and the orjson renderer on
+product pages of growing size, serialized once up front:
+
+    python -m benchmarks.renderers --sizes 100 1000 10000 --repeat 20
+"""
+import argparse
+import os
+import statistics
+import time
+
+import django
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "komercio.settings")
+django.setup()
+
+from benchmarks import results  # noqa: E402
+from benchmarks.serializers import build_products  # noqa: E402
+from products.serializers import (  # noqa: E402
+    CreateProductSerializer,
+    ListProductSerializer,
+)
+from rest_framework.renderers import JSONRenderer  # noqa: E402
+from utils.renderers import ORJSONRenderer  # noqa: E402
+
+RENDERERS = {"json": JSONRenderer(), "orjson": ORJSONRenderer()}
+PAGES = {"list": ListProductSerializer, "detail": CreateProductSerializer}
+
+
+def cpu_per_call(function, repeat):
+    function()
+
+    timings = []
+    for _ in range(repeat):
+        started = time.process_time()
+        function()
+        timings.append(time.process_time() - started)
+
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 10000])
+    parser.add_argument("--repeat", type=int, default=20)
+    results.add_arguments(parser)
+    args = parser.parse_args()
+
+    measured = []
+    for size in args.sizes:
+        products = build_products(size)
+
+        for page, serializer_class in PAGES.items():
+            data = {"results": serializer_class(products, many=True).data}
+            baseline = None
+
+            for name, renderer in RENDERERS.items():
+                cpu = cpu_per_call(lambda: renderer.render(data), args.repeat)
+                baseline = baseline or cpu
+                result = {
+                    "name": f"{page}-{size}-{name}",
+                    "cpu_ms_per_response": round(cpu * 1000, 3),
+                    "bytes": len(renderer.render(data)),
+                    "speedup": round(baseline / cpu, 2) if cpu else 0,
+                }
+                measured.append(result)
+                print(
+                    f"{result['name']:22} {result['cpu_ms_per_response']:>10.3f}ms "
+                    f"{result['bytes']:>10} bytes  x{result['speedup']}"
+                )
+
+    results.report(args, {"repeat": args.repeat}, measured)
+
+
+if __name__ == "__main__":
+    main()
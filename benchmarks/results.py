@@ -0,0 +1,119 @@
+"""
+JSON results shared by the benchmarks and their comparison to a baseline:
+
+    {"meta": {...}, "results": [{"name": "product-list", "p95_ms": 12.3, ...}]}
+"""
+import json
+import sys
+
+LOWER_IS_BETTER = ("p50_ms", "p95_ms", "p99_ms", "us_per_item", "cpu_ms_per_response")
+HIGHER_IS_BETTER = ("requests_per_second", "items_per_second")
+
+
+def percentile(values, fraction):
+    """
+    Nearest rank percentile of already sorted values.
+    """
+    if not values:
+        return 0
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+def write(path, meta, results):
+    with open(path, "w") as target:
+        json.dump({"meta": meta, "results": results}, target, indent=2)
+        target.write("\n")
+
+
+def error_rate(result):
+    """
+    Fraction of the requests of a result that failed, `requests` counting
+    the successful ones.
+    """
+    errors = result.get("errors", 0)
+    total = result.get("requests", 0) + errors
+    return errors / total if total else 0
+
+
+def compare(results, baseline_path, tolerance):
+    """
+    Returns the `(name, metric, baseline, current)` of every metric worse than
+    the baseline by more than `tolerance` (0.1 is 10%), and of every error
+    rate above the one of the baseline, zero for results it does not have.
+    """
+    with open(baseline_path) as source:
+        baseline = {item["name"]: item for item in json.load(source)["results"]}
+
+    regressions = []
+    for result in results:
+        previous = baseline.get(result["name"])
+
+        previous_rate = error_rate(previous or {})
+        if error_rate(result) > previous_rate:
+            regressions.append(
+                (
+                    result["name"],
+                    "error_rate",
+                    round(previous_rate, 4),
+                    round(error_rate(result), 4),
+                )
+            )
+
+        if previous is None:
+            continue
+
+        for metric in LOWER_IS_BETTER + HIGHER_IS_BETTER:
+            if metric not in result or not previous.get(metric):
+                continue
+
+            ratio = result[metric] / previous[metric]
+            if metric in LOWER_IS_BETTER:
+                worse = ratio > 1 + tolerance
+            else:
+                worse = ratio < 1 - tolerance
+
+            if worse:
+                regressions.append(
+                    (result["name"], metric, previous[metric], result[metric])
+                )
+
+    return regressions
+
+
+def report(args, meta, results):
+    """
+    Writes `--output`, checks `--baseline` and exits with status 1 on
+    regressions. Without a baseline, any failed request exits with status 1.
+    """
+    if args.output:
+        write(args.output, meta, results)
+
+    if not args.baseline:
+        failed = [result for result in results if result.get("errors")]
+        for result in failed:
+            print(f"ERRORS {result['name']}: {result['errors']}")
+        if failed:
+            sys.exit(1)
+        return
+
+    regressions = compare(results, args.baseline, args.tolerance)
+    for name, metric, previous, current in regressions:
+        print(f"REGRESSION {name} {metric}: {previous} -> {current}")
+
+    if regressions:
+        sys.exit(1)
+
+    print(f"# no regression over {args.tolerance:.0%} against {args.baseline}")
+
+
+def add_arguments(parser):
+    parser.add_argument("--output", help="Write the results to this JSON file.")
+    parser.add_argument(
+        "--baseline", help="Fail when worse than the results in this JSON file."
+    )
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.1,
+        help="Accepted slowdown against the baseline (default 0.1, 10%%).",
+    )
@@ -0,0 +1,148 @@
+"""
+Seeds the configured database with benchmark users and products:
+
+    python -m benchmarks.seed --users 10000 --products 100000
+    python -m benchmarks.seed --users 1000000 --products 10000000 --batch-size 20000
+
+Benchmark users have `@bench.komercio` emails and the password
+`bench-password`; one in `--seller-every` is a seller and products are spread
+over the sellers. Running it again only adds the missing rows, `--reset`
+deletes the benchmark data first.
+"""
+import argparse
+import itertools
+import os
+import time
+
+import django
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "komercio.settings")
+django.setup()
+
+from accounts.models import User  # noqa: E402
+from django.contrib.auth.hashers import make_password  # noqa: E402
+from django.db import transaction  # noqa: E402
+from django.utils import timezone  # noqa: E402
+from products.models import Product  # noqa: E402
+from utils import cache  # noqa: E402
+
+DOMAIN = "bench.komercio"
+PASSWORD = "bench-password"
+
+
+def bench_users():
+    return User.objects.filter(email__endswith=f"@{DOMAIN}")
+
+
+def bench_sellers():
+    return bench_users().filter(is_seller=True)
+
+
+def seed_users(total, seller_every, batch_size):
+    start = bench_users().count()
+    # Hashing once keeps seeding fast, every user logs in with PASSWORD
+    password = make_password(PASSWORD)
+    now = timezone.now()
+
+    for first in range(start, total, batch_size):
+        users = [
+            User(
+                email=f"bench{index}@{DOMAIN}",
+                password=password,
+                first_name="Bench",
+                last_name=f"User {index}",
+                is_seller=index % seller_every == 0,
+                is_staff=True,
+                is_active=True,
+                is_superuser=False,
+                date_joined=now,
+            )
+            for index in range(first, min(first + batch_size, total))
+        ]
+        with transaction.atomic():
+            User.objects.bulk_create(users)
+        yield len(users)
+
+
+def seed_products(total, batch_size):
+    start = Product.objects.filter(user__in=bench_sellers()).count()
+    seller_ids = list(bench_sellers().values_list("pk", flat=True))
+    if start < total and not seller_ids:
+        raise SystemExit("No benchmark sellers, seed users first.")
+    sellers = itertools.cycle(seller_ids)
+
+    for first in range(start, total, batch_size):
+        products = [
+            Product(
+                description=f"Bench product {index}",
+                price=(index % 1000) + 0.99,
+                quantity=index % 50,
+                user_id=next(sellers),
+            )
+            for index in range(first, min(first + batch_size, total))
+        ]
+        # Product.objects.bulk_create keeps the sellers' stats up to date
+        with transaction.atomic():
+            Product.objects.bulk_create(products)
+        yield len(products)
+
+
+def delete_batches(queryset, batch_size, raw=False):
+    """
+    Deletes `queryset` `batch_size` primary keys at a time, with a raw
+    `DELETE` that skips the collector and signals when `raw` is set.
+    """
+    model = queryset.model
+    deleted = 0
+
+    while True:
+        pks = list(queryset.values_list("pk", flat=True)[:batch_size])
+        if not pks:
+            return deleted
+
+        batch = model.objects.filter(pk__in=pks)
+        with transaction.atomic():
+            if raw:
+                deleted += batch._raw_delete(batch.db)
+            else:
+                deleted += batch.delete()[0]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--users", type=int, default=10000)
+    parser.add_argument("--products", type=int, default=10000)
+    parser.add_argument("--seller-every", type=int, default=10)
+    parser.add_argument("--batch-size", type=int, default=5000)
+    parser.add_argument("--reset", action="store_true")
+    args = parser.parse_args()
+
+    if args.reset:
+        # Products have no dependents, deleting them raw keeps the users'
+        # cascade from loading millions of rows; cache.invalidate below
+        # stands in for their post_delete signal
+        products = Product.objects.filter(user__in=bench_users())
+        deleted = delete_batches(products, args.batch_size, raw=True)
+        deleted += delete_batches(bench_users(), args.batch_size)
+        print(f"deleted {deleted} rows")
+
+    for name, rows in (
+        ("users", seed_users(args.users, args.seller_every, args.batch_size)),
+        ("products", seed_products(args.products, args.batch_size)),
+    ):
+        started = time.monotonic()
+        added = 0
+        for batch in rows:
+            added += batch
+            print(f"\r{name}: {added} added", end="", flush=True)
+        if added:
+            rate = added / (time.monotonic() - started)
+            print(f"\r{name}: {added} added ({rate:.0f} rows/s)")
+        else:
+            print(f"{name}: already seeded")
+
+    cache.invalidate("products")
+
+
+if __name__ == "__main__":
+    main()
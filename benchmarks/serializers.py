@@ -0,0 +1,129 @@
+"""
+Cost per item of the product serializers and of the values() fast path of
+the list endpoints, without the database or HTTP, to see serializer changes
+in isolation:
+
+    python -m benchmarks.serializers --items 1000 --repeat 20
+    python -m benchmarks.serializers --baseline serializers.json
+"""
+import argparse
+import os
+import statistics
+import time
+from decimal import Decimal
+
+import django
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "komercio.settings")
+django.setup()
+
+from accounts.models import SellerStats, User  # noqa: E402
+from benchmarks import results  # noqa: E402
+from django.utils import timezone  # noqa: E402
+from products.models import Product  # noqa: E402
+from products.serializers import (  # noqa: E402
+    CreateProductSerializer,
+    ListProductSerializer,
+)
+from utils.values import values_plan  # noqa: E402
+
+
+def build_products(count):
+    seller = User(
+        pk=1,
+        email="bench0@bench.komercio",
+        first_name="Bench",
+        last_name="User 0",
+        is_seller=True,
+        date_joined=timezone.now(),
+    )
+    # Caches the relation, the nested UserSerializer would query it
+    seller.seller_stats = SellerStats(
+        user=seller,
+        active_products=count,
+        total_quantity=count * 10,
+        inventory_value=Decimal("123456.78"),
+    )
+
+    return [
+        Product(
+            pk=index + 1,
+            description=f"Bench product {index}",
+            price=Decimal(f"{index % 1000}.99"),
+            quantity=index % 50,
+            is_active=True,
+            user=seller,
+        )
+        for index in range(count)
+    ]
+
+
+def cases(products):
+    payload = [
+        {"description": p.description, "price": str(p.price), "quantity": p.quantity}
+        for p in products
+    ]
+
+    # The rows GET /api/products/ reads through utils.values.ValuesListMixin
+    plan = values_plan(ListProductSerializer, Product)
+    rows = [
+        {column: getattr(product, column) for column in plan.columns}
+        for product in products
+    ]
+
+    def validate():
+        serializer = CreateProductSerializer(data=payload, many=True)
+        serializer.is_valid()
+
+    return {
+        "list-product-represent": lambda: ListProductSerializer(
+            products, many=True
+        ).data,
+        "list-product-values-plan": lambda: plan.represent(rows),
+        "create-product-represent": lambda: CreateProductSerializer(
+            products, many=True
+        ).data,
+        "create-product-validate": validate,
+    }
+
+
+def measure(function, items, repeat):
+    function()
+
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - started)
+
+    median = statistics.median(timings)
+    return {
+        "us_per_item": round(median / items * 1e6, 3),
+        "items_per_second": round(items / median, 2),
+        "best_us_per_item": round(min(timings) / items * 1e6, 3),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--items", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=20)
+    results.add_arguments(parser)
+    args = parser.parse_args()
+
+    products = build_products(args.items)
+    measured = []
+
+    for name, function in cases(products).items():
+        result = {"name": name, **measure(function, args.items, args.repeat)}
+        measured.append(result)
+        print(
+            f"{name:26} {result['us_per_item']:>10.3f}us/item  "
+            f"{result['items_per_second']:>12.2f} items/s"
+        )
+
+    results.report(args, {"items": args.items, "repeat": args.repeat}, measured)
+
+
+if __name__ == "__main__":
+    main()
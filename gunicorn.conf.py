@@ -0,0 +1,55 @@
+"""
+Gunicorn settings for production, read by `gunicorn -c gunicorn.conf.py`.
+
+SERVER_MODE picks the WSGI application on threaded workers (`wsgi`, default)
+or the ASGI application on uvicorn workers (`asgi`). WEB_CONCURRENCY and
+GUNICORN_THREADS override the worker and thread counts derived from the
+number of cores.
+
+The ASGI application refuses to start with persistent database connections
+(see komercio/asgi.py), so `asgi` needs DATABASE_POOL_MODE=pool or
+CONN_MAX_AGE=0. GET /products/export/ answers 501 under ASGI, which iterates
+streaming bodies in the event loop where the export cursor cannot run.
+"""
+import multiprocessing
+import os
+
+SERVER_MODE = os.environ.get("SERVER_MODE", "wsgi")
+CORES = multiprocessing.cpu_count()
+
+bind = f"0.0.0.0:{os.environ.get('PORT', '8000')}"
+
+if SERVER_MODE == "asgi":
+    wsgi_app = "komercio.asgi:application"
+    worker_class = "uvicorn.workers.UvicornWorker"
+    workers = int(os.environ.get("WEB_CONCURRENCY", CORES + 1))
+else:
+    wsgi_app = "komercio.wsgi:application"
+    worker_class = "gthread"
+    workers = int(os.environ.get("WEB_CONCURRENCY", CORES * 2 + 1))
+    threads = int(os.environ.get("GUNICORN_THREADS", 4))
+
+# Import Django once in the master so workers share its pages copy-on-write
+preload_app = True
+
+# Recycle workers to bound slow memory growth, staggered by the jitter
+max_requests = int(os.environ.get("GUNICORN_MAX_REQUESTS", 1000))
+max_requests_jitter = int(os.environ.get("GUNICORN_MAX_REQUESTS_JITTER", 100))
+
+# Longer than the 5s idle timeout of most load balancers, never shorter
+keepalive = int(os.environ.get("GUNICORN_KEEPALIVE", 75))
+timeout = int(os.environ.get("GUNICORN_TIMEOUT", 30))
+graceful_timeout = 30
+
+# Heartbeat files in memory, docker's /tmp may be a slow overlay filesystem
+worker_tmp_dir = "/dev/shm" if os.path.isdir("/dev/shm") else None
+
+accesslog = os.environ.get("GUNICORN_ACCESSLOG", "-") or None
+errorlog = "-"
+
+
+def post_fork(server, worker):
+    # Nothing should query while preloading, but never share a socket
+    from django.db import connections
+
+    connections.close_all()
@@ -9,8 +9,22 @@ https://docs.djangoproject.com/en/4.0/howto/deployment/asgi/
 
 import os
 
+from django.conf import settings
 from django.core.asgi import get_asgi_application
+from django.core.exceptions import ImproperlyConfigured
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'komercio.settings')
+os.environ.setdefault('ASYNC_READ_VIEWS', 'true')
 
 application = get_asgi_application()
+
+# Each ASGI request runs its sync code, queries included, in a thread of its
+# own, so a persistent connection would be opened per request and left open
+# until the thread is collected.
+for alias, database in settings.DATABASES.items():
+    if database.get('CONN_MAX_AGE', 0) != 0:
+        raise ImproperlyConfigured(
+            f'The ASGI application needs DATABASE_POOL_MODE=pool or '
+            f'CONN_MAX_AGE=0, the {alias!r} database has CONN_MAX_AGE='
+            f"{database['CONN_MAX_AGE']}."
+        )
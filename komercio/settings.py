@@ -15,6 +15,7 @@ from pathlib import Path
 import dj_database_url
 import dotenv
 import environ
+from django.core.exceptions import ImproperlyConfigured
 
 dotenv.load_dotenv()
 
@@ -31,9 +32,11 @@ environ.Env.read_env(BASE_DIR / ".env")
 SECRET_KEY = env("SECRET_KEY")
 
 # SECURITY WARNING: don't run with debug turned on in production!
-DEBUG = True
+DEBUG = env("DEBUG")
 
-ALLOWED_HOSTS = ["komercio-guilopreti.herokuapp.com", "localhost"]
+ALLOWED_HOSTS = env.list(
+    "ALLOWED_HOSTS", default=["komercio-guilopreti.herokuapp.com", "localhost"]
+)
 
 
 # Application definition
@@ -45,6 +48,7 @@ DJANGO_APPS = [
     "django.contrib.sessions",
     "django.contrib.messages",
     "django.contrib.staticfiles",
+    "django.contrib.postgres",
 ]
 
 THIRD_PARTY_APP = ["rest_framework", "rest_framework.authtoken"]
@@ -54,7 +58,11 @@ MY_APPS = ["accounts", "products"]
 INSTALLED_APPS = DJANGO_APPS + THIRD_PARTY_APP + MY_APPS
 
 MIDDLEWARE = [
+    "utils.middleware.MetricsMiddleware",
+    "utils.middleware.QueryInspectionMiddleware",
+    "utils.middleware.CompressionMiddleware",
     "django.middleware.security.SecurityMiddleware",
+    "utils.middleware.ReplicaPinningMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
@@ -106,6 +114,98 @@ if DATABASE_URL:
     )
     DATABASES["default"].update(db_from_env)
 
+# Connection handling (utils.db.postgresql), DATABASE_POOL_MODE is one of:
+# - persistent: one connection per thread kept for CONN_MAX_AGE seconds and
+#   pinged before its first query in each request
+# - pool: each request checks a connection out of a per-process pool of
+#   DATABASE_POOL_SIZE connections, waiting up to DATABASE_POOL_TIMEOUT seconds
+# - pgbouncer: persistent connections to PgBouncer in transaction pooling
+#   mode, which cannot keep server-side cursors across transactions
+
+DATABASE_POOL_MODE = env("DATABASE_POOL_MODE", default="persistent")
+
+DATABASES["default"]["ENGINE"] = "utils.db.postgresql"
+DATABASES["default"]["CONN_HEALTH_CHECKS"] = True
+
+if DATABASE_POOL_MODE == "pool":
+    DATABASES["default"]["CONN_MAX_AGE"] = 0
+    DATABASES["default"]["POOL"] = {
+        "SIZE": env.int("DATABASE_POOL_SIZE", default=4),
+        "TIMEOUT": env.float("DATABASE_POOL_TIMEOUT", default=5),
+        "CHECK_INTERVAL": env.float("DATABASE_POOL_CHECK_INTERVAL", default=30),
+    }
+else:
+    DATABASES["default"]["CONN_MAX_AGE"] = env.int("CONN_MAX_AGE", default=500)
+
+if DATABASE_POOL_MODE == "pgbouncer":
+    DATABASES["default"]["DISABLE_SERVER_SIDE_CURSORS"] = True
+
+# Read replicas (utils.routers.ReplicaRouter), comma separated database URLs.
+# Reads of unsafe requests, and of the same credentials for
+# REPLICA_PIN_SECONDS after a write, stay on the primary. The pins live in
+# the default cache, so replicas require a CACHE_URL shared by every worker.
+
+for index, url in enumerate(env.list("DATABASE_REPLICA_URLS", default=[])):
+    DATABASES[f"replica_{index}"] = {
+        **DATABASES["default"],
+        **dj_database_url.parse(url),
+        "ENGINE": DATABASES["default"]["ENGINE"],
+        "CONN_MAX_AGE": DATABASES["default"]["CONN_MAX_AGE"],
+        "TEST": {"MIRROR": "default"},
+    }
+
+DATABASE_REPLICAS = [alias for alias in DATABASES if alias != "default"]
+DATABASE_ROUTERS = ["utils.routers.ReplicaRouter"]
+REPLICA_PIN_SECONDS = env.int("REPLICA_PIN_SECONDS", default=5)
+
+# Cache
+# https://docs.djangoproject.com/en/4.0/topics/cache/
+
+CACHES = {"default": env.cache("CACHE_URL", default="locmemcache://")}
+
+if DATABASE_REPLICAS and CACHES["default"]["BACKEND"] in (
+    "django.core.cache.backends.dummy.DummyCache",
+    "django.core.cache.backends.locmem.LocMemCache",
+):
+    raise ImproperlyConfigured(
+        "DATABASE_REPLICA_URLS requires a CACHE_URL shared by every worker, "
+        "the replica pins of a process-local cache are not seen by the others."
+    )
+
+# Password hashing
+# https://docs.djangoproject.com/en/4.0/topics/auth/passwords/
+# PASSWORD_HASHER picks the algorithm new hashes use, the others stay
+# available to verify existing hashes, which are upgraded on the next login.
+# argon2 requires the argon2-cffi package.
+
+_PASSWORD_HASHERS = {
+    "pbkdf2": "accounts.hashers.PBKDF2PasswordHasher",
+    "scrypt": "accounts.hashers.ScryptPasswordHasher",
+    "argon2": "accounts.hashers.Argon2PasswordHasher",
+}
+
+PASSWORD_HASHER = env("PASSWORD_HASHER", default="pbkdf2")
+
+if PASSWORD_HASHER not in _PASSWORD_HASHERS:
+    raise ImproperlyConfigured(
+        f"PASSWORD_HASHER must be one of {', '.join(_PASSWORD_HASHERS)}, "
+        f"not {PASSWORD_HASHER!r}."
+    )
+
+PASSWORD_HASHERS = [
+    _PASSWORD_HASHERS.pop(PASSWORD_HASHER),
+    *_PASSWORD_HASHERS.values(),
+]
+
+PBKDF2_ITERATIONS = env.int("PBKDF2_ITERATIONS", default=320000)
+SCRYPT_WORK_FACTOR = env.int("SCRYPT_WORK_FACTOR", default=2**14)
+ARGON2_TIME_COST = env.int("ARGON2_TIME_COST", default=2)
+ARGON2_MEMORY_COST = env.int("ARGON2_MEMORY_COST", default=102400)
+ARGON2_PARALLELISM = env.int("ARGON2_PARALLELISM", default=8)
+
+# Threads per process that run password hashes, 0 hashes on the request thread
+PASSWORD_HASH_WORKERS = env.int("PASSWORD_HASH_WORKERS", default=0)
+
 # Password validation
 # https://docs.djangoproject.com/en/4.0/ref/settings/#auth-password-validators
 
@@ -151,8 +251,85 @@ AUTH_USER_MODEL = "accounts.User"
 
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": (
-        "rest_framework.authentication.TokenAuthentication",
+        "accounts.authentication.CachedTokenAuthentication",
+    ),
+    # orjson based, with the output of the DRF JSON renderer and parser
+    "DEFAULT_RENDERER_CLASSES": (
+        "utils.renderers.ORJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
     ),
-    "DEFAULT_PAGINATION_CLASS": "rest_framework.pagination.PageNumberPagination",
+    "DEFAULT_PARSER_CLASSES": (
+        "utils.parsers.ORJSONParser",
+        "rest_framework.parsers.FormParser",
+        "rest_framework.parsers.MultiPartParser",
+    ),
+    "DEFAULT_PAGINATION_CLASS": "utils.pagination.KeysetPagination",
     "PAGE_SIZE": 5,
 }
+
+# Upper bound for the client chosen `page_size` in keyset pagination mode
+KEYSET_MAX_PAGE_SIZE = env.int("KEYSET_MAX_PAGE_SIZE", default=100)
+
+# Authentication token cache (accounts.authentication.CachedTokenAuthentication)
+TOKEN_CACHE_MAX_SIZE = env.int("TOKEN_CACHE_MAX_SIZE", default=1024)
+TOKEN_CACHE_TTL = env.int("TOKEN_CACHE_TTL", default=60)
+TOKEN_CACHE_ALIAS = env("TOKEN_CACHE_ALIAS", default=None)
+
+# Rows per INSERT when POST /api/products/ receives a list of products
+PRODUCT_BULK_BATCH_SIZE = env.int("PRODUCT_BULK_BATCH_SIZE", default=1000)
+
+# Most rows one application/x-ndjson body may hold (utils.parsers.NDJSONParser)
+NDJSON_MAX_ROWS = env.int("NDJSON_MAX_ROWS", default=10000)
+
+# Rows per server-side cursor fetch and bytes per chunk of the catalog export
+PRODUCT_EXPORT_CHUNK_SIZE = env.int("PRODUCT_EXPORT_CHUNK_SIZE", default=2000)
+PRODUCT_EXPORT_BUFFER_SIZE = env.int("PRODUCT_EXPORT_BUFFER_SIZE", default=65536)
+
+# Most products one POST /api/products/reservations/ may reserve
+RESERVATION_MAX_ITEMS = env.int("RESERVATION_MAX_ITEMS", default=100)
+
+# Product searches shorter than this use the trigram index instead of full text
+PRODUCT_SEARCH_MIN_LENGTH = env.int("PRODUCT_SEARCH_MIN_LENGTH", default=4)
+
+# Anonymous product list/detail response cache (utils.mixins.CachedResponseMixin)
+RESPONSE_CACHE_ALIAS = env("RESPONSE_CACHE_ALIAS", default="default")
+RESPONSE_CACHE_TIMEOUT = env.int("RESPONSE_CACHE_TIMEOUT", default=300)
+
+# Serve read endpoints from coroutines (utils.async_views), on by default under ASGI
+ASYNC_READ_VIEWS = env.bool("ASYNC_READ_VIEWS", default=False)
+
+# Fraction of requests measured by utils.middleware.MetricsMiddleware (0 disables)
+METRICS_SAMPLE_RATE = env.float("METRICS_SAMPLE_RATE", default=0)
+# Bearer token required by /metrics, which is closed without it unless DEBUG
+METRICS_TOKEN = env("METRICS_TOKEN", default=None)
+
+# N+1 and slow query detection (utils.middleware.QueryInspectionMiddleware):
+# off, sample or strict (raises, enabled by the test runner)
+QUERY_INSPECTION = env("QUERY_INSPECTION", default="off")
+QUERY_INSPECTION_SAMPLE_RATE = env.float("QUERY_INSPECTION_SAMPLE_RATE", default=0.01)
+QUERY_REPEAT_THRESHOLD = env.int("QUERY_REPEAT_THRESHOLD", default=5)
+QUERY_SLOW_MS = env.int("QUERY_SLOW_MS", default=100)
+
+TEST_RUNNER = "utils.testing.QueryInspectionRunner"
+
+# Response compression (utils.middleware.CompressionMiddleware), "br" needs the
+# brotli package. Bodies under COMPRESSION_MIN_SIZE bytes are sent as they are.
+COMPRESSION_ALGORITHMS = env.list("COMPRESSION_ALGORITHMS", default=["br", "gzip"])
+COMPRESSION_GZIP_LEVEL = env.int("COMPRESSION_GZIP_LEVEL", default=6)
+COMPRESSION_BROTLI_QUALITY = env.int("COMPRESSION_BROTLI_QUALITY", default=4)
+COMPRESSION_MIN_SIZE = env.int("COMPRESSION_MIN_SIZE", default=1024)
+# Seconds compressed bodies of responses with a strong ETag stay in the
+# response cache, 0 compresses every response again
+COMPRESSION_CACHE_TIMEOUT = env.int("COMPRESSION_CACHE_TIMEOUT", default=300)
+COMPRESSION_CONTENT_TYPES = env.list(
+    "COMPRESSION_CONTENT_TYPES",
+    default=[
+        "application/json",
+        "application/x-ndjson",
+        "text/csv",
+        "text/html",
+        "text/plain",
+        "text/css",
+        "application/javascript",
+    ],
+)
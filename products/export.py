@@ -0,0 +1,101 @@
+import csv
+import json
+import zlib
+
+from django.conf import settings
+
+from .models import Product
+
+# Exported name and values_list() column of every field
+EXPORT_FIELDS = {
+    "id": "id",
+    "description": "description",
+    "price": "price",
+    "quantity": "quantity",
+    "is_active": "is_active",
+    "seller_id": "user_id",
+}
+
+FORMATS = {
+    "csv": "text/csv; charset=utf-8",
+    "ndjson": "application/x-ndjson",
+}
+
+
+class Echo:
+    """
+    File-like object handing back what `csv.writer` writes to it.
+    """
+
+    def write(self, value):
+        return value
+
+
+def export_rows(queryset=None):
+    """
+    Yields the exported fields of every product as tuples, fetched through a
+    server-side cursor so memory stays flat whatever the catalog size.
+    """
+    if queryset is None:
+        queryset = Product.objects.all()
+
+    return (
+        queryset.order_by("id")
+        .values_list(*EXPORT_FIELDS.values())
+        .iterator(chunk_size=settings.PRODUCT_EXPORT_CHUNK_SIZE)
+    )
+
+
+def csv_lines(rows):
+    writer = csv.writer(Echo())
+    yield writer.writerow(EXPORT_FIELDS)
+
+    for row in rows:
+        yield writer.writerow(row)
+
+
+def ndjson_lines(rows):
+    names = tuple(EXPORT_FIELDS)
+
+    for row in rows:
+        # Decimals are strings, as in the API responses
+        yield json.dumps(dict(zip(names, row)), default=str, ensure_ascii=False) + "\n"
+
+
+def export_chunks(rows, export_format, compress=False):
+    """
+    Encodes the rows and groups them into chunks of about
+    `PRODUCT_EXPORT_BUFFER_SIZE` bytes, gzipped on the fly if asked to.
+    """
+    lines = csv_lines(rows) if export_format == "csv" else ndjson_lines(rows)
+    chunks = buffered(line.encode() for line in lines)
+
+    return gzipped(chunks) if compress else chunks
+
+
+def buffered(parts):
+    buffer = []
+    size = 0
+
+    for part in parts:
+        buffer.append(part)
+        size += len(part)
+
+        if size >= settings.PRODUCT_EXPORT_BUFFER_SIZE:
+            yield b"".join(buffer)
+            buffer = []
+            size = 0
+
+    if buffer:
+        yield b"".join(buffer)
+
+
+def gzipped(chunks):
+    compressor = zlib.compressobj(6, zlib.DEFLATED, zlib.MAX_WBITS | 16)
+
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+
+    yield compressor.flush()
@@ -0,0 +1,61 @@
+from django.conf import settings
+from django.contrib.postgres.search import SearchQuery, SearchRank
+from django.db import connections
+from django.db.models import F, Q
+from rest_framework import serializers
+from rest_framework.filters import BaseFilterBackend
+from utils.filters import QueryParamFilter
+from utils.lookups import ILikeContains
+
+# Must match the configuration used by the trigger in migration 0003
+SEARCH_CONFIG = "simple"
+
+
+class ProductSearchFilter(BaseFilterBackend):
+    """
+    Filters products by `?q=` against their description.
+
+    On PostgreSQL, queries of at least `PRODUCT_SEARCH_MIN_LENGTH` characters
+    use the GIN indexed `search_vector` and are ordered by rank; shorter ones
+    are `ILIKE` substring matches served by the trigram index. Other databases always
+    fall back to a substring match.
+    """
+
+    search_param = "q"
+
+    def filter_queryset(self, request, queryset, view):
+        terms = request.query_params.get(self.search_param, "").strip()
+        if not terms:
+            return queryset
+
+        if (
+            connections[queryset.db].vendor != "postgresql"
+            or len(terms) < settings.PRODUCT_SEARCH_MIN_LENGTH
+        ):
+            return queryset.filter(ILikeContains(F("description"), terms)).order_by(
+                "id"
+            )
+
+        query = SearchQuery(terms, config=SEARCH_CONFIG, search_type="websearch")
+
+        return (
+            queryset.filter(search_vector=query)
+            .annotate(rank=SearchRank(F("search_vector"), query))
+            .order_by("-rank", "id")
+        )
+
+
+PRODUCT_FILTER_FIELDS = {
+    "price__gte": QueryParamFilter(
+        serializers.DecimalField(max_digits=12, decimal_places=2), "price__gte"
+    ),
+    "price__lte": QueryParamFilter(
+        serializers.DecimalField(max_digits=12, decimal_places=2), "price__lte"
+    ),
+    "seller_id": QueryParamFilter(serializers.IntegerField(), "user_id"),
+    "is_active": QueryParamFilter(serializers.BooleanField(), "is_active"),
+    "in_stock": QueryParamFilter(
+        serializers.BooleanField(),
+        lambda in_stock: Q(quantity__gt=0) if in_stock else Q(quantity__lte=0),
+    ),
+}
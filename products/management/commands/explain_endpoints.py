@@ -0,0 +1,96 @@
+from accounts.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import RequestFactory, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import resolve
+from products.models import Product
+from utils.routers import use_primary
+
+ENDPOINTS = [
+    "/api/products/",
+    "/api/products/?cursor=",
+    "/api/products/?q=bol",
+    "/api/products/?q=bola",
+    "/api/products/?q=bola%20de%20basquete",
+    "/api/products/?price__gte=10&price__lte=100&ordering=-price",
+    "/api/products/?seller_id=1&is_active=true&in_stock=true",
+    "/api/products/{product}/",
+    "/api/accounts/",
+    "/api/accounts/?cursor=",
+    "/api/accounts/newest/5/",
+]
+
+
+class Command(BaseCommand):
+    help = (
+        "Runs every read endpoint against the current database and prints the "
+        "plan of each SELECT it issues, flagging sequential scans. Plans are "
+        "only meaningful on realistically sized tables."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--no-analyze",
+            action="store_true",
+            help="Print estimated plans instead of running EXPLAIN ANALYZE.",
+        )
+        parser.add_argument(
+            "--strict",
+            action="store_true",
+            help="Exit with an error when any plan contains a sequential scan.",
+        )
+
+    def handle(self, *args, **options):
+        product = Product.objects.order_by("id").values_list("id", flat=True).first()
+        if product is None or not User.objects.exists():
+            raise CommandError("Seed some accounts and products first.")
+
+        explain_options = {}
+        if not options["no_analyze"] and connection.vendor == "postgresql":
+            explain_options = {"analyze": True, "buffers": True}
+
+        prefix = connection.ops.explain_query_prefix(**explain_options)
+        factory = RequestFactory()
+        seq_scans = []
+
+        for endpoint in ENDPOINTS:
+            path = endpoint.format(product=product)
+            self.stdout.write(self.style.MIGRATE_HEADING(f"GET {path}"))
+
+            for sql in self.capture_selects(factory, path):
+                self.stdout.write(self.style.SQL_KEYWORD(sql))
+
+                with connection.cursor() as cursor:
+                    cursor.execute(f"{prefix} {sql}")
+                    plan = [" ".join(str(col) for col in row) for row in cursor]
+
+                for line in plan:
+                    if "Seq Scan" in line:
+                        seq_scans.append(path)
+                        self.stdout.write(self.style.WARNING(f"  {line}"))
+                    else:
+                        self.stdout.write(f"  {line}")
+
+                self.stdout.write("")
+
+        if seq_scans and options["strict"]:
+            raise CommandError(
+                "Sequential scans found on: " + ", ".join(sorted(set(seq_scans)))
+            )
+
+    def capture_selects(self, factory, path):
+        request = factory.get(path, HTTP_HOST="localhost")
+        match = resolve(request.path_info)
+
+        # A response cache hit or a read replica would leave nothing to
+        # capture on this connection
+        with override_settings(RESPONSE_CACHE_TIMEOUT=0), use_primary():
+            with CaptureQueriesContext(connection) as context:
+                match.func(request, *match.args, **match.kwargs)
+
+        return [
+            query["sql"]
+            for query in context.captured_queries
+            if query["sql"].lstrip().upper().startswith("SELECT")
+        ]
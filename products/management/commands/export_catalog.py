@@ -0,0 +1,35 @@
+from django.core.management.base import BaseCommand, CommandError
+from products.export import FORMATS, export_chunks, export_rows
+
+
+class Command(BaseCommand):
+    help = (
+        "Streams every product as NDJSON or CSV to a file or the standard "
+        "output, with the same fields as GET /api/products/export/."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--format", choices=list(FORMATS), default="ndjson")
+        parser.add_argument(
+            "--output", help="File to write, the standard output by default."
+        )
+        parser.add_argument("--gzip", action="store_true", help="Gzip the output.")
+
+    def handle(self, *args, **options):
+        chunks = export_chunks(export_rows(), options["format"], options["gzip"])
+        written = 0
+
+        if options["output"]:
+            with open(options["output"], "wb") as output:
+                for chunk in chunks:
+                    written += output.write(chunk)
+        else:
+            output = getattr(self.stdout, "buffer", None)
+            if output is None:
+                raise CommandError("Use --output, the output is not a binary stream.")
+
+            for chunk in chunks:
+                written += output.write(chunk)
+            output.flush()
+
+        self.stderr.write(f"Exported {written} bytes.", style_func=self.style.SUCCESS)
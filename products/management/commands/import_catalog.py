@@ -0,0 +1,316 @@
+import csv
+import gzip
+import itertools
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from accounts.models import User
+from accounts.serializers import ImportUserSerializer
+from django.contrib.auth.hashers import identify_hasher, make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+from products.models import Product
+from products.serializers import ImportProductSerializer
+from utils import cache
+
+
+class RejectedRow:
+    """
+    A row of the file that could not be parsed, with the errors reported
+    for it.
+    """
+
+    def __init__(self, message):
+        self.errors = {"row": [message]}
+
+
+def read_rows(path, file_format):
+    """
+    Yields the rows of a CSV or NDJSON file, optionally gzipped, as dicts,
+    or as `RejectedRow` when a row cannot be parsed. Empty CSV cells are
+    left out so optional fields keep their defaults.
+    """
+    opener = gzip.open if path.endswith(".gz") else open
+
+    if file_format == "csv":
+        with opener(path, "rt", encoding="utf-8", newline="") as source:
+            yield from read_csv_rows(source)
+    else:
+        # Read as bytes so a line that is not UTF-8 only rejects that row
+        with opener(path, "rb") as source:
+            yield from read_ndjson_rows(source)
+
+
+def read_csv_rows(source):
+    reader = csv.DictReader(source)
+
+    while True:
+        try:
+            row = next(reader)
+        except StopIteration:
+            return
+        except csv.Error as exc:
+            yield RejectedRow(f"Invalid CSV: {exc}")
+            continue
+
+        if None in row:
+            yield RejectedRow(f"Expected {len(reader.fieldnames)} columns.")
+        else:
+            yield {key: value for key, value in row.items() if value != ""}
+
+
+def read_ndjson_rows(source):
+    for line in source:
+        if not line.strip():
+            continue
+
+        try:
+            data = json.loads(line.decode("utf-8"))
+        except ValueError as exc:
+            yield RejectedRow(f"Invalid JSON: {exc}")
+            continue
+
+        if isinstance(data, dict):
+            yield data
+        else:
+            yield RejectedRow("Expected a JSON object.")
+
+
+def guess_format(path):
+    name = path[:-3] if path.endswith(".gz") else path
+
+    if name.endswith(".csv"):
+        return "csv"
+    if name.endswith((".ndjson", ".jsonl")):
+        return "ndjson"
+
+    raise CommandError(f"Cannot tell the format of {path}, use --format.")
+
+
+class UserImporter:
+    serializer_class = ImportUserSerializer
+
+    def __init__(self, hash_workers):
+        self.executor = ThreadPoolExecutor(max_workers=hash_workers)
+
+    def build(self, rows):
+        """
+        Returns the users to create for the `(index, data)` pairs of a batch
+        and the errors of the rejected rows.
+        """
+        now = timezone.now()
+        valid, errors = [], []
+
+        for index, data in rows:
+            if isinstance(data.get("email"), str):
+                data["email"] = User.objects.normalize_email(data["email"])
+            serializer = self.serializer_class(data=data)
+            if serializer.is_valid():
+                valid.append((index, serializer.validated_data))
+            else:
+                errors.append((index, serializer.errors))
+
+        emails = [data["email"] for _, data in valid]
+        taken = set(
+            User.objects.filter(email__in=emails).values_list("email", flat=True)
+        )
+
+        users = []
+        for index, data in valid:
+            if data["email"] in taken:
+                errors.append((index, {"email": ["Email already exists."]}))
+                continue
+            taken.add(data["email"])
+
+            users.append(
+                User(
+                    **data,
+                    is_staff=True,
+                    is_active=True,
+                    is_superuser=False,
+                    last_login=now,
+                    date_joined=now,
+                )
+            )
+
+        passwords = self.executor.map(self.encode, [user.password for user in users])
+        for user, password in zip(users, passwords):
+            user.password = password
+
+        return users, errors
+
+    def encode(self, password):
+        if not password:
+            return make_password(None)
+
+        try:
+            # Already hashed, for instance by a dump of another database
+            identify_hasher(password)
+            return password
+        except ValueError:
+            return make_password(password)
+
+    def save(self, users):
+        User.objects.bulk_create(users)
+
+    def finish(self):
+        self.executor.shutdown()
+
+
+class ProductImporter:
+    serializer_class = ImportProductSerializer
+
+    def build(self, rows):
+        valid, errors = [], []
+
+        for index, data in rows:
+            serializer = self.serializer_class(data=data)
+            if serializer.is_valid():
+                valid.append((index, serializer.validated_data))
+            else:
+                errors.append((index, serializer.errors))
+
+        sellers = User.objects.filter(is_seller=True)
+        ids = {data["seller_id"] for _, data in valid if "seller_id" in data}
+        emails = {data["seller_email"] for _, data in valid if "seller_email" in data}
+        seller_ids = set(sellers.filter(pk__in=ids).values_list("pk", flat=True))
+        seller_emails = dict(
+            sellers.filter(email__in=emails).values_list("email", "pk")
+        )
+
+        products = []
+        for index, data in valid:
+            email = data.pop("seller_email", None)
+            seller_id = data.pop("seller_id", None)
+
+            if email is not None:
+                seller_id = seller_emails.get(email)
+            elif seller_id not in seller_ids:
+                seller_id = None
+
+            if seller_id is None:
+                errors.append((index, {"seller": ["Invalid seller."]}))
+                continue
+
+            products.append(Product(**data, user_id=seller_id))
+
+        return products, errors
+
+    def save(self, products):
+        Product.objects.bulk_create(products)
+
+    def finish(self):
+        # bulk_create does not send post_save, see products.signals
+        cache.invalidate("products")
+
+
+class Command(BaseCommand):
+    help = (
+        "Streams users or products from a CSV or NDJSON file (optionally "
+        "gzipped) into the database. Rows are validated with the API "
+        "serializers and inserted in batches, rows that do not parse or "
+        "validate are reported and skipped; each committed batch is recorded "
+        "in a checkpoint file so an interrupted import resumes where it stopped."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("kind", choices=["users", "products"])
+        parser.add_argument("path")
+        parser.add_argument(
+            "--format",
+            choices=["csv", "ndjson"],
+            help="Guessed from the file extension by default.",
+        )
+        parser.add_argument("--batch-size", type=int, default=1000)
+        parser.add_argument(
+            "--checkpoint", help="Checkpoint file, <path>.checkpoint by default."
+        )
+        parser.add_argument(
+            "--restart",
+            action="store_true",
+            help="Ignore the checkpoint and import from the first row.",
+        )
+        parser.add_argument(
+            "--hash-workers",
+            type=int,
+            default=os.cpu_count() or 1,
+            help="Threads hashing plain text passwords of imported users.",
+        )
+
+    def handle(self, *args, **options):
+        path = options["path"]
+        file_format = options["format"] or guess_format(path)
+        checkpoint = options["checkpoint"] or f"{path}.checkpoint"
+        batch_size = options["batch_size"]
+
+        start = 0 if options["restart"] else self.read_checkpoint(checkpoint)
+        if start:
+            self.stdout.write(f"Resuming after row {start}.")
+
+        if options["kind"] == "users":
+            importer = UserImporter(options["hash_workers"])
+        else:
+            importer = ProductImporter()
+        rows = itertools.islice(enumerate(read_rows(path, file_format)), start, None)
+
+        done, imported, rejected = start, 0, 0
+        started = time.monotonic()
+
+        try:
+            while batch := list(itertools.islice(rows, batch_size)):
+                objects, errors = importer.build(
+                    [(index, data) for index, data in batch if isinstance(data, dict)]
+                )
+                errors += [
+                    (index, data.errors)
+                    for index, data in batch
+                    if isinstance(data, RejectedRow)
+                ]
+
+                with transaction.atomic():
+                    importer.save(objects)
+
+                done = batch[-1][0] + 1
+                imported += len(objects)
+                rejected += len(errors)
+                self.write_checkpoint(checkpoint, done)
+
+                for index, error in sorted(errors, key=lambda item: item[0]):
+                    self.stderr.write(f"Row {index + 1}: {json.dumps(error)}")
+
+                rate = (done - start) / (time.monotonic() - started)
+                self.stdout.write(
+                    f"{done} rows read, {imported} imported, {rejected} rejected "
+                    f"({rate:.0f} rows/s)"
+                )
+        except (OSError, ValueError, csv.Error) as exc:
+            raise CommandError(f"Stopped after row {done}: {exc}")
+        finally:
+            importer.finish()
+
+        if os.path.exists(checkpoint):
+            os.remove(checkpoint)
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Imported {imported} {options['kind']}, rejected {rejected}."
+            )
+        )
+
+    def read_checkpoint(self, checkpoint):
+        try:
+            with open(checkpoint) as source:
+                return int(source.read().strip() or 0)
+        except FileNotFoundError:
+            return 0
+        except ValueError:
+            raise CommandError(f"Invalid checkpoint {checkpoint}, use --restart.")
+
+    def write_checkpoint(self, checkpoint, done):
+        temporary = f"{checkpoint}.tmp"
+        with open(temporary, "w") as target:
+            target.write(str(done))
+        os.replace(temporary, checkpoint)
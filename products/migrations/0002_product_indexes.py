@@ -0,0 +1,28 @@
+# Generated by Django 4.0.5 on 2026-10-18 18:10
+
+from django.db import migrations, models
+import utils.db.operations
+
+
+class Migration(migrations.Migration):
+
+    atomic = False
+
+    dependencies = [
+        ('products', '0001_initial'),
+    ]
+
+    operations = [
+        utils.db.operations.AddIndexConcurrently(
+            model_name='product',
+            index=models.Index(fields=['user', 'is_active'], name='product_user_active_idx'),
+        ),
+        utils.db.operations.AddIndexConcurrently(
+            model_name='product',
+            index=models.Index(fields=['is_active', 'id'], name='product_active_id_idx'),
+        ),
+        utils.db.operations.AddIndexConcurrently(
+            model_name='product',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['id'], name='product_active_only_idx'),
+        ),
+    ]
@@ -0,0 +1,60 @@
+# Generated by Django 4.0.5 on 2026-10-18 18:11
+
+import django.contrib.postgres.search
+from django.db import migrations
+
+CREATE_SEARCH_SUPPORT = """
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+CREATE FUNCTION products_product_search_vector_update() RETURNS trigger AS $$
+BEGIN
+    NEW.search_vector := to_tsvector('simple', coalesce(NEW.description, ''));
+    RETURN NEW;
+END
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER products_product_search_vector_trigger
+    BEFORE INSERT OR UPDATE OF description, search_vector ON products_product
+    FOR EACH ROW EXECUTE PROCEDURE products_product_search_vector_update();
+
+UPDATE products_product SET search_vector = to_tsvector('simple', description);
+
+CREATE INDEX product_search_vector_idx
+    ON products_product USING gin (search_vector);
+
+CREATE INDEX product_description_trgm_idx
+    ON products_product USING gin (description gin_trgm_ops);
+"""
+
+DROP_SEARCH_SUPPORT = """
+DROP INDEX IF EXISTS product_description_trgm_idx;
+DROP INDEX IF EXISTS product_search_vector_idx;
+DROP TRIGGER IF EXISTS products_product_search_vector_trigger ON products_product;
+DROP FUNCTION IF EXISTS products_product_search_vector_update();
+"""
+
+
+def create_search_support(apps, schema_editor):
+    if schema_editor.connection.vendor == "postgresql":
+        schema_editor.execute(CREATE_SEARCH_SUPPORT)
+
+
+def drop_search_support(apps, schema_editor):
+    if schema_editor.connection.vendor == "postgresql":
+        schema_editor.execute(DROP_SEARCH_SUPPORT)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('products', '0002_product_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='product',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.RunPython(create_search_support, drop_search_support),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 4.0.5 on 2026-10-18 18:12
+
+from django.db import migrations, models
+import utils.db.operations
+
+
+class Migration(migrations.Migration):
+
+    atomic = False
+
+    dependencies = [
+        ('products', '0003_product_search'),
+    ]
+
+    operations = [
+        utils.db.operations.AddIndexConcurrently(
+            model_name='product',
+            index=models.Index(fields=['price', 'id'], name='product_price_id_idx'),
+        ),
+    ]
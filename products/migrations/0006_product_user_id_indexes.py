@@ -0,0 +1,24 @@
+# Generated by Django 4.0.5 on 2026-10-18 19:02
+
+from django.db import migrations, models
+import utils.db.operations
+
+
+class Migration(migrations.Migration):
+
+    atomic = False
+
+    dependencies = [
+        ('products', '0005_product_updated_at'),
+    ]
+
+    operations = [
+        utils.db.operations.AddIndexConcurrently(
+            model_name='product',
+            index=models.Index(fields=['user', 'id'], name='product_user_id_idx'),
+        ),
+        utils.db.operations.AddIndexConcurrently(
+            model_name='product',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['user', 'id'], name='product_user_active_id_idx'),
+        ),
+    ]
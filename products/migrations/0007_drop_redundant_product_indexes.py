@@ -0,0 +1,38 @@
+# Generated by Django 4.0.5 on 2026-10-18 19:45
+
+from django.db import migrations, models
+import django.db.models.deletion
+import utils.db.operations
+
+drop_user_index, create_user_index = utils.db.operations.drop_field_index_concurrently(
+    'products', 'product', 'user'
+)
+
+
+class Migration(migrations.Migration):
+
+    atomic = False
+
+    dependencies = [
+        ('accounts', '0005_seller_stats'),
+        ('products', '0006_product_user_id_indexes'),
+    ]
+
+    operations = [
+        utils.db.operations.RemoveIndexConcurrently(
+            model_name='product',
+            name='product_active_only_idx',
+        ),
+        migrations.SeparateDatabaseAndState(
+            database_operations=[
+                migrations.RunPython(drop_user_index, create_user_index),
+            ],
+            state_operations=[
+                migrations.AlterField(
+                    model_name='product',
+                    name='user',
+                    field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='products', to='accounts.user'),
+                ),
+            ],
+        ),
+    ]
@@ -1,5 +1,110 @@
+from collections import defaultdict
+from decimal import Decimal
+
+from accounts.models import SellerStats
+from django.contrib.postgres.search import SearchVectorField
 from django.core.validators import MinValueValidator
-from django.db import models
+from django.db import models, transaction
+from django.utils import timezone
+
+# Columns of a product that count towards the stats of its seller
+STATS_FIELDS = ("user_id", "is_active", "quantity", "price")
+
+
+def seller_stats_deltas(removed=(), added=()):
+    """
+    Sums `STATS_FIELDS` rows of removed and added product states into the
+    `{user_id: (active_products, total_quantity, inventory_value)}` deltas
+    taken by `SellerStats.objects.apply`.
+    """
+    deltas = defaultdict(lambda: [0, 0, Decimal(0)])
+
+    for sign, rows in ((-1, removed), (1, added)):
+        for user_id, is_active, quantity, price in rows:
+            if is_active:
+                delta = deltas[user_id]
+                delta[0] += sign
+                delta[1] += sign * quantity
+                delta[2] += sign * quantity * price
+
+    return deltas
+
+
+def apply_seller_stats(deltas):
+    with transaction.atomic():
+        SellerStats.objects.apply(deltas)
+
+
+class ProductQuerySet(models.QuerySet):
+    def bulk_create(self, objs, *args, **kwargs):
+        with transaction.atomic(savepoint=False):
+            objs = super().bulk_create(objs, *args, **kwargs)
+            SellerStats.objects.apply(
+                seller_stats_deltas(added=[obj.stats_row() for obj in objs])
+            )
+
+        return objs
+
+    def seller_totals(self):
+        """
+        Aggregates of the active products per `user_id`, as `SellerStats`
+        keeps them.
+        """
+        return (
+            self.filter(is_active=True)
+            .values("user_id")
+            .order_by("user_id")
+            .annotate(
+                active_products=models.Count("id"),
+                total_quantity=models.Sum("quantity"),
+                inventory_value=models.Sum(
+                    models.F("quantity") * models.F("price"),
+                    output_field=models.DecimalField(max_digits=20, decimal_places=2),
+                ),
+            )
+        )
+
+    def locked_stats_row(self, pk):
+        """
+        Locks the product and returns its `STATS_FIELDS`, `None` if missing.
+        """
+        return self.select_for_update().filter(pk=pk).values_list(*STATS_FIELDS).first()
+
+    def reserve(self, quantities):
+        """
+        Takes `{pk: amount}` out of the stock of active products, all or
+        nothing, with one conditional UPDATE per product.
+
+        Rows are updated in primary key order, so concurrent reservations
+        lock them in the same order and cannot deadlock. Returns the pk of
+        the first product without enough stock, or None once reserved.
+
+        The stats of the sellers are updated after the commit in a
+        transaction of their own, so reservations of the same seller do not
+        queue on the lock of its stats row while holding the product locks.
+        A crash in between leaves them for `reconcile_seller_stats`.
+        """
+        now = timezone.now()
+
+        with transaction.atomic():
+            for pk in sorted(quantities):
+                amount = quantities[pk]
+                updated = self.filter(
+                    pk=pk, is_active=True, quantity__gte=amount
+                ).update(quantity=models.F("quantity") - amount, updated_at=now)
+
+                if not updated:
+                    transaction.set_rollback(True)
+                    return pk
+
+            deltas = defaultdict(lambda: [0, 0, Decimal(0)])
+            rows = self.filter(pk__in=quantities).values_list("pk", "user_id", "price")
+            for pk, user_id, price in rows:
+                deltas[user_id][1] -= quantities[pk]
+                deltas[user_id][2] -= quantities[pk] * price
+            transaction.on_commit(lambda: apply_seller_stats(deltas))
+
+        return None
 
 
 # Create your models here.
@@ -8,7 +113,60 @@ class Product(models.Model):
     price = models.DecimalField(max_digits=12, decimal_places=2)
     quantity = models.IntegerField(validators=[MinValueValidator(1)])
     is_active = models.BooleanField(default=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    # Maintained by a database trigger on PostgreSQL, see migration 0003
+    search_vector = SearchVectorField(null=True, editable=False)
 
+    # Lookups by seller are served by the (user, is_active) and (user, id)
+    # indexes, a single column index would only slow the writes down
     user = models.ForeignKey(
-        "accounts.User", on_delete=models.CASCADE, related_name="products"
+        "accounts.User",
+        on_delete=models.CASCADE,
+        related_name="products",
+        db_index=False,
     )
+
+    objects = ProductQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["user", "is_active"], name="product_user_active_idx"),
+            models.Index(fields=["is_active", "id"], name="product_active_id_idx"),
+            models.Index(fields=["price", "id"], name="product_price_id_idx"),
+            # Keyset pages of GET /api/accounts/<pk>/products/
+            models.Index(fields=["user", "id"], name="product_user_id_idx"),
+            models.Index(
+                fields=["user", "id"],
+                condition=models.Q(is_active=True),
+                name="product_user_active_id_idx",
+            ),
+        ]
+
+    def save(self, *args, **kwargs):
+        with transaction.atomic(savepoint=False):
+            previous = None
+            if not self._state.adding and self.pk is not None:
+                previous = Product.objects.locked_stats_row(self.pk)
+
+            super().save(*args, **kwargs)
+
+            SellerStats.objects.apply(
+                seller_stats_deltas(
+                    removed=[previous] if previous else [], added=[self.stats_row()]
+                )
+            )
+
+    def delete(self, *args, **kwargs):
+        with transaction.atomic(savepoint=False):
+            previous = Product.objects.locked_stats_row(self.pk)
+            result = super().delete(*args, **kwargs)
+
+            if previous:
+                SellerStats.objects.apply(seller_stats_deltas(removed=[previous]))
+
+        return result
+
+    def stats_row(self):
+        price = self._meta.get_field("price").to_python(self.price)
+        return self.user_id, self.is_active, self.quantity, price
@@ -1,9 +1,42 @@
 from accounts.serializers import UserSerializer
+from django.conf import settings
 from rest_framework import serializers
+from rest_framework.settings import api_settings
 
 from .models import Product
 
 
+class BulkCreateProductListSerializer(serializers.ListSerializer):
+    row_errors = ()
+
+    def to_internal_value(self, data):
+        if not isinstance(data, list):
+            message = self.error_messages["not_a_list"].format(
+                input_type=type(data).__name__
+            )
+            raise serializers.ValidationError(
+                {api_settings.NON_FIELD_ERRORS_KEY: [message]}, code="not_a_list"
+            )
+
+        self.row_errors = []
+        validated = []
+
+        for index, item in enumerate(data):
+            try:
+                validated.append(self.child.run_validation(item))
+            except serializers.ValidationError as exc:
+                self.row_errors.append({"index": index, "errors": exc.detail})
+
+        return validated
+
+    def create(self, validated_data):
+        products = [Product(**item) for item in validated_data]
+
+        return Product.objects.bulk_create(
+            products, batch_size=settings.PRODUCT_BULK_BATCH_SIZE
+        )
+
+
 class CreateProductSerializer(serializers.ModelSerializer):
     seller = UserSerializer(read_only=True, source="user")
 
@@ -11,6 +44,37 @@ class CreateProductSerializer(serializers.ModelSerializer):
         model = Product
         fields = ["id", "description", "price", "quantity", "seller", "is_active"]
         read_only_fields = ["is_active"]
+        list_serializer_class = BulkCreateProductListSerializer
+
+
+class ImportProductSerializer(CreateProductSerializer):
+    """
+    Row validation of `manage.py import_catalog products`. The seller is
+    given by `seller_id` or `seller_email` and checked once per batch.
+    """
+
+    seller_id = serializers.IntegerField(required=False)
+    seller_email = serializers.EmailField(required=False)
+
+    class Meta(CreateProductSerializer.Meta):
+        fields = [
+            "description",
+            "price",
+            "quantity",
+            "is_active",
+            "seller",
+            "seller_id",
+            "seller_email",
+        ]
+        read_only_fields = []
+
+    def validate(self, attrs):
+        if "seller_id" not in attrs and "seller_email" not in attrs:
+            raise serializers.ValidationError(
+                "Either seller_id or seller_email is required."
+            )
+
+        return attrs
 
 
 class ListProductSerializer(serializers.ModelSerializer):
@@ -26,3 +90,36 @@ class ListProductSerializer(serializers.ModelSerializer):
             "is_active",
             "seller_id",
         ]
+
+
+class SellerProductSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Product
+        fields = ["id", "description", "price", "quantity", "is_active"]
+        read_only_fields = fields
+
+
+class ReservationItemSerializer(serializers.Serializer):
+    product_id = serializers.IntegerField()
+    quantity = serializers.IntegerField(min_value=1)
+
+
+class ReservationSerializer(serializers.Serializer):
+    items = ReservationItemSerializer(many=True, allow_empty=False)
+
+    def validate_items(self, items):
+        if len(items) > settings.RESERVATION_MAX_ITEMS:
+            raise serializers.ValidationError(
+                f"Ensure this field has no more than "
+                f"{settings.RESERVATION_MAX_ITEMS} elements."
+            )
+
+        return items
+
+    def get_quantities(self):
+        quantities = {}
+        for item in self.validated_data["items"]:
+            product_id = item["product_id"]
+            quantities[product_id] = quantities.get(product_id, 0) + item["quantity"]
+
+        return quantities
@@ -0,0 +1,161 @@
+import threading
+
+from accounts.models import User
+from asgiref.sync import sync_to_async
+from django.core.cache import cache
+from django.test import AsyncRequestFactory, override_settings
+from django.urls import path
+from products.models import Product
+from products.views import ProductParamsView, ProductView, SellerProductView
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APITestCase
+
+
+class ThreadRecordingProductView(ProductView):
+    threads = []
+
+    async def adispatch(self, request, *args, **kwargs):
+        self.threads.append(threading.get_ident())
+        return await super().adispatch(request, *args, **kwargs)
+
+
+urlpatterns = [
+    path("api/products/", ThreadRecordingProductView.as_async_view()),
+]
+
+
+class ProductAsyncViewTest(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user_seller = User.objects.create_user(
+            email="gui@mail",
+            password="123456",
+            first_name="Guilherme",
+            last_name="Silva",
+            is_seller=True,
+        )
+        cls.token_seller = Token.objects.create(user=cls.user_seller)
+
+        cls.products = [
+            Product.objects.create(
+                description=f"Bola de basquete {i}",
+                price=100.00 + i,
+                quantity=20,
+                user=cls.user_seller,
+            )
+            for i in range(3)
+        ]
+
+    def setUp(self):
+        cache.clear()
+        self.factory = AsyncRequestFactory()
+
+    async def test_list_matches_sync_view(self):
+        request = self.factory.get("/api/products/", {"ordering": "-price"})
+        response = await ProductView.as_async_view()(request)
+        response.render()
+
+        expected = await self.get_sync("/api/products/?ordering=-price")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data, expected.data)
+        self.assertEqual(response["ETag"], expected["ETag"])
+
+    async def test_retrieve_matches_sync_view(self):
+        product = self.products[0]
+
+        request = self.factory.get(f"/api/products/{product.id}/")
+        response = await ProductParamsView.as_async_view()(request, pk=product.id)
+        response.render()
+
+        expected = await self.get_sync(f"/api/products/{product.id}/")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data, expected.data)
+        self.assertEqual(response["ETag"], expected["ETag"])
+
+    async def test_retrieve_conditional_request(self):
+        product = self.products[0]
+        etag = (await self.get_sync(f"/api/products/{product.id}/"))["ETag"]
+
+        request = self.factory.get(f"/api/products/{product.id}/", if_none_match=etag)
+        response = await ProductParamsView.as_async_view()(request, pk=product.id)
+
+        self.assertEqual(response.status_code, 304)
+
+    async def test_retrieve_not_found(self):
+        request = self.factory.get("/api/products/0/")
+        response = await ProductParamsView.as_async_view()(request, pk=0)
+
+        self.assertEqual(response.status_code, 404)
+
+    async def test_authenticated_list_with_cursor(self):
+        request = self.factory.get(
+            "/api/products/",
+            {"cursor": "", "page_size": 2},
+            authorization=f"Token {self.token_seller.key}",
+        )
+        response = await ProductView.as_async_view()(request)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            [product["description"] for product in response.data["results"]],
+            [product.description for product in self.products[:2]],
+        )
+        self.assertIsNotNone(response.data["next"])
+
+    async def test_invalid_token(self):
+        request = self.factory.get("/api/products/", authorization="Token invalid")
+        response = await ProductView.as_async_view()(request)
+
+        self.assertEqual(response.status_code, 401)
+
+    async def test_writes_use_sync_view(self):
+        request = self.factory.post(
+            "/api/products/",
+            '{"description": "Bola", "price": 10, "quantity": 1}',
+            content_type="application/json",
+            authorization=f"Token {self.token_seller.key}",
+        )
+        response = await ProductView.as_async_view()(request)
+
+        self.assertEqual(response.status_code, 201)
+        self.assertTrue(
+            await sync_to_async(Product.objects.filter(description="Bola").exists)()
+        )
+
+    async def test_seller_products_match_sync_view(self):
+        url = f"/api/accounts/{self.user_seller.id}/products/"
+
+        request = self.factory.get(url)
+        response = await SellerProductView.as_async_view()(
+            request, pk=self.user_seller.id
+        )
+        response.render()
+
+        expected = await self.get_sync(url)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.content, expected.content)
+
+        request = self.factory.get("/api/accounts/0/products/")
+        response = await SellerProductView.as_async_view()(request, pk=0)
+        self.assertEqual(response.status_code, 404)
+
+    @override_settings(ROOT_URLCONF=__name__, METRICS_SAMPLE_RATE=1, DEBUG=True)
+    async def test_async_view_runs_on_the_event_loop(self):
+        # With DEBUG, Django logs every sync middleware it adapts to the
+        # async chain with a thread switch
+        ThreadRecordingProductView.threads.clear()
+
+        with self.assertNoLogs("django.request", "DEBUG"):
+            response = await self.async_client.get(
+                "/api/products/", {"cursor": ""}, HTTP_ACCEPT_ENCODING="gzip"
+            )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("Server-Timing", response)
+        self.assertEqual(ThreadRecordingProductView.threads, [threading.get_ident()])
+
+    async def get_sync(self, url):
+        return await sync_to_async(self.client.get)(url)
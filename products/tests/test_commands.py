@@ -0,0 +1,205 @@
+import csv
+import gzip
+import os
+import tempfile
+from io import StringIO
+
+from accounts.models import User
+from django.contrib.auth.hashers import make_password
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase
+from products.models import Product
+
+
+class ExplainEndpointsCommandTest(TestCase):
+    def test_requires_data(self):
+        with self.assertRaises(CommandError):
+            call_command("explain_endpoints", stdout=StringIO())
+
+    def test_prints_a_plan_per_endpoint(self):
+        user = User.objects.create_user(
+            email="gui@mail",
+            password="123456",
+            first_name="Guilherme",
+            last_name="Silva",
+            is_seller=True,
+        )
+        product = Product.objects.create(
+            description="Bola", price=10, quantity=1, user=user
+        )
+        out = StringIO()
+
+        call_command("explain_endpoints", stdout=out)
+
+        self.assertIn("GET /api/products/\n", out.getvalue())
+        self.assertIn(f"GET /api/products/{product.id}/\n", out.getvalue())
+        self.assertIn("GET /api/accounts/newest/5/\n", out.getvalue())
+
+    def test_plans_queries_behind_the_response_cache(self):
+        user = User.objects.create_user(
+            email="gui@mail",
+            password="123456",
+            first_name="Guilherme",
+            last_name="Silva",
+            is_seller=True,
+        )
+        Product.objects.create(description="Bola", price=10, quantity=1, user=user)
+        # Anonymous reads of the product list are cached after the first run
+        self.client.get("/api/products/", HTTP_HOST="localhost")
+        out = StringIO()
+
+        call_command("explain_endpoints", stdout=out)
+
+        listing = out.getvalue().split("GET /api/products/\n")[1].split("GET ")[0]
+        self.assertIn("products_product", listing)
+
+
+class ExportCatalogCommandTest(TestCase):
+    def test_exports_every_product(self):
+        user = User.objects.create_user(
+            email="gui@mail",
+            password="123456",
+            first_name="Guilherme",
+            last_name="Silva",
+            is_seller=True,
+        )
+        for index in range(3):
+            Product.objects.create(
+                description=f"Bola {index}", price=10, quantity=1, user=user
+            )
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "products.csv.gz")
+            call_command(
+                "export_catalog",
+                "--format=csv",
+                "--gzip",
+                f"--output={path}",
+                stderr=StringIO(),
+            )
+
+            with gzip.open(path, "rt") as export:
+                rows = list(csv.reader(export))
+
+        self.assertEqual(
+            rows[0],
+            ["id", "description", "price", "quantity", "is_active", "seller_id"],
+        )
+        self.assertEqual([row[1] for row in rows[1:]], ["Bola 0", "Bola 1", "Bola 2"])
+
+
+class ImportCatalogCommandTest(TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+
+    def write(self, name, content):
+        path = os.path.join(self.directory.name, name)
+        with open(path, "w") as target:
+            target.write(content)
+        return path
+
+    def call(self, *args):
+        out, err = StringIO(), StringIO()
+        call_command("import_catalog", *args, stdout=out, stderr=err)
+        return out.getvalue(), err.getvalue()
+
+    def test_import_users_and_their_products(self):
+        hashed = make_password("123456")
+        users = self.write(
+            "users.csv",
+            "email,password,first_name,last_name,is_seller\n"
+            f"Gui@MAIL.com,{hashed},Guilherme,Silva,true\n"
+            "lucira@mail.com,654321,Lucira,Silva,false\n"
+            "Gui@mail.COM,123456,Guilherme,Silva,true\n",
+        )
+        products = self.write(
+            "products.ndjson",
+            '{"description": "Bola", "price": "10.00", "quantity": 5, '
+            '"seller_email": "Gui@mail.com"}\n'
+            '{"description": "Rede", "price": "5.00", "quantity": 1, '
+            '"seller_email": "lucira@mail.com"}\n',
+        )
+
+        _, errors = self.call("users", users, "--batch-size=2")
+
+        self.assertIn("Row 3", errors)
+        seller = User.objects.get(email="Gui@mail.com")
+        self.assertEqual(seller.password, hashed)
+        self.assertTrue(
+            User.objects.get(email="lucira@mail.com").check_password("654321")
+        )
+
+        _, errors = self.call("products", products)
+
+        self.assertIn("Row 2", errors)
+        self.assertEqual(
+            list(Product.objects.values_list("description", "user_id")),
+            [("Bola", seller.id)],
+        )
+
+    def test_resume_from_checkpoint(self):
+        user = User.objects.create_user(
+            email="gui@mail",
+            password="123456",
+            first_name="Guilherme",
+            last_name="Silva",
+            is_seller=True,
+        )
+        products = self.write(
+            "products.csv",
+            "description,price,quantity,seller_id\n"
+            + "".join(f"Bola {index},10,1,{user.id}\n" for index in range(5)),
+        )
+        self.write("products.csv.checkpoint", "3")
+
+        out, _ = self.call("products", products, "--batch-size=1")
+
+        self.assertIn("Resuming after row 3", out)
+        self.assertEqual(
+            list(Product.objects.values_list("description", flat=True)),
+            ["Bola 3", "Bola 4"],
+        )
+        self.assertFalse(os.path.exists(f"{products}.checkpoint"))
+
+    def test_rows_that_do_not_parse_are_rejected(self):
+        user = User.objects.create_user(
+            email="gui@mail",
+            password="123456",
+            first_name="Guilherme",
+            last_name="Silva",
+            is_seller=True,
+        )
+        valid = (
+            f'{{"description": "Bola", "price": "10", "quantity": 1, '
+            f'"seller_id": {user.id}}}\n'
+        )
+        products = self.write(
+            "products.ndjson", "{not json}\n" + valid + "[1, 2]\n" + valid
+        )
+
+        out, errors = self.call("products", products)
+
+        self.assertIn("Row 1: ", errors)
+        self.assertIn("Invalid JSON", errors)
+        self.assertIn("Row 3: ", errors)
+        self.assertIn("Imported 2 products, rejected 2.", out)
+
+        products = self.write(
+            "products.csv",
+            "description,price,quantity,seller_id\n"
+            f"Bola,10,1,{user.id},extra\n"
+            f"Rede,5,1,{user.id}\n",
+        )
+
+        out, errors = self.call("products", products)
+
+        self.assertIn("Row 1: ", errors)
+        self.assertIn("Imported 1 products, rejected 1.", out)
+
+    def test_invalid_file(self):
+        products = self.write("products.ndjson.gz", "{}\n")
+
+        with self.assertRaises(CommandError):
+            self.call("products", products)
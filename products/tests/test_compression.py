@@ -0,0 +1,204 @@
+import gzip
+import threading
+from unittest import mock, skipUnless
+
+from accounts.models import User
+from django.core.cache import cache
+from django.http import HttpResponse, StreamingHttpResponse
+from django.test import RequestFactory, SimpleTestCase, override_settings
+from products.models import Product
+from rest_framework.test import APITestCase
+from utils.middleware import CompressionMiddleware, brotli
+
+
+@override_settings(COMPRESSION_ALGORITHMS=["gzip"], COMPRESSION_MIN_SIZE=200)
+class CompressionViewTest(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        seller = User.objects.create_user(
+            email="gui@mail.com",
+            password="1234",
+            first_name="Gui",
+            last_name="Lopreti",
+            is_seller=True,
+        )
+        cls.products = [
+            Product.objects.create(
+                description="Smartband XYZ 3.0 com monitor cardíaco " * 5,
+                price=100.99,
+                quantity=15,
+                user=seller,
+            )
+            for _ in range(5)
+        ]
+
+    def setUp(self):
+        cache.clear()
+
+    def test_compresses_large_responses(self):
+        plain = self.client.get("/api/products/")
+        response = self.client.get("/api/products/", HTTP_ACCEPT_ENCODING="gzip")
+
+        self.assertNotIn("Content-Encoding", plain)
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        self.assertEqual(response["Vary"], plain["Vary"])
+        self.assertIn("Accept-Encoding", response["Vary"])
+        self.assertEqual(gzip.decompress(response.content), plain.content)
+        self.assertEqual(int(response["Content-Length"]), len(response.content))
+
+    def test_small_responses_are_not_compressed(self):
+        response = self.client.post(
+            "/api/login/",
+            {"email": "gui@mail.com", "password": "wrong"},
+            HTTP_ACCEPT_ENCODING="gzip",
+        )
+
+        self.assertEqual(response.status_code, 401)
+        self.assertNotIn("Content-Encoding", response)
+
+    def test_etag_is_weakened_and_still_matches(self):
+        url = f"/api/products/{self.products[0].id}/"
+        plain = self.client.get(url)
+        response = self.client.get(url, HTTP_ACCEPT_ENCODING="gzip")
+
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        self.assertEqual(response["ETag"], f"W/{plain['ETag']}")
+
+        response = self.client.get(
+            url, HTTP_ACCEPT_ENCODING="gzip", HTTP_IF_NONE_MATCH=response["ETag"]
+        )
+        self.assertEqual(response.status_code, 304)
+
+    def test_encoded_export_is_left_alone(self):
+        response = self.client.get("/api/products/export/", HTTP_ACCEPT_ENCODING="gzip")
+
+        body = gzip.decompress(b"".join(response.streaming_content))
+        self.assertEqual(len(body.splitlines()), 5)
+
+
+@override_settings(
+    COMPRESSION_ALGORITHMS=["br", "gzip"],
+    COMPRESSION_MIN_SIZE=100,
+    COMPRESSION_CONTENT_TYPES=["application/json", "text/csv"],
+)
+class CompressionMiddlewareTest(SimpleTestCase):
+    body = b'{"description": "Smartband XYZ 3.0"}' * 20
+
+    def respond(self, response, accept_encoding="gzip, deflate"):
+        request = RequestFactory().get("/", HTTP_ACCEPT_ENCODING=accept_encoding)
+        return CompressionMiddleware(lambda request: response)(request)
+
+    def test_content_type_allowlist(self):
+        response = self.respond(HttpResponse(self.body, content_type="image/svg+xml"))
+
+        self.assertNotIn("Content-Encoding", response)
+        self.assertFalse(response.has_header("Vary"))
+
+    def test_negotiation(self):
+        middleware = CompressionMiddleware(None)
+        expected = "br" if brotli else "gzip"
+
+        self.assertEqual(middleware.negotiate("gzip, br"), expected)
+        self.assertEqual(middleware.negotiate("br;q=0, gzip;q=0.5"), "gzip")
+        self.assertEqual(middleware.negotiate("*"), expected)
+        self.assertIsNone(middleware.negotiate("deflate, gzip;q=0"))
+        self.assertIsNone(middleware.negotiate(""))
+
+    def test_streaming_responses(self):
+        chunks = [b"id,description\n"] + [b"1,Smartband XYZ 3.0\n"] * 1000
+        response = self.respond(
+            StreamingHttpResponse(iter(chunks), content_type="text/csv")
+        )
+
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        self.assertFalse(response.has_header("Content-Length"))
+        self.assertEqual(
+            gzip.decompress(b"".join(response.streaming_content)), b"".join(chunks)
+        )
+
+    def test_no_transform(self):
+        response = HttpResponse(self.body, content_type="application/json")
+        response["Cache-Control"] = "no-transform"
+
+        self.assertNotIn("Content-Encoding", self.respond(response))
+
+    @override_settings(COMPRESSION_GZIP_LEVEL=1)
+    def test_level(self):
+        response = self.respond(
+            HttpResponse(self.body, content_type="application/json")
+        )
+
+        self.assertEqual(gzip.decompress(response.content), self.body)
+
+    def test_compressed_body_is_cached_by_etag(self):
+        cache.clear()
+
+        def respond(body):
+            response = HttpResponse(body, content_type="application/json")
+            response["ETag"] = '"v1"'
+            return self.respond(response)
+
+        with mock.patch.object(
+            CompressionMiddleware,
+            "compress",
+            wraps=CompressionMiddleware(None).compress,
+        ) as compress:
+            first = respond(self.body)
+            second = respond(self.body)
+            # A different body under the same ETag is not served stale bytes
+            changed = respond(self.body * 2)
+
+        self.assertEqual(compress.call_count, 2)
+        self.assertEqual(second.content, first.content)
+        self.assertEqual(gzip.decompress(second.content), self.body)
+        self.assertEqual(gzip.decompress(changed.content), self.body * 2)
+
+    async def test_async_compression_is_cached_off_the_event_loop(self):
+        cache.clear()
+        loop_thread = threading.get_ident()
+        threads = []
+        compress = CompressionMiddleware(None).compress
+
+        def compress_recording_thread(algorithm, content):
+            threads.append(threading.get_ident())
+            return compress(algorithm, content)
+
+        async def get_response(request):
+            response = HttpResponse(self.body, content_type="application/json")
+            response["ETag"] = '"v1"'
+            return response
+
+        middleware = CompressionMiddleware(get_response)
+        request = RequestFactory().get("/", HTTP_ACCEPT_ENCODING="gzip")
+
+        with mock.patch.object(
+            CompressionMiddleware, "compress", side_effect=compress_recording_thread
+        ):
+            first = await middleware(request)
+            second = await middleware(request)
+
+        self.assertEqual(len(threads), 1)
+        self.assertNotEqual(threads[0], loop_thread)
+        self.assertEqual(second.content, first.content)
+        self.assertEqual(gzip.decompress(second.content), self.body)
+
+    @override_settings(COMPRESSION_CACHE_TIMEOUT=0)
+    def test_compressed_body_cache_off(self):
+        response = HttpResponse(self.body, content_type="application/json")
+        response["ETag"] = '"v1"'
+
+        with mock.patch.object(
+            CompressionMiddleware, "compress", return_value=b""
+        ) as compress:
+            self.respond(response)
+
+        compress.assert_called_once()
+
+    @skipUnless(brotli, "brotli is not installed")
+    def test_brotli(self):
+        response = self.respond(
+            HttpResponse(self.body, content_type="application/json"), "gzip, br"
+        )
+
+        self.assertEqual(response["Content-Encoding"], "br")
+        self.assertEqual(brotli.decompress(response.content), self.body)
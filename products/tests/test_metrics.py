@@ -0,0 +1,122 @@
+import os
+
+from accounts.models import User
+from django.core.cache import cache
+from django.test import override_settings
+from django.urls import path
+from products.models import Product
+from products.views import ProductView
+from rest_framework.test import APITestCase
+from utils import metrics
+
+urlpatterns = [
+    path("api/products/", ProductView.as_async_view()),
+]
+
+
+@override_settings(METRICS_SAMPLE_RATE=1, METRICS_TOKEN=None, DEBUG=True)
+class MetricsMiddlewareTest(APITestCase):
+    route = "api/products/<pk>/"
+
+    @classmethod
+    def setUpTestData(cls):
+        seller = User.objects.create_user(
+            email="gui@mail.com",
+            password="1234",
+            first_name="Gui",
+            last_name="Lopreti",
+            is_seller=True,
+        )
+        cls.product = Product.objects.create(
+            description="Smartband XYZ 3.0",
+            price=100.99,
+            quantity=15,
+            user=seller,
+        )
+
+    def setUp(self):
+        cache.clear()
+        for histogram in metrics.HISTOGRAMS:
+            histogram.series.clear()
+
+    def test_records_sampled_request_per_route(self):
+        response = self.client.get(f"/api/products/{self.product.pk}/")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertRegex(
+            response["Server-Timing"],
+            r'^db;dur=[\d.]+;desc="\d+ queries", serialize;dur=[\d.]+, '
+            r"app;dur=[\d.]+, render;dur=[\d.]+, total;dur=[\d.]+$",
+        )
+
+        counts, _ = metrics.request_duration.series[(self.route, "GET", "200")]
+        self.assertEqual(sum(counts), 1)
+        counts, size = metrics.response_size.series[(self.route, "GET")]
+        self.assertEqual(size, len(response.content))
+        _, rendered = metrics.render_duration.series[(self.route, "GET")]
+        self.assertGreater(rendered, 0)
+        _, serialized = metrics.serialize_duration.series[(self.route, "GET")]
+        self.assertGreater(serialized, 0)
+
+    def test_times_values_plan_serialization(self):
+        self.client.get("/api/products/", {"cursor": ""})
+
+        _, serialized = metrics.serialize_duration.series[("api/products/", "GET")]
+        self.assertGreater(serialized, 0)
+
+    def test_counts_queries(self):
+        self.client.get("/api/products/", {"cursor": ""})
+
+        _, queries = metrics.db_queries.series[("api/products/", "GET")]
+        self.assertGreaterEqual(queries, 1)
+
+    @override_settings(ROOT_URLCONF=__name__)
+    async def test_counts_queries_of_async_views(self):
+        # The async view queries from the threads of sync_to_async
+        cache.clear()
+        await self.async_client.get("/api/products/", {"cursor": ""})
+
+        _, queries = metrics.db_queries.series[("api/products/", "GET")]
+        self.assertGreaterEqual(queries, 1)
+
+    def test_unmatched_route(self):
+        self.client.get("/nowhere/")
+
+        self.assertIn(("unmatched", "GET", "404"), metrics.request_duration.series)
+
+    @override_settings(METRICS_SAMPLE_RATE=0)
+    def test_sampling_off(self):
+        response = self.client.get(f"/api/products/{self.product.pk}/")
+
+        self.assertNotIn("Server-Timing", response)
+        self.assertEqual(metrics.request_duration.series, {})
+
+    def test_exposition(self):
+        self.client.get(f"/api/products/{self.product.pk}/")
+        response = self.client.get("/metrics")
+
+        self.assertEqual(response.status_code, 200)
+        body = response.content.decode()
+        self.assertIn("# TYPE http_request_duration_seconds histogram", body)
+        worker = os.getpid()
+        self.assertIn(
+            'http_request_duration_seconds_count{route="api/products/<pk>/",'
+            f'method="GET",status="200",worker="{worker}"}} 1',
+            body,
+        )
+        self.assertIn(
+            'http_request_db_queries_bucket{route="api/products/<pk>/",'
+            f'method="GET",worker="{worker}",le="+Inf"}} 1',
+            body,
+        )
+
+    @override_settings(METRICS_TOKEN="secret")
+    def test_exposition_token(self):
+        self.assertEqual(self.client.get("/metrics").status_code, 403)
+
+        response = self.client.get("/metrics", HTTP_AUTHORIZATION="Bearer secret")
+        self.assertEqual(response.status_code, 200)
+
+    @override_settings(DEBUG=False)
+    def test_exposition_closed_without_token(self):
+        self.assertEqual(self.client.get("/metrics").status_code, 403)
@@ -1,4 +1,6 @@
-from accounts.models import User
+from decimal import Decimal
+
+from accounts.models import SellerStats, User
 from django.test import TestCase
 from products.models import Product
 from products.serializers import CreateProductSerializer
@@ -104,3 +106,76 @@ class ProductModelTest(TestCase):
         for product in products:
             self.assertNotIn(product, self.user.products.all())
             self.assertIn(product, user_two.products.all())
+
+
+class SellerStatsTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
+            email="gui@mail",
+            password="123456",
+            first_name="Guilherme",
+            last_name="Silva",
+            is_seller=True,
+        )
+
+    def assertStats(self, active_products, total_quantity, inventory_value):
+        stats = SellerStats.objects.get(user=self.user)
+
+        self.assertEqual(
+            (stats.active_products, stats.total_quantity, stats.inventory_value),
+            (active_products, total_quantity, Decimal(inventory_value)),
+        )
+
+        totals = Product.objects.filter(user=self.user).seller_totals().first()
+        self.assertEqual(totals["active_products"], active_products)
+        self.assertEqual(totals["total_quantity"], total_quantity)
+
+    def test_create_update_and_deactivate(self):
+        product = Product.objects.create(
+            description="Bola", price=10.5, quantity=4, user=self.user
+        )
+        Product.objects.create(description="Rede", price=5, quantity=1, user=self.user)
+        self.assertStats(2, 5, "47.00")
+
+        product.quantity = 2
+        product.save()
+        self.assertStats(2, 3, "26.00")
+
+        product.is_active = False
+        product.save()
+        self.assertStats(1, 1, "5.00")
+
+        product.delete()
+        self.assertStats(1, 1, "5.00")
+
+    def test_bulk_create_and_reserve(self):
+        products = Product.objects.bulk_create(
+            [
+                Product(description="Bola", price=10, quantity=4, user=self.user),
+                Product(description="Rede", price=5, quantity=2, user=self.user),
+            ]
+        )
+        self.assertStats(2, 6, "50.00")
+
+        with self.captureOnCommitCallbacks() as callbacks:
+            Product.objects.reserve({products[0].id: 3, products[1].id: 1})
+        # Applied after the reservation commits, out of its transaction
+        stats = SellerStats.objects.get(user=self.user)
+        self.assertEqual(stats.total_quantity, 6)
+
+        callbacks[0]()
+        self.assertStats(2, 2, "15.00")
+
+    def test_stale_instance_does_not_drift(self):
+        product = Product.objects.create(
+            description="Bola", price=10, quantity=4, user=self.user
+        )
+        stale = Product.objects.get(pk=product.pk)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Product.objects.reserve({product.id: 3})
+        stale.quantity = 10
+        stale.save()
+
+        self.assertStats(1, 10, "100.00")
@@ -0,0 +1,221 @@
+import os
+from types import SimpleNamespace
+from unittest import mock
+
+from django.test import SimpleTestCase, override_settings
+from psycopg2 import InterfaceError, OperationalError
+from psycopg2.extensions import (
+    TRANSACTION_STATUS_IDLE,
+    TRANSACTION_STATUS_INTRANS,
+    TRANSACTION_STATUS_UNKNOWN,
+)
+from utils.db.pool import ConnectionPool, get_pool, pool_stats
+from utils.middleware import RequestTimings
+from utils.queries import install_dispatch_on_connect, instrument
+
+
+class FakeCursor:
+    def __init__(self, connection):
+        self.connection = connection
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    def execute(self, sql):
+        if self.connection.broken:
+            raise OperationalError("server closed the connection unexpectedly")
+        self.connection.executed.append(sql)
+
+
+class FakeConnection:
+    """
+    The part of a psycopg2 connection the pool touches.
+    """
+
+    def __init__(self):
+        self.closed = 0
+        self.broken = False
+        self.info = SimpleNamespace(transaction_status=TRANSACTION_STATUS_IDLE)
+        self.executed = []
+        self.rollbacks = 0
+
+    def cursor(self):
+        return FakeCursor(self)
+
+    def rollback(self):
+        self.rollbacks += 1
+        self.info.transaction_status = TRANSACTION_STATUS_IDLE
+
+    def close(self):
+        self.closed = 1
+
+
+class ConnectionPoolTest(SimpleTestCase):
+    def setUp(self):
+        self.opened = []
+
+    def connect(self):
+        connection = FakeConnection()
+        self.opened.append(connection)
+        return connection
+
+    def test_reuses_released_connections(self):
+        pool = ConnectionPool(size=2, timeout=1, check_interval=30)
+
+        first, _ = pool.acquire(self.connect)
+        pool.release(first)
+        second, _ = pool.acquire(self.connect)
+
+        self.assertIs(second, first)
+        self.assertEqual(len(self.opened), 1)
+        self.assertEqual(pool.snapshot()["in_use"], 1)
+
+    def test_times_out_when_exhausted(self):
+        pool = ConnectionPool(size=1, timeout=0.01, check_interval=30)
+        pool.acquire(self.connect)
+
+        with self.assertLogs("utils.db", "WARNING"):
+            with self.assertRaises(OperationalError):
+                pool.acquire(self.connect)
+
+        self.assertEqual(pool.stats.timeouts, 1)
+        self.assertEqual(len(self.opened), 1)
+
+    def test_failed_connect_frees_the_slot(self):
+        pool = ConnectionPool(size=1, timeout=0.01, check_interval=30)
+
+        def refuse():
+            raise OperationalError("connection refused")
+
+        with self.assertRaises(OperationalError):
+            pool.acquire(refuse)
+
+        connection, _ = pool.acquire(self.connect)
+        self.assertIs(connection, self.opened[0])
+
+    def test_rolls_back_open_transaction_on_release(self):
+        pool = ConnectionPool(size=1, timeout=1, check_interval=30)
+        connection, _ = pool.acquire(self.connect)
+        connection.info.transaction_status = TRANSACTION_STATUS_INTRANS
+
+        pool.release(connection)
+
+        self.assertEqual(connection.rollbacks, 1)
+        self.assertIs(pool.acquire(self.connect)[0], connection)
+
+    def test_discards_closed_connection_on_release(self):
+        pool = ConnectionPool(size=1, timeout=0.01, check_interval=30)
+        connection, _ = pool.acquire(self.connect)
+        connection.closed = 2
+
+        pool.release(connection)
+
+        self.assertEqual(pool.stats.discarded, 1)
+        self.assertIsNot(pool.acquire(self.connect)[0], connection)
+
+    def test_discards_connection_in_unknown_state_on_release(self):
+        pool = ConnectionPool(size=1, timeout=0.01, check_interval=30)
+        connection, _ = pool.acquire(self.connect)
+        connection.info.transaction_status = TRANSACTION_STATUS_UNKNOWN
+
+        pool.release(connection)
+
+        self.assertEqual(connection.closed, 1)
+        self.assertEqual(pool.snapshot()["idle"], 0)
+
+    def test_discards_connection_failing_on_release(self):
+        pool = ConnectionPool(size=1, timeout=0.01, check_interval=30)
+        connection, _ = pool.acquire(self.connect)
+        connection.info = mock.Mock()
+        type(connection.info).transaction_status = mock.PropertyMock(
+            side_effect=InterfaceError("connection already closed")
+        )
+
+        pool.release(connection)
+
+        self.assertEqual(pool.stats.discarded, 1)
+        self.assertEqual(pool.snapshot()["in_use"], 0)
+
+    def test_pings_connections_idle_longer_than_check_interval(self):
+        pool = ConnectionPool(size=1, timeout=1, check_interval=0)
+        connection, _ = pool.acquire(self.connect)
+        pool.release(connection)
+
+        self.assertIs(pool.acquire(self.connect)[0], connection)
+        self.assertEqual(connection.executed, ["SELECT 1"])
+
+    def test_skips_ping_within_check_interval(self):
+        pool = ConnectionPool(size=1, timeout=1, check_interval=30)
+        connection, _ = pool.acquire(self.connect)
+        pool.release(connection)
+
+        pool.acquire(self.connect)
+
+        self.assertEqual(connection.executed, [])
+
+    def test_replaces_connection_failing_the_ping(self):
+        pool = ConnectionPool(size=1, timeout=1, check_interval=0)
+        connection, _ = pool.acquire(self.connect)
+        pool.release(connection)
+        connection.broken = True
+
+        replacement, _ = pool.acquire(self.connect)
+
+        self.assertIsNot(replacement, connection)
+        self.assertEqual(connection.closed, 1)
+        self.assertEqual(pool.stats.snapshot()["connects"], 2)
+
+
+class PoolRegistryTest(SimpleTestCase):
+    options = {"SIZE": 2, "TIMEOUT": 1, "CHECK_INTERVAL": 30}
+
+    def setUp(self):
+        patcher = mock.patch.dict("utils.db.pool._pools", clear=True)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_keyed_by_process(self):
+        parent = get_pool("default", "params", self.options)
+        self.assertIs(get_pool("default", "params", self.options), parent)
+
+        # A forked worker must not share the connections of its parent
+        with mock.patch("utils.db.pool.os.getpid", return_value=-1):
+            child = get_pool("default", "params", self.options)
+            self.assertIsNot(child, parent)
+            child.acquire(FakeConnection)
+
+            self.assertEqual(pool_stats()["default"]["checkouts"], 1)
+
+        self.assertEqual(pool_stats()["default"]["checkouts"], 0)
+
+    def test_stats_sum_the_pools_of_an_alias(self):
+        get_pool("default", "a", self.options).acquire(FakeConnection)
+        get_pool("default", "b", self.options).acquire(FakeConnection)
+
+        stats = pool_stats()["default"]
+        self.assertEqual(
+            (stats["size"], stats["in_use"], stats["checkouts"]), (4, 2, 2)
+        )
+
+    @override_settings(METRICS_TOKEN=None, DEBUG=True)
+    def test_exposed_as_gauges(self):
+        get_pool("default", "params", self.options).acquire(FakeConnection)
+
+        body = self.client.get("/metrics").content.decode()
+
+        self.assertIn("# TYPE db_pool_in_use gauge", body)
+        worker = os.getpid()
+        self.assertIn(f'db_pool_in_use{{alias="default",worker="{worker}"}} 1', body)
+        self.assertIn(f'db_pool_size{{alias="default",worker="{worker}"}} 2', body)
+
+    def test_request_timings_add_up_pool_waits(self):
+        timings = RequestTimings()
+
+        with instrument(timings):
+            connection = SimpleNamespace(pool_wait=0.25, execute_wrappers=[])
+            install_dispatch_on_connect(sender=None, connection=connection)
+
+        self.assertEqual(timings.pool_wait, 0.25)
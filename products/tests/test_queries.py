@@ -0,0 +1,133 @@
+from accounts.models import User
+from asgiref.sync import sync_to_async
+from django.db.models import F
+from django.http import HttpResponse
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import path
+from products.models import Product
+from utils.queries import QueryInspector, QueryProblemsError, fingerprint, instrument
+
+
+def sellers_one_by_one(request):
+    for product in Product.objects.all():
+        product.user.email
+    return HttpResponse()
+
+
+def sellers_joined(request):
+    for product in Product.objects.select_related("user"):
+        product.user.email
+    return HttpResponse()
+
+
+async def async_sellers_one_by_one(request):
+    # Queries of async views run in the threads of sync_to_async
+    return await sync_to_async(sellers_one_by_one)(request)
+
+
+urlpatterns = [
+    path("n-plus-one/", sellers_one_by_one, name="n-plus-one"),
+    path("async-n-plus-one/", async_sellers_one_by_one, name="async-n-plus-one"),
+    path("joined/", sellers_joined, name="joined"),
+]
+
+
+class FingerprintTest(SimpleTestCase):
+    def test_parameters_share_a_shape(self):
+        self.assertEqual(
+            fingerprint('SELECT "a" FROM "t" WHERE "id" = %s AND "n" > 10'),
+            fingerprint('SELECT "a"  FROM "t"\nWHERE "id" = %s AND "n" > 25'),
+        )
+        self.assertEqual(
+            fingerprint("SELECT * FROM t WHERE name = 'it''s'"),
+            "SELECT * FROM t WHERE name = ?",
+        )
+
+    def test_lists_share_a_shape(self):
+        self.assertEqual(
+            fingerprint('SELECT * FROM "t" WHERE "id" IN (%s, %s, %s)'),
+            'SELECT * FROM "t" WHERE "id" IN (...)',
+        )
+        self.assertEqual(
+            fingerprint('INSERT INTO "t" ("a", "b") VALUES (%s, %s), (%s, %s)'),
+            fingerprint('INSERT INTO "t" ("a", "b") VALUES (%s, %s)'),
+        )
+
+    def test_different_shapes(self):
+        self.assertNotEqual(
+            fingerprint('SELECT * FROM "t" WHERE "id" = %s'),
+            fingerprint('SELECT * FROM "t" WHERE "email" = %s'),
+        )
+
+
+@override_settings(
+    ROOT_URLCONF=__name__,
+    QUERY_INSPECTION="strict",
+    QUERY_REPEAT_THRESHOLD=3,
+    QUERY_SLOW_MS=100,
+)
+class QueryInspectionTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        for index in range(3):
+            seller = User.objects.create_user(
+                email=f"seller{index}@mail.com",
+                password="1234",
+                first_name="Gui",
+                last_name="Lopreti",
+                is_seller=True,
+            )
+            Product.objects.create(
+                description="Smartband XYZ 3.0", price=10, quantity=5, user=seller
+            )
+
+    def test_inspector_groups_by_shape(self):
+        with instrument(QueryInspector()) as inspector:
+            for product in Product.objects.all():
+                product.user.email
+            Product.objects.update(quantity=F("quantity") + 1)
+
+        self.assertEqual(len(inspector.repeated(3)), 1)
+        shape, count = inspector.repeated(3)[0]
+        self.assertEqual(count, 3)
+        self.assertIn('FROM "accounts_user"', shape)
+        self.assertEqual(inspector.repeated(None), [])
+        self.assertEqual(inspector.slow(0)[0][1].split()[0], "SELECT")
+
+    def test_strict_mode_raises_on_n_plus_one(self):
+        with self.assertLogs("utils.queries", "WARNING") as logs:
+            with self.assertRaisesMessage(QueryProblemsError, "3 x SELECT"):
+                self.client.get("/n-plus-one/")
+
+        self.assertIn("N+1 in n-plus-one: 3 x SELECT", logs.output[0])
+
+    async def test_strict_mode_sees_queries_of_async_views(self):
+        with self.assertLogs("utils.queries", "WARNING"):
+            with self.assertRaisesMessage(QueryProblemsError, "3 x SELECT"):
+                await self.async_client.get("/async-n-plus-one/")
+
+    def test_strict_mode_accepts_joined_query(self):
+        response = self.client.get("/joined/")
+
+        self.assertEqual(response.status_code, 200)
+
+    @override_settings(QUERY_INSPECTION="sample", QUERY_INSPECTION_SAMPLE_RATE=1)
+    def test_sample_mode_only_logs(self):
+        with self.assertLogs("utils.queries", "WARNING"):
+            response = self.client.get("/n-plus-one/")
+
+        self.assertEqual(response.status_code, 200)
+
+    @override_settings(QUERY_SLOW_MS=0)
+    def test_logs_slow_queries(self):
+        with self.assertLogs("utils.queries", "WARNING") as logs:
+            self.client.get("/joined/")
+
+        self.assertIn("Slow query in joined:", logs.output[0])
+
+    @override_settings(QUERY_INSPECTION="off")
+    def test_off(self):
+        with self.assertNoLogs("utils.queries"):
+            response = self.client.get("/n-plus-one/")
+
+        self.assertEqual(response.status_code, 200)
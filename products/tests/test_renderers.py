@@ -0,0 +1,125 @@
+import datetime
+import io
+import uuid
+from collections import OrderedDict
+from decimal import Decimal
+
+from accounts.models import User
+from django.test import SimpleTestCase, TestCase
+from django.utils import timezone
+from products.models import Product
+from products.serializers import CreateProductSerializer
+from rest_framework.exceptions import ErrorDetail, ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from utils.parsers import ORJSONParser
+from utils.renderers import ORJSONRenderer
+
+
+class ORJSONRendererTest(SimpleTestCase):
+    def assertSameOutput(self, data, accepted_media_type=None):
+        self.assertEqual(
+            ORJSONRenderer().render(data, accepted_media_type),
+            JSONRenderer().render(data, accepted_media_type),
+        )
+
+    def test_same_output_as_json_renderer(self):
+        self.assertSameOutput(
+            OrderedDict(
+                [
+                    ("price", Decimal("100.99")),
+                    ("zero", Decimal("0.00")),
+                    ("utc", datetime.datetime(2022, 7, 1, 12, 30, tzinfo=timezone.utc)),
+                    (
+                        "offset",
+                        datetime.datetime(
+                            2022,
+                            7,
+                            1,
+                            12,
+                            30,
+                            5,
+                            123456,
+                            tzinfo=datetime.timezone(datetime.timedelta(hours=-3)),
+                        ),
+                    ),
+                    ("naive", datetime.datetime(2022, 7, 1, 12, 30, 5, 120000)),
+                    ("date", datetime.date(2022, 7, 1)),
+                    ("time", datetime.time(9, 5)),
+                    ("duration", datetime.timedelta(minutes=90)),
+                    ("uuid", uuid.UUID("12345678-1234-5678-1234-567812345678")),
+                    ("description", "Café com pão, 東京 e emoji 🎉"),
+                    ("separators", "linha\u2028parágrafo\u2029fim"),
+                    ("escapes", 'aspas " barra \\ tab \t nova linha \n'),
+                    ("error", [ErrorDetail("Inválido.", code="invalid")]),
+                    ("values", (1, 2.5, True, None)),
+                ]
+            )
+        )
+
+    def test_falls_back_to_json_renderer(self):
+        self.assertSameOutput({"big": 2**70, 1: "non string key"})
+        self.assertSameOutput({"indented": ["ok"]}, "application/json; indent=4")
+        self.assertEqual(ORJSONRenderer().render(None), b"")
+
+    def test_float_exponents(self):
+        content = ORJSONRenderer().render({"big": 1e16, "small": 1e-7})
+
+        self.assertEqual(content, b'{"big":1e16,"small":1e-7}')
+        self.assertEqual(
+            JSONParser().parse(io.BytesIO(content)), {"big": 1e16, "small": 1e-7}
+        )
+
+
+class ORJSONRendererSerializerTest(TestCase):
+    def test_product_pages(self):
+        seller = User.objects.create_user(
+            email="gui@mail.com",
+            password="1234",
+            first_name="Guí",
+            last_name="Lopreti",
+            is_seller=True,
+        )
+        for price in ("100.99", "0.10", "99999999.99"):
+            Product.objects.create(
+                description="Relógio inteligente — série ™",
+                price=price,
+                quantity=3,
+                user=seller,
+            )
+
+        data = CreateProductSerializer(Product.objects.all(), many=True).data
+
+        self.assertEqual(ORJSONRenderer().render(data), JSONRenderer().render(data))
+
+
+class ORJSONParserTest(SimpleTestCase):
+    def parse(self, content, encoding="utf-8"):
+        return ORJSONParser().parse(
+            io.BytesIO(content), parser_context={"encoding": encoding}
+        )
+
+    def test_same_result_as_json_parser(self):
+        content = '{"description": "Café 東京", "price": 10.5, "items": [1, null]}'
+        self.assertEqual(
+            self.parse(content.encode()),
+            JSONParser().parse(io.BytesIO(content.encode())),
+        )
+
+    def test_integers_over_64_bits(self):
+        content = b'{"big": 18446744073709551616, "negative": -9223372036854775809}'
+
+        self.assertEqual(
+            self.parse(content),
+            {"big": 2**64, "negative": -(2**63) - 1},
+        )
+
+    def test_invalid_json(self):
+        for content in (b'{"price": }', b'{"price": NaN}', b"\xff"):
+            with self.assertRaisesMessage(ParseError, "JSON parse error"):
+                self.parse(content)
+
+    def test_other_encodings(self):
+        content = '{"description": "Café"}'.encode("latin-1")
+
+        self.assertEqual(self.parse(content, "latin-1"), {"description": "Café"})
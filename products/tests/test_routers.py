@@ -0,0 +1,143 @@
+from accounts.models import User
+from asgiref.sync import async_to_sync, sync_to_async
+from django.contrib.auth.models import AnonymousUser
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, override_settings
+from products.models import Product
+from products.views import ProductView
+from rest_framework.request import Request
+from rest_framework.response import Response
+from utils.middleware import ReplicaPinningMiddleware
+from utils.routers import ReplicaRouter, use_primary
+
+
+@override_settings(DATABASE_REPLICAS=["replica_0"], REPLICA_PIN_SECONDS=5)
+class ReplicaRoutingTest(SimpleTestCase):
+    # TestCase runs in a transaction, which keeps every read on the primary
+    user = User(pk=1, email="gui@mail", is_seller=True)
+    token = "9944b09199c62bcf9418ad846dd0e4bbdfc6ee4b"
+
+    def setUp(self):
+        cache.clear()
+        self.router = ReplicaRouter()
+        self.factory = RequestFactory()
+
+    def route(self, request, status=200, authenticate=False):
+        """
+        Runs the middleware and returns the database reads were sent to.
+        """
+        used = []
+
+        def view(request):
+            used.append(self.router.db_for_read(Product))
+            if authenticate:
+                request.user = self.user
+            return HttpResponse(status=status)
+
+        ReplicaPinningMiddleware(view)(request)
+        return used[0]
+
+    async def aroute(self, request, authenticate=False):
+        used = []
+
+        async def view(request):
+            used.append(self.router.db_for_read(Product))
+            if authenticate:
+                request.user = self.user
+            return HttpResponse()
+
+        await ReplicaPinningMiddleware(view)(request)
+        return used[0]
+
+    def auth(self):
+        return {"HTTP_AUTHORIZATION": f"Token {self.token}"}
+
+    def test_reads_go_to_replicas(self):
+        self.assertEqual(self.router.db_for_read(Product), "replica_0")
+        self.assertEqual(self.router.db_for_write(Product), "default")
+
+    def test_use_primary(self):
+        with use_primary():
+            self.assertEqual(self.router.db_for_read(Product), "default")
+
+        self.assertEqual(self.router.db_for_read(Product), "replica_0")
+
+    def test_safe_request_reads_replica(self):
+        request = self.factory.get("/api/products/", **self.auth())
+
+        self.assertEqual(self.route(request), "replica_0")
+
+    def test_unsafe_request_reads_primary(self):
+        request = self.factory.patch("/api/products/1/", **self.auth())
+
+        self.assertEqual(self.route(request, authenticate=True), "default")
+
+    def test_reads_after_write_are_pinned(self):
+        self.route(
+            self.factory.post("/api/products/", **self.auth()), authenticate=True
+        )
+
+        request = self.factory.get("/api/products/", **self.auth())
+        self.assertEqual(self.route(request), "default")
+
+        request = self.factory.get("/api/products/")
+        self.assertEqual(self.route(request), "replica_0")
+
+    async def test_async_reads_after_write_are_pinned(self):
+        request = self.factory.post("/api/products/", **self.auth())
+        self.assertEqual(await self.aroute(request, authenticate=True), "default")
+
+        request = self.factory.get("/api/products/", **self.auth())
+        self.assertEqual(await self.aroute(request), "default")
+
+        request = self.factory.get("/api/products/")
+        self.assertEqual(await self.aroute(request), "replica_0")
+
+    def test_failed_write_does_not_pin(self):
+        self.route(
+            self.factory.post("/api/products/", **self.auth()),
+            status=400,
+            authenticate=True,
+        )
+
+        request = self.factory.get("/api/products/", **self.auth())
+        self.assertEqual(self.route(request), "replica_0")
+
+    def cached_read(self, asynchronous=False):
+        """
+        Reads the product list through the response cache and returns the
+        database the fill, if any, was read from.
+        """
+        used = []
+
+        def handler(request):
+            used.append(self.router.db_for_read(Product))
+            return Response([])
+
+        async def ahandler(request):
+            used.append(await sync_to_async(self.router.db_for_read)(Product))
+            return Response([])
+
+        view = ProductView(kwargs={})
+        request = Request(self.factory.get("/api/products/"))
+        request.user = AnonymousUser()
+
+        if asynchronous:
+            async_to_sync(view.acached_response)(ahandler, request)
+        else:
+            view.cached_response(handler, request)
+
+        return used
+
+    def test_response_cache_is_filled_from_primary(self):
+        # A replica may not have the write that bumped the cache version yet
+        self.assertEqual(self.cached_read(), ["default"])
+        self.assertEqual(self.cached_read(), [])
+
+    def test_async_response_cache_is_filled_from_primary(self):
+        self.assertEqual(self.cached_read(asynchronous=True), ["default"])
+
+    def test_only_primary_is_migrated(self):
+        self.assertTrue(self.router.allow_migrate("default", "products"))
+        self.assertFalse(self.router.allow_migrate("replica_0", "products"))
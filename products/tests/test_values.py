@@ -0,0 +1,80 @@
+from accounts.models import User
+from accounts.serializers import UserSerializer
+from django.test import TestCase
+from products.models import Product
+from products.serializers import CreateProductSerializer, ListProductSerializer
+from rest_framework import serializers
+from rest_framework.renderers import JSONRenderer
+from utils.values import values_plan
+
+
+class ValuesPlanTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.seller = User.objects.create_user(
+            email="gui@mail.com",
+            password="1234",
+            first_name="Gui",
+            last_name="Lopreti",
+            is_seller=True,
+        )
+        cls.buyer = User.objects.create_user(
+            email="ana@mail.com",
+            password="1234",
+            first_name="Ana",
+            last_name="Silva",
+            is_seller=False,
+        )
+        for price, quantity in (("100.99", 15), ("0.10", 0), ("12345678.00", 3)):
+            Product.objects.create(
+                description="Smartband XYZ 3.0",
+                price=price,
+                quantity=quantity,
+                user=cls.seller,
+            )
+
+    def assertSameOutput(self, serializer_class, queryset):
+        plan = values_plan(serializer_class, queryset.model)
+        self.assertIsNotNone(plan)
+
+        expected = JSONRenderer().render(serializer_class(queryset, many=True).data)
+        rows = queryset.values("pk", *plan.columns)
+        self.assertEqual(JSONRenderer().render(plan.represent(rows)), expected)
+
+    def test_list_product_serializer(self):
+        self.assertSameOutput(ListProductSerializer, Product.objects.order_by("id"))
+
+    def test_nested_serializers(self):
+        # The buyer has no stats row, which renders as null
+        self.assertSameOutput(UserSerializer, User.objects.order_by("id"))
+        self.assertSameOutput(CreateProductSerializer, Product.objects.order_by("id"))
+
+    def test_unsupported_fields_keep_the_serializer(self):
+        class DescribedProductSerializer(serializers.ModelSerializer):
+            label = serializers.SerializerMethodField()
+
+            class Meta:
+                model = Product
+                fields = ["description", "label"]
+
+            def get_label(self, product):
+                return product.description.upper()
+
+        self.assertIsNone(values_plan(DescribedProductSerializer, Product))
+
+    def test_list_endpoints_render_the_same(self):
+        render = JSONRenderer().render
+        products = Product.objects.order_by("id")
+
+        response = self.client.get("/api/products/", {"cursor": "", "page_size": 10})
+        self.assertEqual(
+            render(response.data["results"]),
+            render(ListProductSerializer(products, many=True).data),
+        )
+
+        users = User.objects.order_by("-date_joined")
+        response = self.client.get("/api/accounts/newest/2/")
+        self.assertEqual(
+            render(response.data["results"]),
+            render(UserSerializer(users, many=True).data),
+        )
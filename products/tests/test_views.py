@@ -1,8 +1,23 @@
+import csv
+import gzip
+import json
+
 from accounts.models import User
+from django.core.cache import cache
+from django.db import connection
+from django.db.backends.postgresql.base import DatabaseWrapper
+from django.db.models import F, Value
+from django.test.utils import CaptureQueriesContext
 from products.models import Product
 from products.serializers import CreateProductSerializer, ListProductSerializer
+from products.views import ProductView
 from rest_framework.authtoken.models import Token
-from rest_framework.test import APITestCase
+from rest_framework.exceptions import ValidationError
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory, APITestCase
+from utils.lookups import ILikeContains
+from utils.pagination import KeysetPagination
+from utils.testing import QueryBudgetMixin
 
 
 class ProductCreateViewTest(APITestCase):
@@ -186,3 +201,888 @@ class ProductUpdateViewTest(APITestCase):
             {"detail": "You do not have permission to perform this action."},
             response.data,
         )
+
+
+class ProductKeysetPaginationViewTest(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user_seller = User.objects.create_user(
+            email="gui@mail",
+            password="123456",
+            first_name="Guilherme",
+            last_name="Silva",
+            is_seller=True,
+        )
+
+        cls.products = [
+            Product.objects.create(
+                description=f"Produto {index}",
+                price=100.00,
+                quantity=20,
+                user=cls.user_seller,
+            )
+            for index in range(12)
+        ]
+
+    def setUp(self):
+        cache.clear()
+
+    def test_keyset_pages_walk_the_whole_catalog(self):
+        url = "/api/products/?cursor=&page_size=5"
+        results = []
+
+        while url:
+            response = self.client.get(url)
+
+            self.assertEqual(response.status_code, 200)
+            self.assertNotIn("count", response.data)
+            results.extend(response.data["results"])
+            url = response.data["next"]
+
+        self.assertEqual(ListProductSerializer(self.products, many=True).data, results)
+
+    def test_keyset_previous_link_returns_previous_page(self):
+        first = self.client.get("/api/products/?cursor=&page_size=5")
+        second = self.client.get(first.data["next"])
+        previous = self.client.get(second.data["previous"])
+
+        self.assertIsNone(first.data["previous"])
+        self.assertEqual(first.data["results"], previous.data["results"])
+
+    def test_keyset_page_does_not_count(self):
+        with self.assertNumQueries(1):
+            response = self.client.get("/api/products/?cursor=")
+
+        self.assertEqual(len(response.data["results"]), 5)
+
+    def test_keyset_page_size_is_capped(self):
+        with self.settings(KEYSET_MAX_PAGE_SIZE=3):
+            response = self.client.get("/api/products/?cursor=&page_size=50")
+
+        self.assertEqual(len(response.data["results"]), 3)
+
+    def test_invalid_cursor(self):
+        response = self.client.get("/api/products/?cursor=banana")
+
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual({"detail": "Invalid cursor."}, response.data)
+
+    def walk(self, url):
+        results = []
+
+        while url:
+            response = self.client.get(url)
+
+            self.assertEqual(response.status_code, 200)
+            results.extend(response.data["results"])
+            url = response.data["next"]
+
+        return results
+
+    def test_keyset_pages_follow_ordering(self):
+        for index, product in enumerate(self.products):
+            product.price = index % 4
+        Product.objects.bulk_update(self.products, ["price"])
+
+        results = self.walk("/api/products/?cursor=&page_size=5&ordering=-price")
+
+        self.assertEqual(
+            ListProductSerializer(
+                Product.objects.order_by("-price", "id"), many=True
+            ).data,
+            results,
+        )
+
+        first = self.client.get("/api/products/?cursor=&page_size=5&ordering=-price")
+        second = self.client.get(first.data["next"])
+        self.assertEqual(
+            self.client.get(second.data["previous"]).data["results"],
+            first.data["results"],
+        )
+
+    def test_keyset_pages_of_search(self):
+        results = self.walk("/api/products/?q=Produto%201&cursor=&page_size=2")
+
+        self.assertEqual(
+            ListProductSerializer(
+                [self.products[1], self.products[10], self.products[11]], many=True
+            ).data,
+            results,
+        )
+
+    def test_keyset_rejects_orderings_off_columns(self):
+        # Annotations are not columns a cursor can hold
+        request = Request(APIRequestFactory().get("/api/products/?cursor="))
+        queryset = Product.objects.annotate(rank=Value(1)).order_by("-rank", "id")
+
+        with self.assertRaises(ValidationError) as context:
+            KeysetPagination().paginate_queryset(queryset, request, ProductView())
+
+        self.assertEqual(context.exception.status_code, 400)
+
+
+class ProductBulkCreateViewTest(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user_seller = User.objects.create_user(
+            email="gui@mail",
+            password="123456",
+            first_name="Guilherme",
+            last_name="Silva",
+            is_seller=True,
+        )
+        cls.token_seller = Token.objects.create(user=cls.user_seller)
+
+    def setUp(self):
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {self.token_seller.key}")
+
+    def test_seller_create_products_in_bulk(self):
+        products_data = [
+            {"description": f"Produto {index}", "price": 10.50, "quantity": 3}
+            for index in range(30)
+        ]
+
+        with self.settings(PRODUCT_BULK_BATCH_SIZE=10):
+            response = self.client.post("/api/products/", products_data, format="json")
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data["errors"], [])
+        self.assertEqual(self.user_seller.products.count(), 30)
+        self.assertEqual(
+            CreateProductSerializer(Product.objects.order_by("id"), many=True).data,
+            response.data["results"],
+        )
+
+    def test_invalid_rows_do_not_abort_valid_rows(self):
+        products_data = [
+            {"description": "Bola", "price": 10, "quantity": 3},
+            {"description": "", "price": False, "quantity": 0},
+            {"description": "Rede", "price": 20, "quantity": 1},
+        ]
+
+        response = self.client.post("/api/products/", products_data, format="json")
+
+        serializer = CreateProductSerializer(data=products_data[1])
+        serializer.is_valid()
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(len(response.data["results"]), 2)
+        self.assertEqual(
+            [{"index": 1, "errors": serializer.errors}], response.data["errors"]
+        )
+        self.assertEqual(Product.objects.count(), 2)
+
+    def test_all_rows_invalid(self):
+        response = self.client.post(
+            "/api/products/", [{"description": "", "quantity": 0}], format="json"
+        )
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data["results"], [])
+        self.assertEqual(Product.objects.count(), 0)
+
+    def test_seller_create_products_from_ndjson(self):
+        body = "\n".join(
+            [
+                '{"description": "Bola", "price": 10, "quantity": 3}',
+                "",
+                '{"description": "Rede", "price": 20, "quantity": 1}',
+            ]
+        )
+
+        response = self.client.post(
+            "/api/products/", body, content_type="application/x-ndjson"
+        )
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(self.user_seller.products.count(), 2)
+
+    def test_malformed_ndjson(self):
+        response = self.client.post(
+            "/api/products/",
+            '{"description": "Bola"}\n{',
+            content_type="application/x-ndjson",
+        )
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(Product.objects.count(), 0)
+
+    def test_ndjson_row_limit(self):
+        body = '{"description": "Bola", "price": 10, "quantity": 3}\n' * 3
+
+        with self.settings(NDJSON_MAX_ROWS=2):
+            response = self.client.post(
+                "/api/products/", body, content_type="application/x-ndjson"
+            )
+
+        self.assertEqual(response.status_code, 413)
+        self.assertEqual(Product.objects.count(), 0)
+
+    def test_not_seller_cannot_create_products_in_bulk(self):
+        user = User.objects.create_user(
+            email="lucira@mail",
+            password="123456",
+            first_name="Lucira",
+            last_name="Silva",
+            is_seller=False,
+        )
+        token = Token.objects.create(user=user)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {token.key}")
+
+        response = self.client.post(
+            "/api/products/",
+            [{"description": "Bola", "price": 10, "quantity": 3}],
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, 403)
+
+
+class ProductQueryCountTest(QueryBudgetMixin, APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user_seller = User.objects.create_user(
+            email="gui@mail",
+            password="123456",
+            first_name="Guilherme",
+            last_name="Silva",
+            is_seller=True,
+        )
+        cls.token_seller = Token.objects.create(user=cls.user_seller)
+
+        cls.products = [
+            Product.objects.create(
+                description="Bola de basquete vazia e laranja",
+                price=100.00,
+                quantity=20,
+                user=cls.user_seller,
+            )
+            for _ in range(10)
+        ]
+
+    def setUp(self):
+        cache.clear()
+
+    def test_list_products_query_budget(self):
+        with self.assertMaxQueries(2):
+            response = self.client.get("/api/products/")
+
+        self.assertEqual(response.status_code, 200)
+
+    def test_retrieve_product_query_budget(self):
+        with self.assertMaxQueries(2):
+            response = self.client.get(f"/api/products/{self.products[0].id}/")
+
+        self.assertEqual(response.status_code, 200)
+
+    def test_update_product_query_budget(self):
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {self.token_seller.key}")
+        self.client.get("/api/products/")
+
+        # The seller's stats are locked, updated and read back
+        with self.assertMaxQueries(5):
+            response = self.client.patch(
+                f"/api/products/{self.products[0].id}/", {"price": 10}, format="json"
+            )
+
+        self.assertEqual(response.status_code, 200)
+
+    def test_bulk_create_query_budget(self):
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {self.token_seller.key}")
+        products_data = [
+            {"description": "Bola", "price": 10, "quantity": 3} for _ in range(50)
+        ]
+
+        # One update of the seller's stats and one read for the response
+        with self.assertMaxQueries(6):
+            response = self.client.post("/api/products/", products_data, format="json")
+
+        self.assertEqual(response.status_code, 201)
+
+
+class ProductSearchViewTest(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user_seller = User.objects.create_user(
+            email="gui@mail",
+            password="123456",
+            first_name="Guilherme",
+            last_name="Silva",
+            is_seller=True,
+        )
+
+        descriptions = [
+            "Bola de basquete vazia e laranja",
+            "Rede de volei",
+            "Bola de futebol",
+            "Camisa de basquete",
+        ]
+        cls.products = [
+            Product.objects.create(
+                description=description, price=10, quantity=1, user=cls.user_seller
+            )
+            for description in descriptions
+        ]
+
+    def test_search_products_by_description(self):
+        response = self.client.get("/api/products/?q=bola")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            ListProductSerializer([self.products[0], self.products[2]], many=True).data,
+            response.data["results"],
+        )
+
+    def test_short_search_matches_substrings(self):
+        response = self.client.get("/api/products/?q=ed")
+
+        self.assertEqual(
+            ListProductSerializer([self.products[1]], many=True).data,
+            response.data["results"],
+        )
+
+    def test_short_search_uses_ilike_on_postgresql(self):
+        # Only ILIKE on the plain column is served by the trigram index
+        postgresql = DatabaseWrapper(
+            {**connection.settings_dict, "ENGINE": "django.db.backends.postgresql"},
+            "postgresql",
+        )
+        queryset = Product.objects.filter(ILikeContains(F("description"), "e_d"))
+
+        sql, params = queryset.query.get_compiler(connection=postgresql).as_sql()
+
+        self.assertIn('WHERE "products_product"."description" ILIKE %s', sql)
+        self.assertEqual(params, ("%e\\_d%",))
+
+    def test_blank_search_lists_everything(self):
+        response = self.client.get("/api/products/?q=%20")
+
+        self.assertEqual(response.data["count"], 4)
+
+    def test_search_vector_is_not_exposed(self):
+        response = self.client.get(f"/api/products/{self.products[0].id}/")
+
+        self.assertNotIn("search_vector", response.data)
+
+
+class ProductFilterViewTest(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user_one = User.objects.create_user(
+            email="gui@mail",
+            password="123456",
+            first_name="Guilherme",
+            last_name="Silva",
+            is_seller=True,
+        )
+        cls.user_two = User.objects.create_user(
+            email="lucira@mail",
+            password="123456",
+            first_name="Lucira",
+            last_name="Silva",
+            is_seller=True,
+        )
+
+        cls.cheap = Product.objects.create(
+            description="Bola", price=10, quantity=0, user=cls.user_one
+        )
+        cls.middle = Product.objects.create(
+            description="Rede", price=50, quantity=5, user=cls.user_two
+        )
+        cls.expensive = Product.objects.create(
+            description="Tabela", price=900, quantity=1, user=cls.user_one
+        )
+        cls.inactive = Product.objects.create(
+            description="Apito",
+            price=50,
+            quantity=3,
+            user=cls.user_two,
+            is_active=False,
+        )
+
+    def get_results(self, query):
+        response = self.client.get(f"/api/products/?{query}")
+        self.assertEqual(response.status_code, 200)
+        return response.data["results"]
+
+    def test_filter_by_price_range(self):
+        self.assertEqual(
+            ListProductSerializer([self.middle, self.inactive], many=True).data,
+            self.get_results("price__gte=20&price__lte=100&ordering=id"),
+        )
+
+    def test_filter_by_seller_and_active_flag(self):
+        self.assertEqual(
+            ListProductSerializer([self.middle], many=True).data,
+            self.get_results(f"seller_id={self.user_two.id}&is_active=true"),
+        )
+
+    def test_filter_in_stock(self):
+        self.assertEqual(
+            ListProductSerializer([self.cheap], many=True).data,
+            self.get_results("in_stock=false"),
+        )
+
+    def test_ordering_breaks_ties_on_id(self):
+        self.assertEqual(
+            ListProductSerializer(
+                [self.expensive, self.middle, self.inactive, self.cheap], many=True
+            ).data,
+            self.get_results("ordering=-price"),
+        )
+
+    def test_ordering_ignores_fields_not_whitelisted(self):
+        self.assertEqual(
+            ListProductSerializer(
+                [self.cheap, self.middle, self.expensive, self.inactive], many=True
+            ).data,
+            self.get_results("ordering=description,id"),
+        )
+
+    def test_invalid_filter_values(self):
+        response = self.client.get("/api/products/?price__gte=banana&in_stock=talvez")
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual({"price__gte", "in_stock"}, set(response.data))
+
+
+class ProductResponseCacheTest(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user_seller = User.objects.create_user(
+            email="gui@mail",
+            password="123456",
+            first_name="Guilherme",
+            last_name="Silva",
+            is_seller=True,
+        )
+        cls.token_seller = Token.objects.create(user=cls.user_seller)
+
+        cls.product = Product.objects.create(
+            description="Bola de basquete vazia e laranja",
+            price=100.00,
+            quantity=20,
+            user=cls.user_seller,
+        )
+
+    def setUp(self):
+        cache.clear()
+
+    def test_anonymous_reads_are_served_from_cache(self):
+        first = self.client.get("/api/products/?page=1")
+
+        with self.assertNumQueries(0):
+            second = self.client.get("/api/products/?page=1")
+
+        self.assertEqual(first.data, second.data)
+        self.assertEqual(first["ETag"], second["ETag"])
+
+    def test_query_string_is_normalized(self):
+        self.client.get("/api/products/?is_active=true&ordering=price")
+
+        with self.assertNumQueries(0):
+            self.client.get("/api/products/?ordering=price&is_active=true")
+
+    def test_conditional_requests(self):
+        url = f"/api/products/{self.product.id}/"
+        response = self.client.get(url)
+
+        not_modified = self.client.get(url, HTTP_IF_NONE_MATCH=response["ETag"])
+        not_modified_since = self.client.get(
+            url, HTTP_IF_MODIFIED_SINCE=response["Last-Modified"]
+        )
+
+        self.assertEqual(not_modified.status_code, 304)
+        self.assertEqual(not_modified_since.status_code, 304)
+
+    def test_cached_detail_skips_versions_query(self):
+        url = f"/api/products/{self.product.id}/"
+        response = self.client.get(url)
+
+        with self.assertNumQueries(0):
+            cached = self.client.get(url)
+            not_modified = self.client.get(url, HTTP_IF_NONE_MATCH=response["ETag"])
+
+        self.assertEqual(cached["ETag"], response["ETag"])
+        self.assertEqual(not_modified.status_code, 304)
+
+    def test_patch_invalidates_detail_and_list(self):
+        detail = self.client.get(f"/api/products/{self.product.id}/")
+        self.client.get("/api/products/")
+
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {self.token_seller.key}")
+        self.client.patch(
+            f"/api/products/{self.product.id}/", {"price": 1.5}, format="json"
+        )
+        self.client.credentials()
+
+        updated = self.client.get(f"/api/products/{self.product.id}/")
+        listing = self.client.get("/api/products/")
+
+        self.assertNotEqual(detail["ETag"], updated["ETag"])
+        self.assertEqual(updated.data["price"], "1.50")
+        self.assertEqual(listing.data["results"][0]["price"], "1.50")
+
+    def test_create_invalidates_list(self):
+        self.client.get("/api/products/")
+
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {self.token_seller.key}")
+        self.client.post(
+            "/api/products/",
+            [{"description": "Rede", "price": 10, "quantity": 1}],
+            format="json",
+        )
+        self.client.credentials()
+
+        self.assertEqual(self.client.get("/api/products/").data["count"], 2)
+
+    def test_seller_deletion_invalidates_products(self):
+        url = f"/api/products/{self.product.id}/"
+        self.client.get(url)
+        self.client.get("/api/products/")
+
+        self.user_seller.delete()
+
+        self.assertEqual(self.client.get(url).status_code, 404)
+        self.assertEqual(self.client.get("/api/products/").data["count"], 0)
+
+    def test_authenticated_reads_skip_cache(self):
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {self.token_seller.key}")
+        self.client.get("/api/products/")
+
+        response = self.client.get("/api/products/")
+
+        self.assertNotIn("ETag", response)
+
+
+class ProductConditionalGetTest(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user_seller = User.objects.create_user(
+            email="gui@mail",
+            password="123456",
+            first_name="Guilherme",
+            last_name="Silva",
+            is_seller=True,
+        )
+        cls.token_seller = Token.objects.create(user=cls.user_seller)
+
+        cls.product = Product.objects.create(
+            description="Bola de basquete vazia e laranja",
+            price=100.00,
+            quantity=20,
+            user=cls.user_seller,
+        )
+
+    def setUp(self):
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {self.token_seller.key}")
+        self.url = f"/api/products/{self.product.id}/"
+
+    def test_unchanged_product_is_not_modified(self):
+        response = self.client.get(self.url)
+
+        with self.assertNumQueries(1):
+            not_modified = self.client.get(
+                self.url, HTTP_IF_NONE_MATCH=response["ETag"]
+            )
+
+        self.assertEqual(not_modified.status_code, 304)
+
+    def test_updated_product_changes_etag(self):
+        response = self.client.get(self.url)
+
+        self.client.patch(self.url, {"quantity": 2}, format="json")
+        modified = self.client.get(self.url, HTTP_IF_NONE_MATCH=response["ETag"])
+
+        self.assertEqual(modified.status_code, 200)
+        self.assertEqual(modified.data["quantity"], 2)
+
+    def test_missing_product(self):
+        self.assertEqual(self.client.get("/api/products/0/").status_code, 404)
+        self.assertEqual(self.client.get("/api/products/abc/").status_code, 404)
+
+
+class ProductReservationViewTest(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user_seller = User.objects.create_user(
+            email="gui@mail",
+            password="123456",
+            first_name="Guilherme",
+            last_name="Silva",
+            is_seller=True,
+        )
+        cls.token_seller = Token.objects.create(user=cls.user_seller)
+
+        cls.ball = Product.objects.create(
+            description="Bola de basquete",
+            price=100.00,
+            quantity=5,
+            user=cls.user_seller,
+        )
+        cls.net = Product.objects.create(
+            description="Rede de basquete",
+            price=50.00,
+            quantity=2,
+            user=cls.user_seller,
+        )
+
+    def setUp(self):
+        self.client.credentials(HTTP_AUTHORIZATION="Token " + self.token_seller.key)
+
+    def reserve(self, *items):
+        return self.client.post(
+            "/api/products/reservations/",
+            {
+                "items": [
+                    {"product_id": product.id, "quantity": quantity}
+                    for product, quantity in items
+                ]
+            },
+            format="json",
+        )
+
+    def test_reserve_products(self):
+        response = self.reserve((self.net, 2), (self.ball, 3))
+
+        self.assertEqual(response.status_code, 200)
+        self.ball.refresh_from_db()
+        self.net.refresh_from_db()
+        self.assertEqual(self.ball.quantity, 2)
+        self.assertEqual(self.net.quantity, 0)
+
+    def test_repeated_products_are_added_up(self):
+        response = self.reserve((self.ball, 3), (self.ball, 3))
+
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(response.data["product_id"], self.ball.id)
+
+    def test_insufficient_stock_reserves_nothing(self):
+        response = self.reserve((self.ball, 3), (self.net, 3))
+
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(response.data["product_id"], self.net.id)
+        self.ball.refresh_from_db()
+        self.assertEqual(self.ball.quantity, 5)
+
+    def test_inactive_products_cannot_be_reserved(self):
+        Product.objects.filter(pk=self.ball.pk).update(is_active=False)
+
+        response = self.reserve((self.ball, 1))
+
+        self.assertEqual(response.status_code, 409)
+
+    def test_reservation_updates_cached_product(self):
+        url = f"/api/products/{self.ball.id}/"
+        self.client.credentials()
+        self.client.get(url)
+
+        self.client.credentials(HTTP_AUTHORIZATION="Token " + self.token_seller.key)
+        self.reserve((self.ball, 1))
+
+        self.client.credentials()
+        self.assertEqual(self.client.get(url).data["quantity"], 4)
+
+    def test_invalid_reservations(self):
+        self.assertEqual(self.reserve().status_code, 400)
+        self.assertEqual(self.reserve((self.ball, 0)).status_code, 400)
+
+    def test_reservation_requires_authentication(self):
+        self.client.credentials()
+
+        self.assertEqual(self.reserve((self.ball, 1)).status_code, 401)
+
+    def test_reservation_runs_one_update_per_product(self):
+        with CaptureQueriesContext(connection) as queries:
+            self.reserve((self.ball, 1), (self.net, 1))
+
+        updates = [
+            q["sql"]
+            for q in queries
+            if q["sql"].startswith('UPDATE "products_product"')
+        ]
+        self.assertEqual(len(updates), 2)
+        self.assertIn(str(self.ball.id), updates[0])
+
+
+class ProductExportViewTest(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user_seller = User.objects.create_user(
+            email="gui@mail",
+            password="123456",
+            first_name="Guilherme",
+            last_name="Silva",
+            is_seller=True,
+        )
+        cls.products = [
+            Product.objects.create(
+                description=f"Bola {index}",
+                price=10 + index,
+                quantity=index,
+                user=cls.user_seller,
+            )
+            for index in range(3)
+        ]
+
+    def test_ndjson_export(self):
+        response = self.client.get("/api/products/export/")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Content-Type"], "application/x-ndjson")
+        lines = b"".join(response.streaming_content).decode().splitlines()
+        self.assertEqual(
+            json.loads(lines[0]),
+            {
+                "id": self.products[0].id,
+                "description": "Bola 0",
+                "price": "10.00",
+                "quantity": 0,
+                "is_active": True,
+                "seller_id": self.user_seller.id,
+            },
+        )
+        self.assertEqual(len(lines), 3)
+
+    def test_csv_export_is_filtered(self):
+        response = self.client.get(
+            "/api/products/export/?export_format=csv&in_stock=true",
+            HTTP_ACCEPT="text/csv",
+        )
+
+        self.assertEqual(response.status_code, 200)
+        content = b"".join(response.streaming_content).decode()
+        rows = list(csv.reader(content.splitlines()))
+        self.assertEqual(rows[0][0], "id")
+        self.assertEqual([row[1] for row in rows[1:]], ["Bola 1", "Bola 2"])
+
+    def test_gzip_export(self):
+        response = self.client.get(
+            "/api/products/export/", HTTP_ACCEPT_ENCODING="gzip, deflate"
+        )
+
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        self.assertIn("Accept-Encoding", response["Vary"])
+        content = gzip.decompress(b"".join(response.streaming_content))
+        self.assertEqual(len(content.splitlines()), 3)
+
+    def test_invalid_export(self):
+        response = self.client.get("/api/products/export/?export_format=xml")
+        self.assertEqual(response.status_code, 400)
+
+        response = self.client.get("/api/products/export/?price__gte=cheap")
+        self.assertEqual(response.status_code, 400)
+
+    async def test_export_unavailable_under_asgi(self):
+        response = await self.async_client.get("/api/products/export/")
+
+        self.assertEqual(response.status_code, 501)
+
+
+class SellerProductViewTest(QueryBudgetMixin, APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.seller = User.objects.create_user(
+            email="gui@mail",
+            password="123456",
+            first_name="Guilherme",
+            last_name="Silva",
+            is_seller=True,
+        )
+        cls.other_seller = User.objects.create_user(
+            email="ana@mail",
+            password="123456",
+            first_name="Ana",
+            last_name="Souza",
+            is_seller=True,
+        )
+        cls.buyer = User.objects.create_user(
+            email="leo@mail",
+            password="123456",
+            first_name="Leo",
+            last_name="Lima",
+            is_seller=False,
+        )
+
+        cls.products = [
+            Product.objects.create(
+                description=f"Bola de basquete {i}",
+                price=10.00,
+                quantity=2,
+                is_active=i % 3 != 0,
+                user=cls.seller,
+            )
+            for i in range(7)
+        ]
+        Product.objects.create(
+            description="Raquete", price=50.00, quantity=1, user=cls.other_seller
+        )
+
+    def test_lists_only_the_seller_products_in_keyset_pages(self):
+        url = f"/api/accounts/{self.seller.id}/products/"
+        response = self.client.get(url)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn("count", response.data)
+        self.assertIsNone(response.data["previous"])
+        self.assertEqual(
+            [product["id"] for product in response.data["results"]],
+            [product.id for product in self.products[:5]],
+        )
+
+        response = self.client.get(response.data["next"])
+
+        self.assertEqual(
+            [product["id"] for product in response.data["results"]],
+            [product.id for product in self.products[5:]],
+        )
+        self.assertIsNone(response.data["next"])
+
+    def test_seller_summary_once_per_response(self):
+        response = self.client.get(f"/api/accounts/{self.seller.id}/products/")
+
+        self.assertEqual(
+            response.data["seller"],
+            {
+                "id": self.seller.id,
+                "first_name": "Guilherme",
+                "last_name": "Silva",
+                "date_joined": response.data["seller"]["date_joined"],
+                "seller_stats": {
+                    "active_products": 4,
+                    "total_quantity": 8,
+                    "inventory_value": "80.00",
+                },
+            },
+        )
+        self.assertEqual(
+            set(response.data["results"][0]),
+            {"id", "description", "price", "quantity", "is_active"},
+        )
+
+    def test_active_filter(self):
+        url = f"/api/accounts/{self.seller.id}/products/"
+
+        active = self.client.get(url, {"is_active": "true", "page_size": 10})
+        inactive = self.client.get(url, {"is_active": "false", "page_size": 10})
+
+        self.assertEqual(len(active.data["results"]), 4)
+        self.assertTrue(all(item["is_active"] for item in active.data["results"]))
+        self.assertEqual(len(inactive.data["results"]), 3)
+
+        response = self.client.get(url, {"is_active": "maybe"})
+        self.assertEqual(response.status_code, 400)
+
+    def test_unknown_or_not_seller(self):
+        for pk in (self.buyer.id, 999999):
+            response = self.client.get(f"/api/accounts/{pk}/products/")
+            self.assertEqual(response.status_code, 404)
+
+    def test_query_budget(self):
+        # The seller with its stats and one keyset page
+        with self.assertMaxQueries(2):
+            response = self.client.get(
+                f"/api/accounts/{self.seller.id}/products/", {"page_size": 50}
+            )
+
+        self.assertEqual(len(response.data["results"]), 7)
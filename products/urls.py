@@ -1,8 +1,12 @@
 from django.urls import path
+from utils.async_views import read_view
 
 from . import views
 
 urlpatterns = [
-    path("products/", views.ProductView.as_view()),
-    path("products/<pk>/", views.ProductParamsView.as_view()),
+    path("accounts/<int:pk>/products/", read_view(views.SellerProductView)),
+    path("products/", read_view(views.ProductView)),
+    path("products/export/", views.ProductExportView.as_view()),
+    path("products/reservations/", views.ReservationView.as_view()),
+    path("products/<pk>/", read_view(views.ProductParamsView)),
 ]
@@ -1,24 +1,225 @@
+from accounts.models import User
+from accounts.serializers import SellerSummarySerializer
+from asgiref.sync import sync_to_async
+from django.core.handlers.asgi import ASGIRequest
+from django.db import transaction
+from django.http import StreamingHttpResponse
+from django.middleware.gzip import re_accepts_gzip
+from django.shortcuts import get_object_or_404
+from django.utils.cache import patch_vary_headers
 from rest_framework import generics
-from utils.mixins import SerializerByMethodMixin
+from rest_framework.exceptions import APIException, ValidationError
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.settings import api_settings
+from rest_framework.views import Response, status
+from utils import cache
+from utils.async_views import AsyncReadMixin
+from utils.middleware import timed_serialization
+from utils.filters import QueryParamFilterBackend, StableOrderingFilter
+from utils.mixins import (
+    CachedResponseMixin,
+    ConditionalGetMixin,
+    SerializerByMethodMixin,
+)
+from utils.parsers import NDJSONParser
+from utils.values import ValuesListMixin
 
+from .export import FORMATS, export_chunks, export_rows
+from .filters import PRODUCT_FILTER_FIELDS, ProductSearchFilter
 from .models import Product
 from .permissions import AuthSellerPermission, SellerOwnerPermission
-from .serializers import CreateProductSerializer, ListProductSerializer
+from .serializers import (
+    CreateProductSerializer,
+    ListProductSerializer,
+    ReservationSerializer,
+    SellerProductSerializer,
+)
 
 
 # Create your views here.
-class ProductView(SerializerByMethodMixin, generics.ListCreateAPIView):
+class ProductView(
+    CachedResponseMixin,
+    SerializerByMethodMixin,
+    ValuesListMixin,
+    AsyncReadMixin,
+    generics.ListCreateAPIView,
+):
     permission_classes = [AuthSellerPermission]
+    parser_classes = [*api_settings.DEFAULT_PARSER_CLASSES, NDJSONParser]
+    filter_backends = [
+        ProductSearchFilter,
+        QueryParamFilterBackend,
+        StableOrderingFilter,
+    ]
+    filter_fields = PRODUCT_FILTER_FIELDS
+    ordering_fields = ["id", "price", "quantity"]
 
     queryset = Product.objects.all()
     serializer_map = {"GET": ListProductSerializer, "POST": CreateProductSerializer}
+    cache_namespace = "products"
+    keyset_ordering = ("id",)
+
+    def create(self, request, *args, **kwargs):
+        if not isinstance(request.data, list):
+            return super().create(request, *args, **kwargs)
+
+        serializer = self.get_serializer(data=request.data, many=True)
+        serializer.is_valid(raise_exception=True)
+
+        with transaction.atomic():
+            self.perform_create(serializer)
+
+        with timed_serialization(request):
+            created = serializer.data
+        errors = serializer.row_errors
+
+        return Response(
+            {"results": created, "errors": errors},
+            status=status.HTTP_400_BAD_REQUEST
+            if errors and not created
+            else status.HTTP_201_CREATED,
+        )
 
     def perform_create(self, serializer):
         serializer.save(user=self.request.user)
+        # bulk_create does not send post_save, see products.signals
+        cache.invalidate(self.cache_namespace)
 
 
-class ProductParamsView(SerializerByMethodMixin, generics.RetrieveUpdateAPIView):
+class ProductParamsView(
+    ConditionalGetMixin,
+    CachedResponseMixin,
+    SerializerByMethodMixin,
+    AsyncReadMixin,
+    generics.RetrieveUpdateAPIView,
+):
     permission_classes = [SellerOwnerPermission]
 
     queryset = Product.objects.all()
     serializer_map = {"GET": ListProductSerializer, "PATCH": CreateProductSerializer}
+    cache_namespace = "products"
+    select_related_map = {"PATCH": ("user",)}
+
+
+class SellerProductView(ValuesListMixin, AsyncReadMixin, generics.ListAPIView):
+    """
+    Products of one seller (`?is_active=` optional) in keyset pages over the
+    `(user_id, id)` indexes, with the seller and its stats once per page.
+    """
+
+    queryset = Product.objects.all()
+    serializer_class = SellerProductSerializer
+    filter_backends = [QueryParamFilterBackend]
+    filter_fields = {"is_active": PRODUCT_FILTER_FIELDS["is_active"]}
+    keyset_ordering = ("id",)
+    keyset_required = True
+
+    def get_queryset(self):
+        return super().get_queryset().filter(user_id=self.kwargs["pk"])
+
+    def get_seller(self):
+        sellers = User.objects.filter(is_seller=True).select_related("seller_stats")
+        return get_object_or_404(sellers, pk=self.kwargs["pk"])
+
+    def list(self, request, *args, **kwargs):
+        seller = self.get_seller()
+        return self.with_seller(seller, super().list(request, *args, **kwargs))
+
+    async def alist(self, request, *args, **kwargs):
+        seller = await sync_to_async(self.get_seller)()
+        return self.with_seller(seller, await super().alist(request, *args, **kwargs))
+
+    def with_seller(self, seller, response):
+        with timed_serialization(self.request):
+            summary = SellerSummarySerializer(seller).data
+        response.data = {"seller": summary, **response.data}
+        return response
+
+
+class ReservationView(generics.GenericAPIView):
+    permission_classes = [IsAuthenticated]
+    serializer_class = ReservationSerializer
+    # One conditional UPDATE per reserved product, see ProductQuerySet.reserve
+    query_repeat_threshold = None
+
+    def post(self, request):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        quantities = serializer.get_quantities()
+        product_id = Product.objects.reserve(quantities)
+
+        if product_id is not None:
+            return Response(
+                {"detail": "Insufficient stock.", "product_id": product_id},
+                status=status.HTTP_409_CONFLICT,
+            )
+
+        # QuerySet.update does not send post_save, see products.signals
+        for product_id in quantities:
+            cache.invalidate(ProductView.cache_namespace, product_id)
+
+        with timed_serialization(request):
+            data = serializer.data
+        return Response(data)
+
+
+class ExportUnavailable(APIException):
+    status_code = status.HTTP_501_NOT_IMPLEMENTED
+    default_detail = (
+        "The catalog export is not served by the ASGI application, use the "
+        "WSGI one or the export_catalog command."
+    )
+    default_code = "export_unavailable"
+
+
+class ProductExportView(generics.GenericAPIView):
+    """
+    Streams the whole catalog, filtered like the product list, as NDJSON or
+    CSV (`?export_format=csv`), gzipped when the client accepts it.
+
+    Not available under ASGI, where Django iterates streaming bodies in the
+    event loop and the server-side cursor would raise
+    `SynchronousOnlyOperation`.
+    """
+
+    queryset = Product.objects.all()
+    filter_backends = [QueryParamFilterBackend]
+    filter_fields = PRODUCT_FILTER_FIELDS
+    export_format_param = "export_format"
+
+    def perform_content_negotiation(self, request, force=False):
+        # The body is never rendered, so accept clients asking for text/csv
+        return super().perform_content_negotiation(request, force=True)
+
+    def get(self, request):
+        if isinstance(request._request, ASGIRequest):
+            raise ExportUnavailable()
+
+        export_format = request.query_params.get(self.export_format_param, "ndjson")
+        if export_format not in FORMATS:
+            raise ValidationError(
+                {
+                    self.export_format_param: [
+                        f'"{export_format}" is not a valid choice.'
+                    ]
+                }
+            )
+
+        rows = export_rows(self.filter_queryset(self.get_queryset()))
+        compress = bool(
+            re_accepts_gzip.search(request.META.get("HTTP_ACCEPT_ENCODING", ""))
+        )
+
+        response = StreamingHttpResponse(
+            export_chunks(rows, export_format, compress),
+            content_type=FORMATS[export_format],
+        )
+        response[
+            "Content-Disposition"
+        ] = f'attachment; filename="products.{export_format}"'
+        if compress:
+            response["Content-Encoding"] = "gzip"
+        patch_vary_headers(response, ("Accept-Encoding",))
+
+        return response
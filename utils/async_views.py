@@ -0,0 +1,123 @@
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from rest_framework import mixins
+from rest_framework.authentication import get_authorization_header
+from rest_framework.response import Response
+from utils.middleware import timed_serialization
+
+
+class AsyncReadMixin:
+    """
+    Serves GET and HEAD of a generic list or retrieve view from a coroutine
+    when routed through `as_async_view()`, leaving other methods to the
+    regular synchronous view.
+
+    Only the database round-trips (pagination, object lookup, token lookup on
+    a cache miss) leave the event loop, through `sync_to_async`; filtering,
+    serialization and cached responses run on the loop. Mixins wrapping
+    `list` / `retrieve` provide `alist` / `aretrieve` counterparts, so list
+    this mixin right before the generic view class.
+
+    Both variants time the serializers with `timed_serialization`.
+    """
+
+    @classmethod
+    def as_async_view(cls, **initkwargs):
+        sync_view = sync_to_async(cls.as_view(**initkwargs))
+
+        async def view(request, *args, **kwargs):
+            if request.method not in ("GET", "HEAD"):
+                return await sync_view(request, *args, **kwargs)
+
+            self = cls(**initkwargs)
+            self.setup(request, *args, **kwargs)
+            return await self.adispatch(request, *args, **kwargs)
+
+        view.cls = cls
+        view.initkwargs = initkwargs
+        view.view_class = cls
+        view.view_initkwargs = initkwargs
+        view.csrf_exempt = True
+
+        return view
+
+    async def adispatch(self, request, *args, **kwargs):
+        self.args = args
+        self.kwargs = kwargs
+        request = self.initialize_request(request, *args, **kwargs)
+        self.request = request
+        self.headers = self.default_response_headers
+
+        try:
+            await self.ainitial(request, *args, **kwargs)
+
+            if isinstance(self, mixins.RetrieveModelMixin):
+                handler = self.aretrieve
+            else:
+                handler = self.alist
+            response = await handler(request, *args, **kwargs)
+        except Exception as exc:
+            response = self.handle_exception(exc)
+
+        self.response = self.finalize_response(request, response, *args, **kwargs)
+        return self.response
+
+    async def ainitial(self, request, *args, **kwargs):
+        self.format_kwarg = self.get_format_suffix(**kwargs)
+
+        neg = self.perform_content_negotiation(request)
+        request.accepted_renderer, request.accepted_media_type = neg
+
+        version, scheme = self.determine_version(request, *args, **kwargs)
+        request.version, request.versioning_scheme = version, scheme
+
+        # Anonymous requests never touch the database to authenticate
+        if get_authorization_header(request):
+            await sync_to_async(self.perform_authentication)(request)
+        else:
+            self.perform_authentication(request)
+
+        self.check_permissions(request)
+        self.check_throttles(request)
+
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(self.serialize(page, many=True))
+
+        return Response(self.serialize(queryset, many=True))
+
+    def retrieve(self, request, *args, **kwargs):
+        return Response(self.serialize(self.get_object()))
+
+    async def alist(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+
+        page = await sync_to_async(self.paginate_queryset)(queryset)
+        if page is not None:
+            return self.get_paginated_response(self.serialize(page, many=True))
+
+        rows = await sync_to_async(list)(queryset)
+        return Response(self.serialize(rows, many=True))
+
+    async def aretrieve(self, request, *args, **kwargs):
+        instance = await sync_to_async(self.get_object)()
+        return Response(self.serialize(instance))
+
+    def serialize(self, instance, **kwargs):
+        serializer = self.get_serializer(instance, **kwargs)
+        with timed_serialization(self.request):
+            return serializer.data
+
+
+def read_view(view_class, **initkwargs):
+    """
+    URL entry for views mixing in `AsyncReadMixin`: the async variant when
+    `ASYNC_READ_VIEWS` is on (as set by `komercio.asgi`), else `as_view()`.
+    """
+    if settings.ASYNC_READ_VIEWS:
+        return view_class.as_async_view(**initkwargs)
+
+    return view_class.as_view(**initkwargs)
@@ -0,0 +1,67 @@
+import hashlib
+import json
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from django.utils.http import urlencode
+from rest_framework.utils.encoders import JSONEncoder
+
+
+def response_cache():
+    return caches[settings.RESPONSE_CACHE_ALIAS]
+
+
+def version_key(namespace, pk=None):
+    scope = "list" if pk is None else f"detail:{pk}"
+    return f"response:{namespace}:{scope}:version"
+
+
+def get_version(namespace, pk=None):
+    """
+    Version of a cached scope, which is also the timestamp of the last write
+    to it. Scopes never written since the cache started count as written now.
+    """
+    key = version_key(namespace, pk)
+    cache = response_cache()
+
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, time.time(), None)
+        version = cache.get(key, time.time())
+
+    return version
+
+
+def invalidate(namespace, pk=None):
+    """
+    Bumps the list scope of `namespace` and, when given, the detail scope of
+    `pk`. The bump is repeated on commit so a read racing the transaction
+    cannot cache the pre-commit state under the new version.
+    """
+
+    def bump():
+        cache = response_cache()
+        now = time.time()
+
+        cache.set(version_key(namespace), now, None)
+        if pk is not None:
+            cache.set(version_key(namespace, pk), now, None)
+
+    bump()
+    transaction.on_commit(bump)
+
+
+def response_key(namespace, pk, version, request):
+    query = urlencode(sorted(request.query_params.lists()), doseq=True)
+    url = f"{request.scheme}://{request.get_host()}{request.path}?{query}"
+    digest = hashlib.md5(url.encode()).hexdigest()
+
+    scope = "list" if pk is None else f"detail:{pk}"
+    return f"response:{namespace}:{scope}:{version}:{digest}"
+
+
+def content_etag(data):
+    content = json.dumps(data, cls=JSONEncoder, ensure_ascii=False)
+    return '"%s"' % hashlib.md5(content.encode()).hexdigest()
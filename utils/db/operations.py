@@ -0,0 +1,86 @@
+from django.contrib.postgres import operations
+from django.db.migrations import AddIndex, RemoveIndex
+
+
+class AddIndexConcurrently(operations.AddIndexConcurrently):
+    """
+    `CREATE INDEX CONCURRENTLY` on PostgreSQL, so the table keeps taking
+    writes while the index is built, and a plain `AddIndex` on the other
+    databases, like the SQLite of the tests. Needs `atomic = False` on the
+    migration.
+    """
+
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor == "postgresql":
+            super().database_forwards(app_label, schema_editor, from_state, to_state)
+        else:
+            AddIndex.database_forwards(
+                self, app_label, schema_editor, from_state, to_state
+            )
+
+    def database_backwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor == "postgresql":
+            super().database_backwards(app_label, schema_editor, from_state, to_state)
+        else:
+            AddIndex.database_backwards(
+                self, app_label, schema_editor, from_state, to_state
+            )
+
+
+class RemoveIndexConcurrently(operations.RemoveIndexConcurrently):
+    """
+    `DROP INDEX CONCURRENTLY` on PostgreSQL and a plain `RemoveIndex` on the
+    other databases. Needs `atomic = False` on the migration.
+    """
+
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor == "postgresql":
+            super().database_forwards(app_label, schema_editor, from_state, to_state)
+        else:
+            RemoveIndex.database_forwards(
+                self, app_label, schema_editor, from_state, to_state
+            )
+
+    def database_backwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor == "postgresql":
+            super().database_backwards(app_label, schema_editor, from_state, to_state)
+        else:
+            RemoveIndex.database_backwards(
+                self, app_label, schema_editor, from_state, to_state
+            )
+
+
+def drop_field_index_concurrently(app_label, model_name, field_name):
+    """
+    `RunPython` pair dropping, and recreating on the way back, the index
+    `db_index` gave a field, concurrently on PostgreSQL. Pair it with the
+    `AlterField` to `db_index=False` in `SeparateDatabaseAndState`.
+    """
+
+    def forwards(apps, schema_editor):
+        model = apps.get_model(app_label, model_name)
+        field = model._meta.get_field(field_name)
+        # The name Django gives the index of a db_index field
+        name = schema_editor._create_index_name(
+            model._meta.db_table, [field.column], suffix=""
+        )
+        concurrently = schema_editor.connection.vendor == "postgresql"
+
+        schema_editor.execute(
+            "DROP INDEX %sIF EXISTS %s"
+            % ("CONCURRENTLY " if concurrently else "", schema_editor.quote_name(name))
+        )
+
+    def backwards(apps, schema_editor):
+        model = apps.get_model(app_label, model_name)
+        field = model._meta.get_field(field_name)
+
+        if schema_editor.connection.vendor == "postgresql":
+            sql = schema_editor._create_index_sql(
+                model, fields=[field], concurrently=True
+            )
+        else:
+            sql = schema_editor._create_index_sql(model, fields=[field])
+        schema_editor.execute(sql)
+
+    return forwards, backwards
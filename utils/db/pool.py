@@ -0,0 +1,236 @@
+import logging
+import os
+import threading
+import time
+from collections import deque
+
+from psycopg2 import Error, OperationalError
+from psycopg2.extensions import TRANSACTION_STATUS_IDLE, TRANSACTION_STATUS_UNKNOWN
+
+logger = logging.getLogger("utils.db")
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+class PoolStats:
+    """
+    Counters of one pool. Waits are the time spent before a connection was
+    handed out, including opening a new one.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.checkouts = 0
+        self.connects = 0
+        self.discarded = 0
+        self.timeouts = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+
+    def record_checkout(self, wait, connected):
+        with self.lock:
+            self.checkouts += 1
+            self.connects += connected
+            self.wait_total += wait
+            self.wait_max = max(self.wait_max, wait)
+
+    def record_discard(self):
+        with self.lock:
+            self.discarded += 1
+
+    def record_timeout(self):
+        with self.lock:
+            self.timeouts += 1
+
+    def snapshot(self):
+        with self.lock:
+            return {
+                "checkouts": self.checkouts,
+                "connects": self.connects,
+                "discarded": self.discarded,
+                "timeouts": self.timeouts,
+                "wait_total": self.wait_total,
+                "wait_max": self.wait_max,
+                "wait_avg": self.wait_total / self.checkouts if self.checkouts else 0.0,
+            }
+
+
+class ConnectionPool:
+    """
+    Per-process pool of at most `size` psycopg2 connections.
+
+    Checkouts block up to `timeout` seconds for a free slot. Idle connections
+    are reused most recent first and pinged before reuse when they sat idle
+    longer than `check_interval` seconds.
+    """
+
+    def __init__(self, size, timeout, check_interval):
+        self.size = size
+        self.timeout = timeout
+        self.check_interval = check_interval
+        self.slots = threading.BoundedSemaphore(size)
+        self.idle = deque()
+        self.in_use = 0
+        self.lock = threading.Lock()
+        self.stats = PoolStats()
+
+    def acquire(self, connect):
+        started = time.perf_counter()
+
+        if not self.slots.acquire(timeout=self.timeout):
+            self.stats.record_timeout()
+            logger.warning(
+                "Timed out after %.2fs waiting for one of %d pooled connections",
+                self.timeout,
+                self.size,
+            )
+            raise OperationalError("timed out waiting for a pooled connection")
+
+        try:
+            connection = self.take_idle()
+            connected = connection is None
+            if connected:
+                connection = connect()
+        except BaseException:
+            self.slots.release()
+            raise
+
+        with self.lock:
+            self.in_use += 1
+
+        wait = time.perf_counter() - started
+        self.stats.record_checkout(wait, connected)
+        logger.debug("Pooled connection checked out in %.2fms", wait * 1000)
+
+        return connection, wait
+
+    def release(self, connection):
+        try:
+            discard = connection.closed
+            if not discard:
+                status = connection.info.transaction_status
+                if status == TRANSACTION_STATUS_UNKNOWN:
+                    discard = True
+                elif status != TRANSACTION_STATUS_IDLE:
+                    connection.rollback()
+        except Error:
+            discard = True
+
+        try:
+            if discard:
+                self.discard(connection)
+            else:
+                with self.lock:
+                    self.idle.append((connection, time.monotonic()))
+        finally:
+            with self.lock:
+                self.in_use -= 1
+            self.slots.release()
+
+    def take_idle(self):
+        while True:
+            with self.lock:
+                if not self.idle:
+                    return None
+                connection, released_at = self.idle.pop()
+
+            if self.is_healthy(connection, released_at):
+                return connection
+
+            self.discard(connection)
+
+    def is_healthy(self, connection, released_at):
+        if connection.closed:
+            return False
+
+        if time.monotonic() - released_at < self.check_interval:
+            return True
+
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT 1")
+            if connection.info.transaction_status != TRANSACTION_STATUS_IDLE:
+                connection.rollback()
+        except Error:
+            return False
+
+        return True
+
+    def close_idle(self):
+        with self.lock:
+            idle, self.idle = self.idle, deque()
+
+        for connection, _ in idle:
+            self.discard(connection)
+
+    def snapshot(self):
+        with self.lock:
+            state = {"size": self.size, "in_use": self.in_use, "idle": len(self.idle)}
+
+        return {**self.stats.snapshot(), **state}
+
+    def discard(self, connection):
+        self.stats.record_discard()
+        try:
+            connection.close()
+        except Error:
+            pass
+
+
+def get_pool(alias, key, options):
+    """
+    Returns the pool of this process for the connection `alias`, `key`
+    telling apart different connection parameters of the same alias.
+    """
+    pool_key = (os.getpid(), alias, key)
+
+    with _pools_lock:
+        pool = _pools.get(pool_key)
+        if pool is None:
+            pool = _pools[pool_key] = ConnectionPool(
+                size=options.get("SIZE", 4),
+                timeout=options.get("TIMEOUT", 5),
+                check_interval=options.get("CHECK_INTERVAL", 30),
+            )
+
+    return pool
+
+
+def close_idle(alias):
+    pid = os.getpid()
+    with _pools_lock:
+        pools = [pool for (p, a, _), pool in _pools.items() if (p, a) == (pid, alias)]
+
+    for pool in pools:
+        pool.close_idle()
+
+
+def pool_stats():
+    """
+    Counters and connections of the pools of this process by connection
+    alias, summing the pools of different parameters of the same alias.
+    """
+    pid = os.getpid()
+    with _pools_lock:
+        pools = [(alias, pool) for (p, alias, _), pool in _pools.items() if p == pid]
+
+    stats = {}
+    for alias, pool in pools:
+        snapshot = pool.snapshot()
+        total = stats.get(alias)
+        if total is None:
+            stats[alias] = snapshot
+            continue
+
+        for name, value in snapshot.items():
+            if name == "wait_max":
+                total[name] = max(total[name], value)
+            else:
+                total[name] += value
+
+    for total in stats.values():
+        checkouts = total["checkouts"]
+        total["wait_avg"] = total["wait_total"] / checkouts if checkouts else 0.0
+
+    return stats
@@ -0,0 +1,77 @@
+"""
+PostgreSQL backend with an optional per-process connection pool and
+health checks of persistent connections.
+
+Extra keys of the database settings:
+
+- `POOL`: `{"SIZE", "TIMEOUT", "CHECK_INTERVAL"}`. Connections are checked
+  out of a pool on connect and returned to it on close, so use it with
+  `CONN_MAX_AGE = 0`.
+- `CONN_HEALTH_CHECKS`: ping a persistent connection before its first use
+  in each request and reconnect if the server dropped it.
+"""
+from django.db.backends.postgresql import base, creation
+from django.utils.asyncio import async_unsafe
+from utils.db.pool import close_idle, get_pool
+
+
+class DatabaseCreation(creation.DatabaseCreation):
+    def _destroy_test_db(self, test_database_name, verbosity):
+        # Idle pooled connections would keep the database from being dropped
+        close_idle(self.connection.alias)
+        super()._destroy_test_db(test_database_name, verbosity)
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    creation_class = DatabaseCreation
+
+    # Seconds the current connection took to come out of the pool
+    pool_wait = 0.0
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.pool = None
+        self.health_check_done = False
+
+    def get_new_connection(self, conn_params):
+        options = self.settings_dict.get("POOL")
+        if not options:
+            return super().get_new_connection(conn_params)
+
+        self.pool = get_pool(self.alias, repr(sorted(conn_params.items())), options)
+        connection, self.pool_wait = self.pool.acquire(
+            lambda: super(DatabaseWrapper, self).get_new_connection(conn_params)
+        )
+        self.isolation_level = connection.isolation_level
+
+        return connection
+
+    def _close(self):
+        if self.pool is None or self.connection is None:
+            return super()._close()
+
+        with self.wrap_database_errors:
+            self.pool.release(self.connection)
+
+    @async_unsafe
+    def connect(self):
+        super().connect()
+        self.health_check_done = True
+
+    @async_unsafe
+    def ensure_connection(self):
+        if (
+            self.connection is not None
+            and not self.health_check_done
+            and self.settings_dict.get("CONN_HEALTH_CHECKS")
+            and not self.in_atomic_block
+        ):
+            self.health_check_done = True
+            if not self.is_usable():
+                self.close()
+
+        super().ensure_connection()
+
+    def close_if_unusable_or_obsolete(self):
+        super().close_if_unusable_or_obsolete()
+        self.health_check_done = False
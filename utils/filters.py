@@ -0,0 +1,65 @@
+from django.db.models import Q
+from rest_framework.exceptions import ValidationError
+from rest_framework.filters import BaseFilterBackend, OrderingFilter
+
+
+class QueryParamFilter:
+    """
+    A single `?param=value` filter: `field` is a serializer field used to
+    parse the raw value, `lookup` either a queryset lookup or a callable that
+    turns the parsed value into a `Q` object.
+    """
+
+    def __init__(self, field, lookup):
+        self.field = field
+        self.lookup = lookup
+
+    def to_q(self, value):
+        if callable(self.lookup):
+            return self.lookup(value)
+
+        return Q(**{self.lookup: value})
+
+
+class QueryParamFilterBackend(BaseFilterBackend):
+    """
+    Applies the `filter_fields` mapping of `param -> QueryParamFilter`
+    declared on the view. Invalid values raise a 400 keyed by parameter.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        filter_fields = getattr(view, "filter_fields", {})
+        condition = Q()
+        errors = {}
+
+        for param, query_filter in filter_fields.items():
+            if param not in request.query_params:
+                continue
+
+            try:
+                value = query_filter.field.run_validation(request.query_params[param])
+            except ValidationError as exc:
+                errors[param] = exc.detail
+                continue
+
+            condition &= query_filter.to_q(value)
+
+        if errors:
+            raise ValidationError(errors)
+
+        return queryset.filter(condition)
+
+
+class StableOrderingFilter(OrderingFilter):
+    """
+    `OrderingFilter` that breaks ties on the primary key so paginated results
+    stay deterministic when ordering on non unique columns.
+    """
+
+    def get_ordering(self, request, queryset, view):
+        ordering = super().get_ordering(request, queryset, view)
+
+        if ordering and not {"pk", "-pk", "id", "-id"} & set(ordering):
+            ordering = [*ordering, "id"]
+
+        return ordering
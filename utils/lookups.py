@@ -0,0 +1,22 @@
+from django.db.models import lookups
+
+
+class ILikeContains(lookups.IContains):
+    """
+    `icontains` compiled to `column ILIKE %s` on PostgreSQL, a condition a
+    `gin_trgm_ops` index on the plain column can serve, unlike the
+    `UPPER(column::text) LIKE UPPER(%s)` of `icontains`. Other databases get
+    `icontains`.
+
+        queryset.filter(ILikeContains(F("description"), terms))
+    """
+
+    lookup_name = "ilike_contains"
+
+    def as_sql(self, compiler, connection):
+        return lookups.IContains(self.lhs, self.rhs).as_sql(compiler, connection)
+
+    def as_postgresql(self, compiler, connection):
+        lhs_sql, lhs_params = self.process_lhs(compiler, connection)
+        rhs_sql, rhs_params = self.process_rhs(compiler, connection)
+        return f"{lhs_sql} ILIKE {rhs_sql}", (*lhs_params, *rhs_params)
@@ -0,0 +1,202 @@
+import hmac
+import os
+import threading
+from bisect import bisect_left
+
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseForbidden
+from utils.db.pool import pool_stats
+
+TIME_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+COUNT_BUCKETS = (1, 2, 3, 5, 8, 13, 21, 34, 55, 100)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+
+class Histogram:
+    """
+    Prometheus histogram keyed by label values, kept in process memory.
+    Every worker process exposes its own series, told apart by a `worker`
+    label holding its pid.
+    """
+
+    def __init__(self, name, documentation, labels, buckets=TIME_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labels = labels
+        self.buckets = buckets
+        self.series = {}
+        self.lock = threading.Lock()
+
+    def observe(self, label_values, value):
+        index = bisect_left(self.buckets, value)
+
+        with self.lock:
+            series = self.series.get(label_values)
+            if series is None:
+                series = self.series[label_values] = [
+                    [0] * (len(self.buckets) + 1),
+                    0,
+                ]
+            series[0][index] += 1
+            series[1] += value
+
+    def render(self):
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} histogram",
+        ]
+
+        with self.lock:
+            series = [
+                (key, list(counts), total)
+                for key, (counts, total) in self.series.items()
+            ]
+
+        worker = os.getpid()
+        for label_values, counts, total in sorted(series):
+            labels = ",".join(
+                f'{name}="{escape(value)}"'
+                for name, value in zip(
+                    (*self.labels, "worker"), (*label_values, worker)
+                )
+            )
+            cumulative = 0
+            for bound, count in zip((*self.buckets, "+Inf"), counts):
+                cumulative += count
+                lines.append(
+                    f'{self.name}_bucket{{{labels},le="{bound}"}} {cumulative}'
+                )
+            lines.append(f"{self.name}_sum{{{labels}}} {total}")
+            lines.append(f"{self.name}_count{{{labels}}} {cumulative}")
+
+        return "\n".join(lines)
+
+
+def render_gauges(name, documentation, values):
+    """
+    Prometheus gauge with one series per `(labels, value)` of `values`,
+    `labels` a dict of label names to values.
+    """
+    lines = [f"# HELP {name} {documentation}", f"# TYPE {name} gauge"]
+
+    for labels, value in values:
+        labels = ",".join(f'{key}="{escape(label)}"' for key, label in labels.items())
+        lines.append(f"{name}{{{labels}}} {value}")
+
+    return "\n".join(lines)
+
+
+def escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+REQUEST_LABELS = ("route", "method")
+
+request_duration = Histogram(
+    "http_request_duration_seconds",
+    "Wall time of sampled requests.",
+    REQUEST_LABELS + ("status",),
+)
+db_duration = Histogram(
+    "http_request_db_duration_seconds",
+    "Time spent in database queries per sampled request.",
+    REQUEST_LABELS,
+)
+db_queries = Histogram(
+    "http_request_db_queries",
+    "Database queries per sampled request.",
+    REQUEST_LABELS,
+    buckets=COUNT_BUCKETS,
+)
+serialize_duration = Histogram(
+    "http_request_serialize_duration_seconds",
+    "Time spent serializing response data per sampled request, its queries "
+    "excluded.",
+    REQUEST_LABELS,
+)
+app_duration = Histogram(
+    "http_request_app_duration_seconds",
+    "Time spent in Python outside of the database, serialization and "
+    "rendering per sampled request.",
+    REQUEST_LABELS,
+)
+render_duration = Histogram(
+    "http_request_render_duration_seconds",
+    "Time spent rendering the response body per sampled request.",
+    REQUEST_LABELS,
+)
+response_size = Histogram(
+    "http_response_size_bytes",
+    "Body size of sampled responses, streaming responses excluded.",
+    REQUEST_LABELS,
+    buckets=SIZE_BUCKETS,
+)
+
+db_pool_wait = Histogram(
+    "http_request_db_pool_wait_seconds",
+    "Time spent waiting for pooled database connections per sampled request.",
+    REQUEST_LABELS,
+)
+
+HISTOGRAMS = [
+    request_duration,
+    db_duration,
+    db_queries,
+    db_pool_wait,
+    serialize_duration,
+    app_duration,
+    render_duration,
+    response_size,
+]
+
+# Stats of utils.db.pool by gauge name
+POOL_GAUGES = [
+    ("db_pool_size", "size", "Connections the pool may open."),
+    ("db_pool_in_use", "in_use", "Connections checked out of the pool."),
+    ("db_pool_idle", "idle", "Idle connections kept by the pool."),
+    ("db_pool_checkouts", "checkouts", "Connections handed out by the pool."),
+    ("db_pool_connects", "connects", "Connections the pool opened."),
+    ("db_pool_discarded", "discarded", "Broken or stale connections closed."),
+    ("db_pool_timeouts", "timeouts", "Checkouts that gave up waiting."),
+    ("db_pool_wait_seconds", "wait_total", "Total wait for a connection."),
+    ("db_pool_wait_avg_seconds", "wait_avg", "Mean wait for a connection."),
+    ("db_pool_wait_max_seconds", "wait_max", "Longest wait for a connection."),
+]
+
+
+def render_pool_gauges():
+    stats = sorted(pool_stats().items())
+    if not stats:
+        return []
+
+    return [
+        render_gauges(
+            name,
+            documentation,
+            [
+                ({"alias": alias, "worker": os.getpid()}, values[key])
+                for alias, values in stats
+            ],
+        )
+        for name, key, documentation in POOL_GAUGES
+    ]
+
+
+def metrics_view(request):
+    """
+    Prometheus text exposition of the metrics of this process, gauges of the
+    `utils.db.pool` pools included, served to requests sending
+    `Authorization: Bearer <METRICS_TOKEN>`. Without a token it is only open
+    with `DEBUG` on.
+    """
+    token = settings.METRICS_TOKEN
+    if token:
+        expected = f"Bearer {token}"
+        if not hmac.compare_digest(request.headers.get("Authorization", ""), expected):
+            return HttpResponseForbidden()
+    elif not settings.DEBUG:
+        return HttpResponseForbidden()
+
+    body = [histogram.render() for histogram in HISTOGRAMS] + render_pool_gauges()
+    body = "\n".join(body) + "\n"
+    return HttpResponse(body, content_type="text/plain; version=0.0.4; charset=utf-8")
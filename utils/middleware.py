@@ -0,0 +1,549 @@
+import asyncio
+import hashlib
+import logging
+import random
+import time
+import zlib
+from contextlib import contextmanager
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache, caches
+from django.utils.cache import patch_vary_headers
+from rest_framework.authentication import get_authorization_header
+
+from utils import metrics
+from utils.queries import QueryInspector, QueryProblemsError, instrument
+from utils.routers import use_primary
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover
+    brotli = None
+
+logger = logging.getLogger("utils.queries")
+
+
+def sampled(rate):
+    return rate >= 1 or (rate > 0 and random.random() < rate)
+
+
+class AsyncCapableMiddleware:
+    """
+    Base of the middleware that run natively under WSGI and ASGI: `__call__`
+    runs `call`, or returns the coroutine of `acall` when the rest of the
+    chain is async, instead of Django adapting a sync middleware with a
+    thread switch per request.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.is_async = asyncio.iscoroutinefunction(get_response)
+        if self.is_async:
+            # The marker of Django's MiddlewareMixin, Django 4.0 has no
+            # markcoroutinefunction
+            self._is_coroutine = asyncio.coroutines._is_coroutine
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.acall(request)
+        return self.call(request)
+
+    def call(self, request):
+        raise NotImplementedError
+
+    async def acall(self, request):
+        raise NotImplementedError
+
+
+class RequestTimings:
+    """
+    Database and render timings of one request, fed by `instrument`, which
+    also sees the queries async views run in `sync_to_async` threads, and
+    the post-render callback of template responses. `pool_wait` adds up the
+    waits for the pooled connections of `utils.db.postgresql` opened, and
+    `serialize` the blocks run in `timed_serialization`.
+    """
+
+    def __init__(self):
+        self.queries = 0
+        self.db = 0.0
+        self.pool_wait = 0.0
+        self.serialize = 0.0
+        self.render = 0.0
+        self.render_started = None
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.db += time.perf_counter() - started
+            self.queries += 1
+
+    def connected(self, connection):
+        self.pool_wait += getattr(connection, "pool_wait", 0.0)
+
+    def start_render(self):
+        self.render_started = time.perf_counter()
+
+    def end_render(self, response):
+        if self.render_started is not None:
+            self.render += time.perf_counter() - self.render_started
+            self.render_started = None
+
+
+@contextmanager
+def timed_serialization(request):
+    """
+    Counts the block as serialization of `request` when `MetricsMiddleware`
+    samples it, less the queries it runs, which count as database time.
+    """
+    timings = getattr(request, "_timings", None)
+    if timings is None:
+        yield
+        return
+
+    started = time.perf_counter()
+    db = timings.db
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - started
+        timings.serialize += max(elapsed - (timings.db - db), 0.0)
+
+
+class MetricsMiddleware(AsyncCapableMiddleware):
+    """
+    Records wall time, database queries and time, pooled connection waits,
+    serialization and render time and response size of a
+    `METRICS_SAMPLE_RATE` fraction of the requests per URL pattern, exposed
+    by `utils.metrics.metrics_view`, and describes them to the client in a
+    `Server-Timing` header.
+
+    Serialization is what the views run in `timed_serialization`, and the
+    app phase whatever remains of the wall time. Should be the first
+    middleware so the other ones are measured too.
+    """
+
+    def __init__(self, get_response):
+        super().__init__(get_response)
+        if self.is_async:
+            # Django would run a sync hook through sync_to_async
+            self.process_template_response = self.aprocess_template_response
+
+    def call(self, request):
+        if not sampled(settings.METRICS_SAMPLE_RATE):
+            return self.get_response(request)
+
+        timings = request._timings = RequestTimings()
+        started = time.perf_counter()
+
+        with instrument(timings):
+            response = self.get_response(request)
+
+        return self.record(request, response, timings, started)
+
+    async def acall(self, request):
+        if not sampled(settings.METRICS_SAMPLE_RATE):
+            return await self.get_response(request)
+
+        timings = request._timings = RequestTimings()
+        started = time.perf_counter()
+
+        with instrument(timings):
+            response = await self.get_response(request)
+
+        return self.record(request, response, timings, started)
+
+    def record(self, request, response, timings, started):
+        total = time.perf_counter() - started
+        measured = timings.db + timings.pool_wait + timings.serialize + timings.render
+        app = max(total - measured, 0.0)
+
+        match = getattr(request, "resolver_match", None)
+        labels = (match.route if match else "unmatched", request.method)
+
+        metrics.request_duration.observe((*labels, str(response.status_code)), total)
+        metrics.db_duration.observe(labels, timings.db)
+        metrics.db_queries.observe(labels, timings.queries)
+        metrics.db_pool_wait.observe(labels, timings.pool_wait)
+        metrics.serialize_duration.observe(labels, timings.serialize)
+        metrics.app_duration.observe(labels, app)
+        metrics.render_duration.observe(labels, timings.render)
+        if not response.streaming:
+            metrics.response_size.observe(labels, len(response.content))
+
+        response["Server-Timing"] = ", ".join(
+            [
+                f'db;dur={timings.db * 1000:.2f};desc="{timings.queries} queries"',
+                f"serialize;dur={timings.serialize * 1000:.2f}",
+                f"app;dur={app * 1000:.2f}",
+                f"render;dur={timings.render * 1000:.2f}",
+                f"total;dur={total * 1000:.2f}",
+            ]
+        )
+
+        return response
+
+    def process_template_response(self, request, response):
+        return self.track_render(request, response)
+
+    async def aprocess_template_response(self, request, response):
+        return self.track_render(request, response)
+
+    def track_render(self, request, response):
+        # Being the first middleware, this runs right before the render
+        timings = getattr(request, "_timings", None)
+        if timings is not None:
+            timings.start_render()
+            response.add_post_render_callback(timings.end_render)
+
+        return response
+
+
+class ReplicaPinningMiddleware(AsyncCapableMiddleware):
+    """
+    Serves unsafe methods entirely from the primary database and keeps the
+    reads of the same credentials on the primary for `REPLICA_PIN_SECONDS`
+    after a successful write, so users read their own writes.
+
+    Needs `utils.routers.ReplicaRouter` in `DATABASE_ROUTERS`.
+    """
+
+    safe_methods = ("GET", "HEAD", "OPTIONS")
+    key_prefix = "replica-pin:"
+
+    def call(self, request):
+        if not settings.DATABASE_REPLICAS:
+            return self.get_response(request)
+
+        key = self.pin_key(request)
+
+        if request.method in self.safe_methods:
+            if key is None or cache.get(key) is None:
+                return self.get_response(request)
+
+            with use_primary():
+                return self.get_response(request)
+
+        with use_primary():
+            response = self.get_response(request)
+
+        self.pin(request, response, key)
+        return response
+
+    async def acall(self, request):
+        if not settings.DATABASE_REPLICAS:
+            return await self.get_response(request)
+
+        key = self.pin_key(request)
+
+        if request.method in self.safe_methods:
+            if key is None or await cache.aget(key) is None:
+                return await self.get_response(request)
+
+            with use_primary():
+                return await self.get_response(request)
+
+        with use_primary():
+            response = await self.get_response(request)
+
+        # The user of a non DRF view may be lazy and query the database
+        await sync_to_async(self.pin)(request, response, key)
+        return response
+
+    def pin(self, request, response, key):
+        # DRF sets the user it authenticated on the underlying request
+        user = getattr(request, "user", None)
+        if (
+            key is not None
+            and response.status_code < 400
+            and user is not None
+            and user.is_authenticated
+        ):
+            cache.set(key, user.pk, settings.REPLICA_PIN_SECONDS)
+
+    def pin_key(self, request):
+        authorization = get_authorization_header(request)
+        if not authorization:
+            return None
+
+        return self.key_prefix + hashlib.md5(authorization).hexdigest()
+
+
+class QueryInspectionMiddleware(AsyncCapableMiddleware):
+    """
+    Logs, with the view name, the query shapes a request repeated at least
+    `QUERY_REPEAT_THRESHOLD` times (N+1) and the queries slower than
+    `QUERY_SLOW_MS`.
+
+    `QUERY_INSPECTION` is "off", "sample" to inspect a
+    `QUERY_INSPECTION_SAMPLE_RATE` fraction of the requests, or "strict" to
+    inspect all of them and raise `QueryProblemsError` on repeats, which the
+    test runner enables. Slow queries are only logged, their duration depends
+    on the machine.
+
+    Views repeating a query on purpose set `query_repeat_threshold`, `None`
+    to skip the check.
+    """
+
+    def call(self, request):
+        if not self.inspects():
+            return self.get_response(request)
+
+        with instrument(QueryInspector()) as inspector:
+            response = self.get_response(request)
+
+        self.report(request, inspector)
+        return response
+
+    async def acall(self, request):
+        if not self.inspects():
+            return await self.get_response(request)
+
+        with instrument(QueryInspector()) as inspector:
+            response = await self.get_response(request)
+
+        self.report(request, inspector)
+        return response
+
+    def inspects(self):
+        mode = settings.QUERY_INSPECTION
+        return mode == "strict" or (
+            mode == "sample" and sampled(settings.QUERY_INSPECTION_SAMPLE_RATE)
+        )
+
+    def report(self, request, inspector):
+        match = getattr(request, "resolver_match", None)
+        view = match.view_name if match else request.path
+        view_class = getattr(match.func, "view_class", None) if match else None
+        threshold = getattr(
+            view_class, "query_repeat_threshold", settings.QUERY_REPEAT_THRESHOLD
+        )
+
+        repeated = inspector.repeated(threshold)
+        for shape, count in repeated:
+            logger.warning("N+1 in %s: %d x %s", view, count, shape)
+
+        for duration, sql in inspector.slow(settings.QUERY_SLOW_MS / 1000):
+            logger.warning("Slow query in %s: %.0fms %s", view, duration * 1000, sql)
+
+        if repeated and settings.QUERY_INSPECTION == "strict":
+            raise QueryProblemsError(
+                f"{request.method} {request.path} ({view}) repeated queries: "
+                + "; ".join(f"{count} x {shape}" for shape, count in repeated)
+            )
+
+
+class GzipCompressor:
+    def __init__(self, level):
+        # wbits 31 writes the gzip header and trailer
+        self.compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+
+    def process(self, data):
+        return self.compressor.compress(data)
+
+    def finish(self):
+        return self.compressor.flush()
+
+
+class BrotliCompressor:
+    def __init__(self, quality):
+        self.compressor = brotli.Compressor(quality=quality)
+
+    def process(self, data):
+        return self.compressor.process(data)
+
+    def finish(self):
+        return self.compressor.finish()
+
+
+class CompressionMiddleware(AsyncCapableMiddleware):
+    """
+    Compresses responses with the first of `COMPRESSION_ALGORITHMS` ("br",
+    available with the brotli package, and "gzip") the client accepts, when
+    the content type is in `COMPRESSION_CONTENT_TYPES` and the body has at
+    least `COMPRESSION_MIN_SIZE` bytes. Streaming responses are compressed
+    as they stream, whatever their size.
+
+    Responses already encoded, like the gzipped catalog export, are left
+    alone. Strong ETags become weak, the compressed bytes differ from the
+    ones they were computed for, which conditional requests still match.
+
+    The compressed body of responses with a strong ETag, like the ones of
+    `utils.mixins.CachedResponseMixin`, is kept in the response cache for
+    `COMPRESSION_CACHE_TIMEOUT` seconds per algorithm, so cache hits are not
+    compressed again. The entry is only reused for a body with the same
+    length and CRC-32.
+
+    Under ASGI the cache is read and written with `aget` / `aset` and the
+    compression runs in a worker thread, off the event loop.
+    """
+
+    compressors = {"gzip": GzipCompressor, "br": BrotliCompressor}
+
+    def call(self, request):
+        response = self.get_response(request)
+
+        algorithm = self.select_algorithm(request, response)
+        if algorithm is None or response.streaming:
+            return self.encode(response, algorithm)
+
+        key = self.cache_key(algorithm, response)
+        if key is None:
+            return self.encode(
+                response, algorithm, self.compress(algorithm, response.content)
+            )
+
+        response_cache = caches[settings.RESPONSE_CACHE_ALIAS]
+        compressed = self.cached_body(response_cache.get(key), response)
+        if compressed is None:
+            compressed = self.compress(algorithm, response.content)
+            response_cache.set(
+                key,
+                (self.checksum(response), compressed),
+                settings.COMPRESSION_CACHE_TIMEOUT,
+            )
+
+        return self.encode(response, algorithm, compressed)
+
+    async def acall(self, request):
+        response = await self.get_response(request)
+
+        algorithm = self.select_algorithm(request, response)
+        if algorithm is None or response.streaming:
+            return self.encode(response, algorithm)
+
+        compress = sync_to_async(self.compress, thread_sensitive=False)
+        key = self.cache_key(algorithm, response)
+        if key is None:
+            return self.encode(
+                response, algorithm, await compress(algorithm, response.content)
+            )
+
+        response_cache = caches[settings.RESPONSE_CACHE_ALIAS]
+        compressed = self.cached_body(await response_cache.aget(key), response)
+        if compressed is None:
+            compressed = await compress(algorithm, response.content)
+            await response_cache.aset(
+                key,
+                (self.checksum(response), compressed),
+                settings.COMPRESSION_CACHE_TIMEOUT,
+            )
+
+        return self.encode(response, algorithm, compressed)
+
+    def select_algorithm(self, request, response):
+        """
+        Returns the algorithm to compress the response with, if any.
+        """
+        if response.has_header("Content-Encoding") or not self.compressible(response):
+            return None
+
+        # Even uncompressed, the representation depends on Accept-Encoding
+        patch_vary_headers(response, ("Accept-Encoding",))
+        minimum = settings.COMPRESSION_MIN_SIZE
+        if not response.streaming and len(response.content) < minimum:
+            return None
+
+        return self.negotiate(request.META.get("HTTP_ACCEPT_ENCODING", ""))
+
+    def encode(self, response, algorithm, compressed=None):
+        """
+        Sets the `compressed` body, or compresses the stream, of a response
+        `select_algorithm` picked `algorithm` for.
+        """
+        if algorithm is None:
+            return response
+
+        if response.streaming:
+            response.streaming_content = self.compress_stream(
+                algorithm, response.streaming_content
+            )
+            del response["Content-Length"]
+        else:
+            if len(compressed) >= len(response.content):
+                return response
+            response.content = compressed
+            response["Content-Length"] = str(len(compressed))
+
+        etag = response.get("ETag")
+        if etag and etag.startswith('"'):
+            response["ETag"] = "W/" + etag
+
+        response["Content-Encoding"] = algorithm
+        return response
+
+    def compressible(self, response):
+        if "no-transform" in response.get("Cache-Control", ""):
+            return False
+
+        content_type = response.get("Content-Type", "").split(";")[0].strip()
+        return content_type.lower() in settings.COMPRESSION_CONTENT_TYPES
+
+    def negotiate(self, accept_encoding):
+        accepted = set()
+        for coding in accept_encoding.lower().split(","):
+            name, _, parameters = coding.partition(";")
+            quality = parameters.strip().removeprefix("q=")
+            try:
+                if parameters and float(quality) <= 0:
+                    continue
+            except ValueError:
+                continue
+            accepted.add(name.strip())
+
+        for algorithm in settings.COMPRESSION_ALGORITHMS:
+            if algorithm not in self.compressors or (
+                algorithm == "br" and brotli is None
+            ):
+                continue
+            if algorithm in accepted or "*" in accepted:
+                return algorithm
+
+        return None
+
+    def get_compressor(self, algorithm):
+        if algorithm == "br":
+            return BrotliCompressor(settings.COMPRESSION_BROTLI_QUALITY)
+        return GzipCompressor(settings.COMPRESSION_GZIP_LEVEL)
+
+    def compress(self, algorithm, content):
+        compressor = self.get_compressor(algorithm)
+        return compressor.process(content) + compressor.finish()
+
+    def cache_key(self, algorithm, response):
+        """
+        Key of the compressed body in the response cache, `None` when it is
+        not cached.
+        """
+        etag = response.get("ETag", "")
+        if not settings.COMPRESSION_CACHE_TIMEOUT or not etag.startswith('"'):
+            return None
+
+        return "compressed:%s:%s" % (
+            algorithm,
+            hashlib.md5(f"{response.get('Content-Type')}|{etag}".encode()).hexdigest(),
+        )
+
+    def checksum(self, response):
+        return (len(response.content), zlib.crc32(response.content))
+
+    def cached_body(self, entry, response):
+        if entry is not None and entry[0] == self.checksum(response):
+            return entry[1]
+        return None
+
+    def compress_stream(self, algorithm, chunks):
+        compressor = self.get_compressor(algorithm)
+
+        for chunk in chunks:
+            data = compressor.process(chunk)
+            if data:
+                yield data
+
+        yield compressor.finish()
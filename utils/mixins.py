@@ -1,3 +1,282 @@
+import hashlib
+from functools import lru_cache
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+from rest_framework import permissions, serializers
+from rest_framework.response import Response
+
+from utils import cache
+from utils.routers import use_primary
+
+
+@lru_cache(maxsize=None)
+def serializer_columns(serializer_class, model):
+    """
+    Columns a read only serializer touches, suitable for `QuerySet.only()`.
+
+    Returns `None` when a field cannot be mapped to a concrete column (method
+    fields, properties, dotted or `*` sources), meaning no restriction.
+    """
+    columns = [model._meta.pk.name]
+
+    for name, field in serializer_class().fields.items():
+        if field.write_only:
+            continue
+
+        if field.source == "*" or "." in field.source:
+            return None
+
+        try:
+            model_field = model._meta.get_field(field.source)
+        except FieldDoesNotExist:
+            return None
+
+        if isinstance(field, serializers.BaseSerializer):
+            if isinstance(field, serializers.ListSerializer) or not (
+                model_field.many_to_one or model_field.one_to_one
+            ):
+                return None
+
+            nested = serializer_columns(type(field), model_field.related_model)
+            if nested is None:
+                return None
+
+            columns += [f"{model_field.name}__{column}" for column in nested]
+            continue
+
+        if not model_field.concrete:
+            return None
+
+        columns.append(model_field.name)
+
+    return tuple(dict.fromkeys(columns))
+
+
 class SerializerByMethodMixin:
+    serializer_map = {}
+    select_related_map = {}
+
     def get_serializer_class(self, *args, **kwargs):
         return self.serializer_map.get(self.request.method, self.serializer_class)
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+
+        related = self.select_related_map.get(self.request.method)
+        if related:
+            queryset = queryset.select_related(*related)
+
+        if self.request.method in permissions.SAFE_METHODS:
+            columns = serializer_columns(self.get_serializer_class(), queryset.model)
+            if columns:
+                queryset = queryset.only(*columns)
+
+        return queryset
+
+
+class CachedResponseMixin:
+    """
+    Caches the data of anonymous `list` and `retrieve` responses under
+    `cache_namespace`, keyed by the normalized URL and the version of the
+    scope. Writes must call `utils.cache.invalidate(namespace, pk)`.
+
+    Responses carry an `ETag` and a `Last-Modified` header and conditional
+    requests are answered with 304 Not Modified.
+
+    Misses are read from the primary, a lagging replica would store data
+    older than the version it is cached under.
+    """
+
+    cache_namespace = None
+
+    def list(self, request, *args, **kwargs):
+        return self.cached_response(super().list, request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.cached_response(super().retrieve, request, *args, **kwargs)
+
+    async def alist(self, request, *args, **kwargs):
+        return await self.acached_response(super().alist, request, *args, **kwargs)
+
+    async def aretrieve(self, request, *args, **kwargs):
+        return await self.acached_response(super().aretrieve, request, *args, **kwargs)
+
+    def response_cache_applies(self, request):
+        return not request.user.is_authenticated and settings.RESPONSE_CACHE_TIMEOUT
+
+    def get_cache_entry(self, request):
+        """
+        Returns `(key, version, entry)`, with a `None` key when the request
+        must not use the cache and a `None` entry on a miss.
+        """
+        if not self.response_cache_applies(request):
+            return None, None, None
+
+        pk = self.kwargs.get(self.lookup_url_kwarg or self.lookup_field)
+        if pk is not None:
+            try:
+                pk = self.queryset.model._meta.pk.to_python(pk)
+            except ValidationError:
+                return None, None, None
+
+        version = cache.get_version(self.cache_namespace, pk)
+        key = cache.response_key(self.cache_namespace, pk, version, request)
+
+        return key, version, cache.response_cache().get(key)
+
+    def set_cache_entry(self, key, version, response):
+        entry = {
+            "data": response.data,
+            "etag": cache.content_etag(response.data),
+            "last_modified": int(version),
+        }
+        cache.response_cache().set(key, entry, settings.RESPONSE_CACHE_TIMEOUT)
+
+        return entry
+
+    def cached_response(self, handler, request, *args, **kwargs):
+        key, version, entry = self.get_cache_entry(request)
+        if key is None:
+            return handler(request, *args, **kwargs)
+
+        if entry is None:
+            with use_primary():
+                response = handler(request, *args, **kwargs)
+            if response.status_code != 200:
+                return response
+
+            entry = self.set_cache_entry(key, version, response)
+        else:
+            response = Response(entry["data"])
+
+        return self.conditional_cached_response(request, response, entry)
+
+    async def acached_response(self, handler, request, *args, **kwargs):
+        key, version, entry = await sync_to_async(self.get_cache_entry)(request)
+        if key is None:
+            return await handler(request, *args, **kwargs)
+
+        if entry is None:
+            with use_primary():
+                response = await handler(request, *args, **kwargs)
+            if response.status_code != 200:
+                return response
+
+            entry = await sync_to_async(self.set_cache_entry)(key, version, response)
+        else:
+            response = Response(entry["data"])
+
+        return self.conditional_cached_response(request, response, entry)
+
+    def conditional_cached_response(self, request, response, entry):
+        response["ETag"] = entry["etag"]
+        response["Last-Modified"] = http_date(entry["last_modified"])
+
+        return get_conditional_response(
+            request,
+            etag=entry["etag"],
+            last_modified=entry["last_modified"],
+            response=response,
+        )
+
+
+class ConditionalGetMixin:
+    """
+    Answers conditional `list` and `retrieve` requests from the row versions
+    (`version_field`) of the objects in the response, before anything is
+    serialized. The strong ETag hashes the URL with every `(pk, version)`
+    pair and `Last-Modified` is the newest version.
+
+    The default `get_versions` reads the whole filtered list, so only use it
+    on bounded lists. On views that also use `CachedResponseMixin`, the
+    requests it caches keep its validators and skip the versions query.
+    """
+
+    version_field = "updated_at"
+
+    def list(self, request, *args, **kwargs):
+        return self.conditional_response(super().list, request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.conditional_response(super().retrieve, request, *args, **kwargs)
+
+    async def alist(self, request, *args, **kwargs):
+        return await self.aconditional_response(super().alist, request, *args, **kwargs)
+
+    async def aretrieve(self, request, *args, **kwargs):
+        return await self.aconditional_response(
+            super().aretrieve, request, *args, **kwargs
+        )
+
+    def get_versions(self):
+        queryset = self.filter_queryset(self.get_queryset())
+
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        if lookup_url_kwarg in self.kwargs:
+            try:
+                queryset = queryset.filter(
+                    **{self.lookup_field: self.kwargs[lookup_url_kwarg]}
+                )
+            except (TypeError, ValueError, ValidationError):
+                return []
+
+        return list(queryset.values_list("pk", self.version_field))
+
+    def get_request_versions(self, request):
+        if isinstance(self, CachedResponseMixin) and self.response_cache_applies(
+            request
+        ):
+            return []
+
+        return self.get_versions()
+
+    def get_validators(self, request, versions):
+        digest = hashlib.md5(request.build_absolute_uri().encode())
+        for pk, version in versions:
+            digest.update(f"|{pk}:{version.isoformat()}".encode())
+
+        etag = '"%s"' % digest.hexdigest()
+        last_modified = int(max(version for _, version in versions).timestamp())
+
+        return etag, last_modified
+
+    def conditional_response(self, handler, request, *args, **kwargs):
+        versions = self.get_request_versions(request)
+        if not versions:
+            return handler(request, *args, **kwargs)
+
+        etag, last_modified = self.get_validators(request, versions)
+
+        response = get_conditional_response(
+            request, etag=etag, last_modified=last_modified
+        )
+        if response is None:
+            response = handler(request, *args, **kwargs)
+
+        return self.set_validators(response, etag, last_modified)
+
+    async def aconditional_response(self, handler, request, *args, **kwargs):
+        versions = await sync_to_async(self.get_request_versions)(request)
+        if not versions:
+            return await handler(request, *args, **kwargs)
+
+        etag, last_modified = self.get_validators(request, versions)
+
+        response = get_conditional_response(
+            request, etag=etag, last_modified=last_modified
+        )
+        if response is None:
+            response = await handler(request, *args, **kwargs)
+
+        return self.set_validators(response, etag, last_modified)
+
+    def set_validators(self, response, etag, last_modified):
+        if response.status_code in (200, 304):
+            response["ETag"] = etag
+            response["Last-Modified"] = http_date(last_modified)
+
+        return response
@@ -0,0 +1,219 @@
+import base64
+import json
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.db.models import Q
+from rest_framework import exceptions
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+class KeysetPagination(PageNumberPagination):
+    """
+    Page number pagination with an opt-in keyset mode.
+
+    Views that declare `keyset_ordering` switch to keyset pagination when the
+    client sends the `cursor` query parameter (empty for the first page):
+
+    http://api.example.org/products/?cursor=
+    http://api.example.org/products/?cursor=eyJwIjpbNV19&page_size=50
+
+    Keyset pages filter on the last seen ordering values instead of using
+    OFFSET and never run a COUNT, so every page costs the same. Views setting
+    `keyset_required` always use keyset pages.
+
+    The keyset follows the ordering set by the filters, `keyset_ordering`
+    without one, with the primary key appended to break ties. Orderings on
+    anything but non null columns are a 400.
+    """
+
+    cursor_query_param = "cursor"
+    keyset_page_size_query_param = "page_size"
+    invalid_cursor_message = "Invalid cursor."
+    unsupported_ordering_message = "Cursor pages do not support this ordering."
+
+    keyset = None
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.keyset = getattr(view, "keyset_ordering", None)
+
+        requested = self.cursor_query_param in request.query_params or getattr(
+            view, "keyset_required", False
+        )
+        if not self.keyset or not requested:
+            self.keyset = None
+            return super().paginate_queryset(queryset, request, view)
+
+        self.request = request
+        self.model = queryset.model
+        self.keyset = self.get_keyset(queryset)
+        self.keyset_page_size = self.get_keyset_page_size(request)
+
+        position, self.reverse = self.decode_cursor(request)
+
+        ordering = self.keyset
+        if self.reverse:
+            ordering = [self.flip(field) for field in ordering]
+
+        if position is not None:
+            queryset = queryset.filter(self.keyset_filter(ordering, position))
+
+        results = list(queryset.order_by(*ordering)[: self.keyset_page_size + 1])
+        has_more = len(results) > self.keyset_page_size
+        results = results[: self.keyset_page_size]
+
+        if self.reverse:
+            results.reverse()
+            self.has_next = True
+            self.has_previous = has_more
+        else:
+            self.has_next = has_more
+            self.has_previous = position is not None
+
+        self.first_position = self.get_position(results[0]) if results else position
+        self.last_position = self.get_position(results[-1]) if results else position
+
+        return results
+
+    def get_paginated_response(self, data):
+        if not self.keyset:
+            return super().get_paginated_response(data)
+
+        return Response(
+            OrderedDict(
+                [
+                    ("next", self.get_next_link()),
+                    ("previous", self.get_previous_link()),
+                    ("results", data),
+                ]
+            )
+        )
+
+    def get_next_link(self):
+        if not self.keyset:
+            return super().get_next_link()
+
+        if not self.has_next or self.last_position is None:
+            return None
+
+        return self.encode_link(self.last_position, reverse=False)
+
+    def get_previous_link(self):
+        if not self.keyset:
+            return super().get_previous_link()
+
+        if not self.has_previous or self.first_position is None:
+            return None
+
+        return self.encode_link(self.first_position, reverse=True)
+
+    def get_keyset(self, queryset):
+        opts = self.model._meta
+        keyset = []
+
+        for field in queryset.query.order_by or self.keyset:
+            if not isinstance(field, str):
+                raise exceptions.ValidationError(
+                    {self.cursor_query_param: [self.unsupported_ordering_message]}
+                )
+
+            name = field.lstrip("-")
+            if name == "pk":
+                name = opts.pk.name
+                field = field.replace("pk", name)
+
+            try:
+                model_field = opts.get_field(name)
+            except FieldDoesNotExist:
+                model_field = None
+
+            if (
+                model_field is None
+                or not model_field.concrete
+                or model_field.is_relation
+                or model_field.null
+            ):
+                raise exceptions.ValidationError(
+                    {self.cursor_query_param: [self.unsupported_ordering_message]}
+                )
+
+            keyset.append(field)
+
+        if not {opts.pk.name, f"-{opts.pk.name}"} & set(keyset):
+            keyset.append(opts.pk.name)
+
+        return keyset
+
+    def get_keyset_page_size(self, request):
+        try:
+            page_size = int(request.query_params[self.keyset_page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+
+        if page_size <= 0:
+            return self.page_size
+
+        return min(page_size, settings.KEYSET_MAX_PAGE_SIZE)
+
+    def keyset_filter(self, ordering, position):
+        condition = Q()
+
+        for index, field in enumerate(ordering):
+            name = field.lstrip("-")
+            lookup = "lt" if field.startswith("-") else "gt"
+            equal = {
+                previous.lstrip("-"): position[i]
+                for i, previous in enumerate(ordering[:index])
+            }
+            condition |= Q(**equal, **{f"{name}__{lookup}": position[index]})
+
+        return condition
+
+    def get_position(self, item):
+        # Rows of utils.values.ValuesListMixin are dicts
+        if isinstance(item, dict):
+            return [item[field.lstrip("-")] for field in self.keyset]
+
+        return [getattr(item, field.lstrip("-")) for field in self.keyset]
+
+    def flip(self, field):
+        return field[1:] if field.startswith("-") else f"-{field}"
+
+    def encode_link(self, position, reverse):
+        payload = {"p": [v if isinstance(v, (int, str)) else str(v) for v in position]}
+        if reverse:
+            payload["r"] = 1
+
+        cursor = base64.urlsafe_b64encode(
+            json.dumps(payload, separators=(",", ":")).encode()
+        )
+        url = remove_query_param(
+            self.request.build_absolute_uri(), self.page_query_param
+        )
+        return replace_query_param(
+            url, self.cursor_query_param, cursor.decode().rstrip("=")
+        )
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None, False
+
+        try:
+            padded = encoded + "=" * (-len(encoded) % 4)
+            payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+            values = payload["p"]
+            if len(values) != len(self.keyset):
+                raise ValueError
+            position = [
+                self.model._meta.get_field(field.lstrip("-")).to_python(value)
+                for field, value in zip(self.keyset, values)
+            ]
+        except (TypeError, ValueError, KeyError, ValidationError):
+            raise NotFound(self.invalid_cursor_message)
+
+        return position, bool(payload.get("r"))
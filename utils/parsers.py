@@ -0,0 +1,83 @@
+import io
+import json
+import re
+
+from django.conf import settings
+from rest_framework import status
+from rest_framework.exceptions import APIException, ParseError
+from rest_framework.parsers import BaseParser, JSONParser
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+# orjson reads integers outside of 64 bits as floats, losing precision
+LONG_INTEGER = re.compile(rb"\d{19,}")
+
+
+class RequestTooLarge(APIException):
+    status_code = status.HTTP_413_REQUEST_ENTITY_TOO_LARGE
+    default_detail = "Request body too large."
+    default_code = "request_too_large"
+
+
+class ORJSONParser(JSONParser):
+    """
+    `JSONParser` on orjson, which only reads UTF-8 and, like the strict
+    `JSONParser`, rejects NaN and Infinity. Other encodings, bodies with
+    runs of 19 or more digits, which may be integers orjson cannot hold,
+    and a missing orjson use `JSONParser`.
+    """
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        encoding = parser_context.get("encoding", settings.DEFAULT_CHARSET)
+
+        if orjson is None or encoding.lower().replace("-", "") != "utf8":
+            return super().parse(stream, media_type, parser_context)
+
+        content = stream.read()
+        if LONG_INTEGER.search(content):
+            return super().parse(io.BytesIO(content), media_type, parser_context)
+
+        try:
+            return orjson.loads(content)
+        except ValueError as exc:
+            raise ParseError(f"JSON parse error - {exc}")
+
+
+class NDJSONParser(BaseParser):
+    """
+    Parses newline delimited JSON into a list, one object per line. The
+    stream is read line by line, but the parsed rows are all kept in memory
+    for the view, so bodies of more than `NDJSON_MAX_ROWS` rows are rejected
+    with 413.
+    """
+
+    media_type = "application/x-ndjson"
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        encoding = parser_context.get("encoding", settings.DEFAULT_CHARSET)
+
+        rows = []
+        if stream is None:
+            return rows
+
+        for number, line in enumerate(stream, start=1):
+            line = line.strip()
+            if not line:
+                continue
+
+            if len(rows) >= settings.NDJSON_MAX_ROWS:
+                raise RequestTooLarge(
+                    f"NDJSON bodies are limited to {settings.NDJSON_MAX_ROWS} rows."
+                )
+
+            try:
+                rows.append(json.loads(line.decode(encoding)))
+            except ValueError as exc:
+                raise ParseError(f"NDJSON parse error on line {number} - {exc}")
+
+        return rows
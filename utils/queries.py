@@ -0,0 +1,124 @@
+import functools
+import re
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+
+TRANSACTION_STATEMENTS = ("SAVEPOINT", "RELEASE", "ROLLBACK", "BEGIN", "COMMIT")
+
+LITERAL = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b|%s")
+PLACEHOLDER_LIST = re.compile(r"\(\?(?:, \?)*\)(?:, \(\?(?:, \?)*\))*")
+WHITESPACE = re.compile(r"\s+")
+
+
+def fingerprint(sql):
+    """
+    Shape of a query, the same for every parameter value and every length
+    of `IN (...)` and `VALUES (...), (...)` lists.
+    """
+    shape = WHITESPACE.sub(" ", sql).strip()
+    shape = LITERAL.sub("?", shape)
+    return PLACEHOLDER_LIST.sub("(...)", shape)
+
+
+_wrappers = ContextVar("query_wrappers", default=())
+
+
+def dispatch(execute, sql, params, many, context):
+    """
+    Execute wrapper of every connection, running the wrappers `instrument`
+    made active in the current context, outermost first.
+    """
+    for wrapper in reversed(_wrappers.get()):
+        execute = functools.partial(wrapper, execute)
+    return execute(sql, params, many, context)
+
+
+def install_dispatch(connection):
+    if dispatch not in connection.execute_wrappers:
+        connection.execute_wrappers.append(dispatch)
+
+
+@receiver(connection_created)
+def install_dispatch_on_connect(sender, connection, **kwargs):
+    # Connections are per thread, the ones sync_to_async threads open for
+    # async views never go through instrument
+    install_dispatch(connection)
+
+    for wrapper in _wrappers.get():
+        connected = getattr(wrapper, "connected", None)
+        if connected is not None:
+            connected(connection)
+
+
+@contextmanager
+def instrument(wrapper):
+    """
+    Runs `wrapper`, an `execute_wrapper` callable, around every query of the
+    current context, including the ones of `sync_to_async` threads, which
+    inherit the context variable holding it. Its `connected` method, if any,
+    is called with the connections opened meanwhile.
+    """
+    for connection in connections.all():
+        install_dispatch(connection)
+
+    token = _wrappers.set((*_wrappers.get(), wrapper))
+    try:
+        yield wrapper
+    finally:
+        _wrappers.reset(token)
+
+
+class QueryProblemsError(Exception):
+    pass
+
+
+class QueryInspector:
+    """
+    Groups the queries run while installed (see `instrument`) by fingerprint
+    to find shapes repeated once per row, the usual N+1 of a serializer
+    touching a relation that was not prefetched, and queries slower than a
+    threshold.
+    """
+
+    def __init__(self):
+        self.shapes = defaultdict(list)
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            if not sql.lstrip().upper().startswith(TRANSACTION_STATEMENTS):
+                self.shapes[fingerprint(sql)].append(
+                    (time.perf_counter() - started, sql)
+                )
+
+    def repeated(self, threshold):
+        """
+        `(fingerprint, count)` of the shapes run at least `threshold` times.
+        """
+        if not threshold:
+            return []
+
+        return [
+            (shape, len(runs))
+            for shape, runs in self.shapes.items()
+            if len(runs) >= threshold
+        ]
+
+    def slow(self, seconds):
+        """
+        `(duration, sql)` of the queries that took longer than `seconds`.
+        """
+        return [
+            (duration, sql)
+            for runs in self.shapes.values()
+            for duration, sql in runs
+            if duration > seconds
+        ]
@@ -0,0 +1,51 @@
+from rest_framework import renderers
+from rest_framework.utils import encoders
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+LINE_SEPARATORS = ((b"\xe2\x80\xa8", b"\\u2028"), (b"\xe2\x80\xa9", b"\\u2029"))
+
+encoder = encoders.JSONEncoder()
+
+
+class ORJSONRenderer(renderers.JSONRenderer):
+    """
+    `JSONRenderer` on orjson, with the same output except for floats:
+    datetimes, Decimals and the other types orjson does not know about go
+    through the DRF encoder, text stays UTF-8 and U+2028/U+2029 are escaped.
+    Floats keep their value but orjson writes exponents without sign or
+    padding (`1e16` and `1e-7` where `json` writes `1e+16` and `1e-07`), and
+    NaN and infinite floats render as null instead of raising.
+
+    Falls back to `JSONRenderer` without orjson, for indented output, when
+    `COMPACT_JSON` or `UNICODE_JSON` are off, and for data orjson refuses,
+    like integers over 64 bits or non string keys.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+
+        if (
+            orjson is None
+            or self.ensure_ascii
+            or not self.compact
+            or self.get_indent(accepted_media_type, renderer_context or {})
+        ):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        try:
+            content = orjson.dumps(
+                data, default=encoder.default, option=orjson.OPT_PASSTHROUGH_DATETIME
+            )
+        except TypeError:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        for character, escaped in LINE_SEPARATORS:
+            if character in content:
+                content = content.replace(character, escaped)
+
+        return content
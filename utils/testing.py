@@ -0,0 +1,60 @@
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.test.runner import DiscoverRunner
+from django.test.utils import CaptureQueriesContext
+
+
+class _AssertMaxQueriesContext(CaptureQueriesContext):
+    def __init__(self, test_case, num, connection):
+        self.test_case = test_case
+        self.num = num
+        super().__init__(connection)
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        super().__exit__(exc_type, exc_value, traceback)
+        if exc_type is not None:
+            return
+
+        executed = len(self)
+        self.test_case.assertLessEqual(
+            executed,
+            self.num,
+            "%d queries executed, at most %d expected\nCaptured queries were:\n%s"
+            % (
+                executed,
+                self.num,
+                "\n".join(
+                    "%d. %s" % (i, query["sql"])
+                    for i, query in enumerate(self.captured_queries, start=1)
+                ),
+            ),
+        )
+
+
+class QueryBudgetMixin:
+    """
+    Adds `assertMaxQueries`, an upper bound version of `assertNumQueries`
+    for pinning the query cost of an endpoint:
+
+        with self.assertMaxQueries(2):
+            self.client.get("/api/products/")
+    """
+
+    def assertMaxQueries(self, num, using=DEFAULT_DB_ALIAS):
+        return _AssertMaxQueriesContext(self, num, connections[using])
+
+
+class QueryInspectionRunner(DiscoverRunner):
+    """
+    Runs the tests with `QUERY_INSPECTION` in strict mode, so a request
+    repeating a query shape once per row fails its test.
+    """
+
+    def setup_test_environment(self, **kwargs):
+        super().setup_test_environment(**kwargs)
+        self.query_inspection = settings.QUERY_INSPECTION
+        settings.QUERY_INSPECTION = "strict"
+
+    def teardown_test_environment(self, **kwargs):
+        settings.QUERY_INSPECTION = self.query_inspection
+        super().teardown_test_environment(**kwargs)
@@ -0,0 +1,182 @@
+from functools import lru_cache
+
+from asgiref.sync import sync_to_async
+from django.core.exceptions import FieldDoesNotExist
+from rest_framework import serializers
+from rest_framework.response import Response
+from utils.middleware import timed_serialization
+
+# Fields whose to_representation returns database values of the matching
+# type unchanged, so the plan can copy them as they come
+IDENTITY_REPRESENTATIONS = {
+    serializers.BooleanField.to_representation,
+    serializers.CharField.to_representation,
+    serializers.IntegerField.to_representation,
+}
+
+# Fields whose to_representation only depends on the value, called directly
+VALUE_REPRESENTATIONS = {
+    serializers.DateField.to_representation,
+    serializers.DateTimeField.to_representation,
+    serializers.DecimalField.to_representation,
+    serializers.FloatField.to_representation,
+    serializers.UUIDField.to_representation,
+    *IDENTITY_REPRESENTATIONS,
+}
+
+
+class ValuesPlan:
+    """
+    Read only serialization of `values()` rows with the output of a
+    `ModelSerializer`: each entry maps a row key to an output key, with the
+    bound `to_representation` of the field or nothing for values that are
+    output as they are.
+    """
+
+    def __init__(self, columns, entries, presence=None):
+        self.columns = columns
+        self.entries = entries
+        self.presence = presence
+
+    def represent_row(self, row):
+        data = {}
+
+        for name, key, represent, nested in self.entries:
+            if nested is not None:
+                data[name] = (
+                    None if row[nested.presence] is None else nested.represent_row(row)
+                )
+                continue
+
+            value = row[key]
+            data[name] = (
+                value if represent is None or value is None else represent(value)
+            )
+
+        return data
+
+    def represent(self, rows):
+        represent_row = self.represent_row
+        return [represent_row(row) for row in rows]
+
+
+@lru_cache(maxsize=None)
+def values_plan(serializer_class, model):
+    """
+    Compiles the `ValuesPlan` of a read only serializer, or returns `None`
+    when a field is not a plain column, one of the known field types, or a
+    nested serializer of a to-one relation, meaning the serializer is needed.
+    """
+    return compile_plan(serializer_class(), model, "")
+
+
+def compile_plan(serializer, model, prefix):
+    columns = []
+    entries = []
+
+    for name, field in serializer.fields.items():
+        if field.write_only:
+            continue
+
+        if field.source == "*" or "." in field.source:
+            return None
+
+        try:
+            model_field = model._meta.get_field(field.source)
+        except FieldDoesNotExist:
+            return None
+
+        key = prefix + field.source
+
+        if isinstance(field, serializers.BaseSerializer):
+            if isinstance(field, serializers.ListSerializer) or not (
+                model_field.many_to_one or model_field.one_to_one
+            ):
+                return None
+
+            related = model_field.related_model
+            nested = compile_plan(field, related, f"{key}__")
+            if nested is None:
+                return None
+
+            # A missing related row gives a null primary key in the join
+            nested.presence = f"{key}__{related._meta.pk.name}"
+            columns += [nested.presence, *nested.columns]
+            entries.append((name, None, None, nested))
+            continue
+
+        representation = type(field).to_representation
+        if not model_field.concrete or representation not in VALUE_REPRESENTATIONS:
+            return None
+
+        represent = (
+            None
+            if representation in IDENTITY_REPRESENTATIONS
+            else field.to_representation
+        )
+        columns.append(key)
+        entries.append((name, key, represent, None))
+
+    return ValuesPlan(tuple(dict.fromkeys(columns)), entries)
+
+
+class ValuesListMixin:
+    """
+    Serves `list` from `values()` rows through the `ValuesPlan` of the
+    serializer instead of model instances and serializer fields, with the
+    same output. Views whose serializer cannot be compiled keep the regular
+    path.
+
+    Goes right before `AsyncReadMixin` in the bases, the caching mixins
+    wrap it like any other `list`.
+    """
+
+    def get_values_plan(self):
+        return values_plan(self.get_serializer_class(), self.queryset.model)
+
+    def get_values_queryset(self, plan):
+        queryset = self.filter_queryset(self.get_queryset())
+        # The keyset pagination reads its position from the rows, in the
+        # ordering set by the filters or keyset_ordering
+        ordering = queryset.query.order_by or getattr(self, "keyset_ordering", None)
+        keyset = [
+            field.lstrip("-") for field in ordering or () if isinstance(field, str)
+        ]
+        columns = [queryset.model._meta.pk.name, *plan.columns, *keyset]
+
+        return queryset.values(*dict.fromkeys(columns))
+
+    def list(self, request, *args, **kwargs):
+        plan = self.get_values_plan()
+        if plan is None:
+            return super().list(request, *args, **kwargs)
+
+        queryset = self.get_values_queryset(plan)
+
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            with timed_serialization(request):
+                data = plan.represent(page)
+            return self.get_paginated_response(data)
+
+        with timed_serialization(request):
+            data = plan.represent(queryset)
+        return Response(data)
+
+    async def alist(self, request, *args, **kwargs):
+        plan = self.get_values_plan()
+        if plan is None:
+            return await super().alist(request, *args, **kwargs)
+
+        queryset = self.get_values_queryset(plan)
+
+        page = await sync_to_async(self.paginate_queryset)(queryset)
+        if page is not None:
+            with timed_serialization(request):
+                data = plan.represent(page)
+            return self.get_paginated_response(data)
+
+        rows = await sync_to_async(list)(queryset)
+        with timed_serialization(request):
+            data = plan.represent(rows)
+        return Response(data)